@@ -0,0 +1,331 @@
+"""
+Preview Render Benchmark
+Renders a fixed small finish × color matrix from render_premium_material_previews.py
+on the CPU and reports where the time goes, so preset or settings changes can be
+checked for speed regressions
+
+Phases per render: material build (node tree + color), sync (Cycles scene export
+until the first sample), render (sampling + denoise), write (saving the PNG).
+Scene setup is timed once. The report also has samples/sec and peak RSS.
+
+Usage:
+    # Run the benchmark (inside Blender) and compare against the stored baseline
+    blender helmet.blend --background --python-exit-code 1 \\
+        --python scripts/benchmark_previews.py -- --output benchmark.json
+
+    # Store the current machine's result as the new baseline
+    blender helmet.blend --background --python scripts/benchmark_previews.py -- --update-baseline
+
+    # Compare two existing reports (plain Python, no Blender needed)
+    python3 scripts/benchmark_previews.py --compare benchmark.json --baseline scripts/benchmark_baseline.json
+
+Baselines are machine specific; compare reports from the same hardware and thread count.
+Exits 1 when a phase is slower than the baseline by more than its threshold.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+SCRIPT_DIR = Path(__file__).parent
+BASELINE_PATH = SCRIPT_DIR / "benchmark_baseline.json"
+REPORT_VERSION = 1
+
+# Fixed matrix: a cheap, a metallic, a textured and a layered finish
+BENCHMARK_MATRIX = [
+    ("matte", "#0000FF"),
+    ("chrome", "#FFD700"),
+    ("carbon_fiber", "#000000"),
+    ("holographic_foil", "#00CED1"),
+]
+BENCHMARK_SETTINGS = {
+    "width": 256,
+    "height": 256,
+    "samples": 32,
+    "denoise": True,
+    "device": "CPU",
+    "seed": 0,
+}
+BENCHMARK_REPEAT = 3  # Each phase reports the median over repeats
+
+PHASES = ("material", "sync", "render", "write")
+
+# Allowed slowdown as a fraction of the baseline before a metric counts as a regression.
+# Short phases are noisier, so they get more headroom.
+REGRESSION_THRESHOLDS = {
+    "sceneSetup": 0.5,
+    "material": 0.5,
+    "sync": 0.25,
+    "render": 0.1,
+    "write": 0.5,
+    "total": 0.1,
+    "samplesPerSecond": 0.1,  # Drop in throughput
+    "peakRssMb": 0.2,
+}
+
+# ============================================================
+# MEASUREMENT
+# ============================================================
+
+def peak_rss_mb():
+    """Peak resident set size of this process (None where unavailable)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class RenderPhaseTimer:
+    """
+    Splits a bpy.ops.render.render call into sync and render time
+    Cycles reports progress through render_stats; the first sampling message marks
+    the end of scene synchronization.
+    """
+
+    SAMPLING_MARKERS = ("Sample", "Rendering", "Path Tracing")
+
+    def __init__(self):
+        self.started = 0.0
+        self.first_sample = None
+
+    def _on_stats(self, stats):
+        if self.first_sample is None and any(marker in stats for marker in self.SAMPLING_MARKERS):
+            self.first_sample = time.perf_counter()
+
+    def render(self):
+        """Render the current scene; returns (sync seconds, render seconds)"""
+        import bpy
+
+        handlers = bpy.app.handlers.render_stats
+        handlers.append(self._on_stats)
+        self.first_sample = None
+        try:
+            self.started = time.perf_counter()
+            bpy.ops.render.render()
+            finished = time.perf_counter()
+        finally:
+            handlers.remove(self._on_stats)
+
+        synced = self.first_sample or self.started  # Unknown split: count it all as render
+        return synced - self.started, finished - synced
+
+
+def run_benchmark(repeat=BENCHMARK_REPEAT, threads=0):
+    """Render BENCHMARK_MATRIX `repeat` times; returns the report dict"""
+    import bpy
+
+    import render_premium_material_previews as previews
+
+    started = time.perf_counter()
+    scene = bpy.context.scene
+
+    setup_started = time.perf_counter()
+    previews.setup_scene({"device": BENCHMARK_SETTINGS["device"], "threads": threads, "tile_size": 0, "calibrate": False})
+    previews.setup_studio_lighting()
+    previews.setup_camera()
+    helmet_objects = previews.find_helmet_objects()
+    if not helmet_objects:
+        raise RuntimeError("No helmet objects found")
+
+    settings = BENCHMARK_SETTINGS
+    scene.render.resolution_x = settings["width"]
+    scene.render.resolution_y = settings["height"]
+    scene.render.resolution_percentage = 100
+    scene.cycles.samples = settings["samples"]
+    scene.cycles.seed = settings["seed"]
+    scene.cycles.use_adaptive_sampling = False  # Fixed work per render
+    scene.cycles.use_denoising = settings["denoise"]
+    scene_setup = time.perf_counter() - setup_started
+
+    timer = RenderPhaseTimer()
+    runs = {f"{finish_key}_{color}": {phase: [] for phase in PHASES} for finish_key, color in BENCHMARK_MATRIX}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for _ in range(repeat):
+            for finish_key, color_hex in BENCHMARK_MATRIX:
+                timings = runs[f"{finish_key}_{color_hex}"]
+
+                phase_started = time.perf_counter()
+                material = previews.build_premium_material(f"Benchmark_{finish_key}", previews.FINISH_PRESETS[finish_key])
+                previews.set_material_color(material, color_hex)
+                previews.apply_material_to_objects(helmet_objects, material)
+                timings["material"].append(time.perf_counter() - phase_started)
+
+                sync_seconds, render_seconds = timer.render()
+                timings["sync"].append(sync_seconds)
+                timings["render"].append(render_seconds)
+
+                phase_started = time.perf_counter()
+                bpy.data.images["Render Result"].save_render(os.path.join(tmp_dir, f"{finish_key}.png"))
+                timings["write"].append(time.perf_counter() - phase_started)
+
+                bpy.data.materials.remove(material)
+
+    jobs = {
+        name: {phase: round(statistics.median(values), 4) for phase, values in timings.items()}
+        for name, timings in runs.items()
+    }
+    phases = {phase: round(sum(job[phase] for job in jobs.values()), 4) for phase in PHASES}
+    phases["sceneSetup"] = round(scene_setup, 4)
+    phases["total"] = round(sum(phases[phase] for phase in PHASES) + scene_setup, 4)
+
+    render_seconds = phases["render"]
+    pixels = settings["width"] * settings["height"]
+    renders = len(BENCHMARK_MATRIX)
+
+    return {
+        "version": REPORT_VERSION,
+        "blender": bpy.app.version_string,
+        "platform": platform.platform(),
+        "cpuCount": os.cpu_count(),
+        "threads": scene.render.threads,
+        "settings": settings,
+        "matrix": [list(entry) for entry in BENCHMARK_MATRIX],
+        "repeat": repeat,
+        "phases": phases,
+        "jobs": jobs,
+        "samplesPerSecond": round(settings["samples"] * renders / render_seconds, 2) if render_seconds else None,
+        "pixelSamplesPerSecond": round(settings["samples"] * pixels * renders / render_seconds) if render_seconds else None,
+        "peakRssMb": peak_rss_mb(),
+        "wallSeconds": round(time.perf_counter() - started, 3),
+    }
+
+
+# ============================================================
+# BASELINE COMPARISON
+# ============================================================
+
+def compare_reports(report, baseline, thresholds=None):
+    """
+    Compare a report with a baseline report
+    Returns (rows, regressions): rows are (metric, baseline, current, change fraction,
+    threshold, regressed) for every metric present in both.
+    """
+    thresholds = dict(REGRESSION_THRESHOLDS, **(thresholds or {}))
+    rows = []
+
+    if report.get("settings") != baseline.get("settings") or report.get("matrix") != baseline.get("matrix"):
+        print("⚠️ Benchmark settings differ from the baseline; comparison may be meaningless")
+
+    metrics = [(name, report["phases"].get(name), baseline["phases"].get(name), False) for name in baseline["phases"]]
+    metrics.append(("samplesPerSecond", report.get("samplesPerSecond"), baseline.get("samplesPerSecond"), True))
+    metrics.append(("peakRssMb", report.get("peakRssMb"), baseline.get("peakRssMb"), False))
+
+    for name, current, previous, higher_is_better in metrics:
+        if current is None or not previous:
+            continue
+        change = (current - previous) / previous
+        threshold = thresholds.get(name)
+        worse = -change if higher_is_better else change
+        regressed = threshold is not None and worse > threshold
+        rows.append((name, previous, current, change, threshold, regressed))
+
+    return rows, [row[0] for row in rows if row[5]]
+
+
+def print_comparison(rows):
+    print(f"\n{'Metric':<20}{'Baseline':>12}{'Current':>12}{'Change':>10}{'Limit':>9}")
+    for name, previous, current, change, threshold, regressed in rows:
+        limit = f"{threshold:.0%}" if threshold is not None else "-"
+        flag = "  ❌" if regressed else ""
+        print(f"{name:<20}{previous:>12.4g}{current:>12.4g}{change:>+10.1%}{limit:>9}{flag}")
+
+
+def print_report(report):
+    settings = report["settings"]
+    print(f"\n⏱️ {len(report['matrix'])} render(s) at {settings['width']}x{settings['height']}, "
+          f"{settings['samples']} samples, {report['threads']} thread(s), median of {report['repeat']}")
+    print(f"\n{'Job':<26}" + "".join(f"{phase:>10}" for phase in PHASES))
+    for name, job in report["jobs"].items():
+        print(f"{name:<26}" + "".join(f"{job[phase]:>10.3f}" for phase in PHASES))
+    phases = report["phases"]
+    print(f"{'TOTAL':<26}" + "".join(f"{phases[phase]:>10.3f}" for phase in PHASES))
+    print(f"\nScene setup {phases['sceneSetup']:.3f}s, total {phases['total']:.3f}s, "
+          f"{report['samplesPerSecond']} samples/s, peak RSS {report['peakRssMb']} MB")
+
+
+def read_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_json(path, data):
+    path = Path(path)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    tmp_path.replace(path)
+
+
+# ============================================================
+# MAIN
+# ============================================================
+
+def parse_args():
+    # Inside Blender our arguments follow `--`
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    parser = argparse.ArgumentParser(prog="benchmark_previews.py", description="Benchmark preview rendering")
+    parser.add_argument("--output", type=Path, help="Write the report JSON here")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline report to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="Save this run as the baseline")
+    parser.add_argument("--compare", type=Path, metavar="REPORT", help="Compare an existing report instead of running")
+    parser.add_argument("--repeat", type=int, default=BENCHMARK_REPEAT, help="Renders per job (median is reported)")
+    parser.add_argument("--threads", type=int, default=0, help="CPU render threads (default: all cores)")
+    parser.add_argument("--threshold", type=float, help="Override every regression threshold (fraction)")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+
+    if args.compare:
+        report = read_json(args.compare)
+    else:
+        sys.path.insert(0, str(SCRIPT_DIR))
+        report = run_benchmark(args.repeat, args.threads)
+        print_report(report)
+        if args.output:
+            write_json(args.output, report)
+            print(f"✅ Report: {args.output}")
+
+    if args.update_baseline:
+        write_json(args.baseline, report)
+        print(f"✅ Baseline updated: {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"⚠️ No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+
+    thresholds = None
+    if args.threshold is not None:
+        thresholds = {name: args.threshold for name in REGRESSION_THRESHOLDS}
+
+    rows, regressions = compare_reports(report, read_json(args.baseline), thresholds)
+    print_comparison(rows)
+
+    if regressions:
+        print(f"\n❌ Regression in: {', '.join(regressions)}")
+        return 1
+    print("\n✅ No regressions against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+"""
+Webhook Update Benchmark (offline)
+Replays synthesized webhook payloads (see webhook_load.py) through apply_webhook_updates of
+blender/update_helmet_materials.py on the fake_bpy stand-in and reports throughput,
+latency percentiles and the Blender API calls made, without Blender
+
+Optionally (--render) also runs render_all_premium_previews of
+render_premium_material_previews.py end to end with renders that take no time and
+write stub files to a temporary directory (scene setup, material pool, render cache,
+preview tiers, manifest and atlases), cold and then fully cached.
+
+Stand-in calls are timed separately, so "script" time is the updater's own Python
+overhead. Absolute numbers are for comparing changes on one machine; they do not
+include real Blender's API cost (use the call counts for that).
+
+Usage:
+    python3 scripts/benchmark_webhook_updates.py
+    python3 scripts/benchmark_webhook_updates.py --payloads 20000 --graph table --resident
+    python3 scripts/benchmark_webhook_updates.py --render --json > webhook-benchmark.json
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import fake_bpy
+from webhook_load import (
+    DEFAULT_SEED, OFFLINE_EXTRA_MATERIALS, latency_summary, offline_updater, synthesize_trace,
+)
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+SCRIPT_DIR = Path(__file__).parent
+
+DEFAULT_PAYLOADS = 5000
+
+TOP_CALLS = 12  # API calls listed in the report
+
+# ============================================================
+# BENCHMARKS
+# ============================================================
+
+def run_webhook_benchmark(payload_count=DEFAULT_PAYLOADS, graph_mode="bsdf", resident=False,
+                          extra_materials=OFFLINE_EXTRA_MATERIALS, seed=DEFAULT_SEED):
+    """
+    Replay synthesized payloads one apply_webhook_updates call each; returns the report dict
+    resident=False resolves the material on every call like a one-shot webhook script;
+    resident=True passes it in like the resident service.
+    """
+    updater, material = offline_updater(graph_mode, extra_materials)
+    payloads = [event["updates"] for event in synthesize_trace(payload_count, seed)["events"]]
+
+    # First call builds the zone graph; reported separately
+    fake_bpy.recorder.reset()
+    setup_started = time.perf_counter()
+    updater.get_zone_index(material)
+    setup_seconds = time.perf_counter() - setup_started
+    setup_calls = fake_bpy.recorder.total_calls()
+    fake_bpy.recorder.reset()
+
+    latencies = []
+    zone_updates = 0
+    changes = 0
+    unchanged = 0
+    target = material if resident else None
+
+    started = time.perf_counter()
+    for updates in payloads:
+        call_started = time.perf_counter()
+        result = updater.apply_webhook_updates(updates, material=target)
+        latencies.append(time.perf_counter() - call_started)
+
+        zone_updates += len(updates)
+        changes += len(result["changes"])
+        unchanged += result["unchanged"]
+    seconds = time.perf_counter() - started
+
+    calls = fake_bpy.recorder.report(TOP_CALLS)
+    return {
+        "graph": graph_mode,
+        "resident": resident,
+        "materials": len(fake_bpy.bpy.data.materials),
+        "payloads": len(payloads),
+        "zoneUpdates": zone_updates,
+        "socketChanges": changes,
+        "unchanged": unchanged,
+        "setupMs": round(setup_seconds * 1000, 3),
+        "setupCalls": setup_calls,
+        "seconds": round(seconds, 4),
+        "payloadsPerSecond": round(len(payloads) / seconds),
+        "zoneUpdatesPerSecond": round(zone_updates / seconds),
+        "latencyMs": latency_summary(latencies),
+        "apiSeconds": calls["apiSeconds"],
+        "scriptSeconds": round(seconds - calls["apiSeconds"], 4),
+        "callsPerPayload": round(calls["calls"] / len(payloads), 2),
+        "calls": calls,
+    }
+
+
+def run_render_benchmark():
+    """
+    Run render_all_premium_previews of render_premium_material_previews.py with
+    instant renders into a temporary output directory, once from an empty render
+    cache and once more with every preview cached; returns the report dict
+    """
+    fake_bpy.install()
+    fake_bpy.reset()
+    sys.path.insert(0, str(SCRIPT_DIR))
+    previews = importlib.import_module("render_premium_material_previews")
+
+    for name in ("Helmet_Shell", "Facemask", "Chinstrap"):
+        fake_bpy.add_mesh_object(name)
+
+    device_options = {"device": "CPU", "threads": 0, "tile_size": 0, "calibrate": False}
+    log = io.StringIO()  # The renderer prints per job; keep that cost but not the output
+    runs = {}
+
+    with tempfile.TemporaryDirectory() as tmp_dir, contextlib.redirect_stdout(log):
+        output_dir = Path(tmp_dir)
+        previews.OUTPUT_DIR = output_dir
+        previews.TURNTABLE_DIR = output_dir / "turntables"
+        previews.ATLAS_DIR = output_dir / "atlases"
+        previews.SAMPLE_BUDGETS_PATH = output_dir / "premium_sample_budgets.json"
+
+        for run in ("cold", "cached"):
+            started = time.perf_counter()
+            result = previews.render_all_premium_previews(device_options=device_options)
+            runs[run] = {**result, "seconds": round(time.perf_counter() - started, 4)}
+
+        atlases = len(list(previews.ATLAS_DIR.glob("*.png")))
+
+    cold = runs["cold"]
+    calls = fake_bpy.recorder.report(TOP_CALLS)
+    return {
+        "renders": cold["rendered"],
+        "seconds": cold["seconds"],
+        "rendersPerSecond": round(cold["rendered"] / cold["seconds"]),
+        "cachedSeconds": runs["cached"]["seconds"],
+        "cachedSkipped": runs["cached"]["skipped"],
+        "atlases": atlases,
+        "pool": cold["pool"],
+        "apiSeconds": calls["apiSeconds"],
+        "calls": calls,
+    }
+
+
+# ============================================================
+# MAIN
+# ============================================================
+
+def print_calls(calls):
+    print(f"\n{'API call':<36}{'Calls':>10}{'ms':>10}")
+    for name, call in calls["byCall"].items():
+        print(f"{name:<36}{call['calls']:>10,}{call['ms']:>10.1f}")
+    for issue, count in calls["issues"].items():
+        print(f"⚠️ {issue} ({count}x)")
+
+
+def print_webhook_report(report):
+    latency = report["latencyMs"]
+    mode = "resident" if report["resident"] else "lookup per call"
+    print(f"\n🎨 {report['payloads']:,} payloads ({report['zoneUpdates']:,} zone updates), "
+          f"'{report['graph']}' graph, {mode}, {report['materials']} materials")
+    print(f"   Setup: {report['setupMs']:.2f} ms, {report['setupCalls']} API calls")
+    print(f"   {report['payloadsPerSecond']:,} payloads/s, {report['zoneUpdatesPerSecond']:,} zone updates/s "
+          f"({report['socketChanges']:,} socket changes, {report['unchanged']:,} unchanged)")
+    print(f"   Latency ms: p50 {latency['p50']}, p95 {latency['p95']}, p99 {latency['p99']}, max {latency['max']}")
+    print(f"   {report['seconds']:.3f}s total: {report['scriptSeconds']:.3f}s script, "
+          f"{report['apiSeconds']:.3f}s in API calls ({report['callsPerPayload']} per payload)")
+    print_calls(report["calls"])
+
+
+def print_render_report(report):
+    print(f"\n🎬 {report['renders']} premium previews with instant renders: {report['seconds']:.3f}s "
+          f"({report['rendersPerSecond']:,} renders/s), {report['atlases']} atlas(es)")
+    print(f"   Cached re-run: {report['cachedSkipped']} skipped in {report['cachedSeconds']:.3f}s; "
+          f"material pool {report['pool']}")
+    print_calls(report["calls"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark apply_webhook_updates on the offline bpy stand-in")
+    parser.add_argument("--payloads", type=int, default=DEFAULT_PAYLOADS, help="Payloads to replay")
+    parser.add_argument("--graph", choices=("bsdf", "table"), default="bsdf", help="Zone graph mode")
+    parser.add_argument("--resident", action="store_true", help="Pass the resolved material (service mode)")
+    parser.add_argument("--materials", type=int, default=OFFLINE_EXTRA_MATERIALS, help="Other materials in the file")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Payload synthesis seed")
+    parser.add_argument("--render", action="store_true", help="Also benchmark preview render orchestration")
+    parser.add_argument("--strict", action="store_true", help="Raise on Blender API mismatches instead of counting them")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    fake_bpy.install(strict=args.strict)
+    report = {"webhook": run_webhook_benchmark(args.payloads, args.graph, args.resident, args.materials, args.seed)}
+    if args.render:
+        report["render"] = run_render_benchmark()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print_webhook_report(report["webhook"])
+    if args.render:
+        print_render_report(report["render"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,12 +15,31 @@ Usage:
 
     # Or direct Blender execution
     blender --background helmet.blend --python update_helmet_materials.py
+
+    # Resident service mode (loads once, then accepts JSON `updates` over a socket)
+    blender --background helmet.blend --python update_helmet_materials.py -- --service
+
+    # Many helmets in one run: JSON file of {material or object name: updates}
+    blender --background roster.blend --python update_helmet_materials.py -- --batch roster.json
 """
 
 import bpy
 import json
+import os
+import queue
+import socketserver
+import sys
+import threading
+import time
+import types
 from typing import Dict, List, Tuple, Optional
 
+# Shared finish presets live in scripts/finish_presets.py. When this file is sent
+# as source text (MCP) there is no __file__; the bridge puts scripts/ on sys.path.
+if '__file__' in globals():
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from finish_presets import finish_catalog, finish_plan, hex_to_linear_rgba
+
 # ============================================================
 # ZONE DEFINITIONS
 # ============================================================
@@ -33,41 +52,151 @@ ZONES = {
     'HARDWARE': (1.0, 1.0, 0.0),       # Yellow
 }
 
-# Material finish presets
-FINISH_PRESETS = {
-    'glossy': {'metallic': 0.0, 'roughness': 0.1},
-    'matte': {'metallic': 0.0, 'roughness': 0.8},
-    'chrome': {'metallic': 1.0, 'roughness': 0.05},
-    'brushed': {'metallic': 0.9, 'roughness': 0.35},
-    'satin': {'metallic': 0.1, 'roughness': 0.5},
-}
+# Material finish presets accepted by the webhook (lib/constants.ts), validated once
+FINISH_PRESETS = finish_catalog('webhook')
+
+# ============================================================
+# LOGGING
+# ============================================================
+# Output goes back through the MCP bridge, so the hot path stays quiet by
+# default: one summary record per apply_webhook_updates call.
+#   silent  - nothing on stdout
+#   summary - warnings/errors plus one line per apply (default)
+#   verbose - every socket change and setup step
+# Summary records (and warnings) are also appended as JSON lines to
+# HELMET_LOG_JSONL when set.
+
+LOG_LEVELS = {'silent': 0, 'summary': 1, 'verbose': 2}
+
+
+class UpdateLogger:
+    """Leveled logger for the updater with an optional JSON-lines sink"""
+
+    def __init__(self, level: str = 'summary', jsonl_path: Optional[str] = None):
+        self.configure(level, jsonl_path)
+
+    def configure(self, level: Optional[str] = None, jsonl_path: Optional[str] = None):
+        if level is not None:
+            if level not in LOG_LEVELS:
+                raise ValueError(f"Unknown log level '{level}', expected one of {list(LOG_LEVELS)}")
+            self.level = level
+        if jsonl_path is not None:
+            self.jsonl_path = jsonl_path or None
+        return self
+
+    @property
+    def is_verbose(self) -> bool:
+        return LOG_LEVELS[self.level] >= LOG_LEVELS['verbose']
+
+    def _write(self, record: Dict):
+        if self.jsonl_path:
+            with open(self.jsonl_path, 'a') as f:
+                f.write(json.dumps(record, default=str) + '\n')
+
+    def verbose(self, message: str):
+        if self.is_verbose:
+            print(message)
+
+    def info(self, message: str):
+        if LOG_LEVELS[self.level] >= LOG_LEVELS['summary']:
+            print(message)
+
+    def warn(self, message: str, **fields):
+        self.info(message)
+        self._write({'event': 'warning', 'message': message, 'time': time.time(), **fields})
+
+    def summary(self, message: str, record: Dict):
+        self.info(message)
+        self._write({**record, 'time': time.time()})
+
+
+logger = UpdateLogger(
+    os.environ.get('HELMET_LOG_LEVEL', 'summary'),
+    os.environ.get('HELMET_LOG_JSONL'),
+)
+
+
+def configure_logging(level: Optional[str] = None, jsonl_path: Optional[str] = None) -> UpdateLogger:
+    """Change the updater log level ('silent', 'summary', 'verbose') and/or JSON-lines sink"""
+    return logger.configure(level, jsonl_path)
+
 
 # ============================================================
 # HELPER FUNCTIONS
 # ============================================================
 
-def hex_to_rgb(hex_color: str) -> Tuple[float, float, float]:
-    """Convert hex color to RGB float tuple (0.0-1.0)"""
-    hex_color = hex_color.lstrip('#')
-    return tuple(int(hex_color[i:i+2], 16) / 255.0 for i in (0, 2, 4))
+# Materials set up with a zone graph carry this custom property; the scene stores
+# the resolved helmet material's name, so both survive saving the .blend
+HELMET_TAG = 'helmet_customizer_zones'
+HELMET_POINTER = 'helmet_customizer_material'
+
+# Last resolved helmet material and how it was found
+# ('cached', 'registered', 'name' or 'scan')
+_HELMET_LOOKUP = {'material': None, 'source': None}
+
+
+def _is_tagged_helmet(material) -> bool:
+    """Cheap check that a material reference is alive, node-based and tagged"""
+    try:
+        return bool(material.use_nodes and material.get(HELMET_TAG))
+    except ReferenceError:
+        return False
+
+
+def tag_helmet_material(material: bpy.types.Material):
+    """Mark a material as having the zone graph (done by build_zone_index)"""
+    if not material.get(HELMET_TAG):
+        material[HELMET_TAG] = 1
+
+
+def register_helmet_material(material: bpy.types.Material, source: str = 'registered'):
+    """Remember the helmet material in the lookup cache and the scene"""
+    scene = bpy.context.scene
+    if scene.get(HELMET_POINTER) != material.name:
+        scene[HELMET_POINTER] = material.name
+    _HELMET_LOOKUP['material'] = material
+    _HELMET_LOOKUP['source'] = source
 
 
 def find_helmet_material() -> Optional[bpy.types.Material]:
-    """Find the helmet material node (should be named 'HelmetMaterial' or similar)"""
+    """
+    Find the helmet material (should be named 'HelmetMaterial' or similar)
+    Resolved in O(1) from the cached reference or the scene's registered name once
+    it carries the zone tag; only a stale registration falls back to a scan.
+    """
+    cached = _HELMET_LOOKUP['material']
+    if cached is not None and _is_tagged_helmet(cached):
+        _HELMET_LOOKUP['source'] = 'cached'
+        return cached
+
+    name = bpy.context.scene.get(HELMET_POINTER)
+    mat = bpy.data.materials.get(name) if name else None
+    if mat and _is_tagged_helmet(mat):
+        register_helmet_material(mat, 'registered')
+        return mat
+
     # Try common names
     common_names = ['HelmetMaterial', 'Helmet_Material', 'helmet_material', 'Material']
 
     for name in common_names:
         mat = bpy.data.materials.get(name)
         if mat and mat.use_nodes:
+            register_helmet_material(mat, 'name')
             return mat
 
-    # Fallback: return first material with nodes
+    # Fallback: first tagged material, else first material with nodes
+    first = None
     for mat in bpy.data.materials:
-        if mat.use_nodes:
-            return mat
+        if not mat.use_nodes:
+            continue
+        if mat.get(HELMET_TAG):
+            first = mat
+            break
+        first = first or mat
 
-    return None
+    if first:
+        register_helmet_material(first, 'scan')
+    return first
 
 
 def get_or_create_zone_shader_group(material: bpy.types.Material, zone: str) -> Dict:
@@ -109,10 +238,117 @@ def get_or_create_zone_shader_group(material: bpy.types.Material, zone: str) ->
     }
 
 
-def setup_zone_based_material(material: bpy.types.Material):
+# Values closer than this are treated as unchanged (sockets store float32)
+VALUE_TOLERANCE = 1e-5
+
+
+def _socket_value(socket):
+    """Read a socket's default value as a plain float or tuple"""
+    value = socket.default_value
+    return tuple(value) if hasattr(value, '__len__') else float(value)
+
+
+def _values_equal(a, b) -> bool:
+    """Compare socket values (floats or color tuples) within VALUE_TOLERANCE"""
+    if isinstance(a, tuple) or isinstance(b, tuple):
+        return len(a) == len(b) and all(abs(x - y) <= VALUE_TOLERANCE for x, y in zip(a, b))
+    return abs(a - b) <= VALUE_TOLERANCE
+
+
+# BSDF inputs the updater writes to, cached per zone by ZoneNodeIndex
+ZONE_SOCKETS = (
+    'Base Color',
+    'Metallic',
+    'Roughness',
+    'Coat Weight',
+    'Coat Roughness',
+    'Emission Color',
+    'Emission Strength',
+)
+
+
+class ZoneNodeIndex:
+    """
+    Direct references to each zone's Principled BSDF and its input sockets
+    Built once by setup_zone_based_material; stays valid until the node tree changes
+    """
+
+    def __init__(self, material: bpy.types.Material, zone_shaders: Dict[str, Dict]):
+        self.material = material
+        self.node_tree = material.node_tree
+        self.shaders = zone_shaders
+        self.bsdfs = {zone: group['bsdf'] for zone, group in zone_shaders.items()}
+        self.sockets = {
+            zone: {name: bsdf.inputs[name] for name in ZONE_SOCKETS}
+            for zone, bsdf in self.bsdfs.items()
+        }
+        self._init_shadow()
+
+    def _init_shadow(self):
+        # Shadow copies used to skip no-op writes: last written socket values
+        # (seeded from the node tree) and each zone's last applied properties
+        self.applied = {
+            zone: {name: _socket_value(socket) for name, socket in sockets.items()}
+            for zone, sockets in self.sockets.items()
+        }
+        self.properties = {}
+        self._signature = self._tree_signature()
+
+    def _tree_signature(self) -> Tuple[int, int]:
+        return (len(self.node_tree.nodes), len(self.node_tree.links))
+
+    def is_valid(self) -> bool:
+        """Cheap check that the material still uses the same, unmodified node tree"""
+        try:
+            return (
+                self.material.node_tree == self.node_tree
+                and self._tree_signature() == self._signature
+                and all(bsdf.name for bsdf in self.bsdfs.values())
+            )
+        except ReferenceError:
+            return False
+
+    def get(self, zone: str) -> Optional[Dict]:
+        """Return {socket name: socket} for a zone"""
+        return self.sockets.get(zone)
+
+
+# Zone indices by material name
+_ZONE_INDEX_CACHE: Dict[str, ZoneNodeIndex] = {}
+
+
+def get_zone_index(material: bpy.types.Material) -> ZoneNodeIndex:
+    """Return the cached zone index for a material, rebuilding it if the node tree changed"""
+    index = _ZONE_INDEX_CACHE.get(material.name)
+    if index is None or index.material != material or not index.is_valid():
+        index = build_zone_index(material)
+    return index
+
+
+def build_zone_index(material: bpy.types.Material) -> ZoneNodeIndex:
+    """
+    Set up the material's zone graph and index it
+    Uses the lookup-table graph when GRAPH_MODE is 'table' or the material already has one
+    """
+    tag_helmet_material(material)
+    if GRAPH_MODE == 'table' or material.node_tree.nodes.get(TABLE_BSDF_NAME):
+        return setup_zone_table_material(material)
+    return setup_zone_based_material(material)
+
+
+def invalidate_zone_index(material: Optional[bpy.types.Material] = None):
+    """Drop the cached zone index for a material (or all materials)"""
+    if material is None:
+        _ZONE_INDEX_CACHE.clear()
+    else:
+        _ZONE_INDEX_CACHE.pop(material.name, None)
+
+
+def setup_zone_based_material(material: bpy.types.Material) -> ZoneNodeIndex:
     """
     Set up a vertex-color-based material system for all 5 zones
     Each zone has its own shader controlled by vertex colors
+    Returns the ZoneNodeIndex used by all update functions
     """
     nodes = material.node_tree.nodes
     links = material.node_tree.links
@@ -144,103 +380,383 @@ def setup_zone_based_material(material: bpy.types.Material):
         shader_group['color_attr'].location = (0, y_offset)
         y_offset -= 300
 
-    print(f"✅ Material system set up with {len(zone_shaders)} zones")
-    return zone_shaders
+    index = ZoneNodeIndex(material, zone_shaders)
+    _ZONE_INDEX_CACHE[material.name] = index
+
+    logger.verbose(f"✅ Material system set up with {len(zone_shaders)} zones")
+    return index
 
 
 # ============================================================
-# MATERIAL UPDATE FUNCTIONS
+# ZONE LOOKUP TABLE GRAPH
 # ============================================================
+# Alternative to five parallel BSDFs: the vertex color is turned into a zone ID
+# (R + 2G + 4B, so every zone color maps to a distinct integer 0-4) which indexes
+# constant-interpolation color ramps holding each zone's parameters. A single
+# Principled BSDF reads from the ramps, so shader cost no longer grows with the
+# zone count, and property updates only edit ramp elements.
+#
+#   ZoneTable_BaseColor  RGB = base color
+#   ZoneTable_Surface    RGBA = metallic, roughness, coat weight, coat roughness
+#   ZoneTable_Emission   RGB = emission color, A = strength / EMISSION_STRENGTH_SCALE
+
+GRAPH_MODE = os.environ.get('HELMET_GRAPH_MODE', 'bsdf')  # 'bsdf' or 'table'
+
+TABLE_PREFIX = 'ZoneTable'
+TABLE_BSDF_NAME = f'{TABLE_PREFIX}_BSDF'
+TABLE_SIZE = 5
+EMISSION_STRENGTH_SCALE = 100.0  # Webhook allows emissiveIntensity 0-100
+
+# Principled BSDF defaults, used for zones without an existing BSDF to carry over
+TABLE_DEFAULTS = {
+    'Base Color': (0.8, 0.8, 0.8, 1.0),
+    'Metallic': 0.0,
+    'Roughness': 0.5,
+    'Coat Weight': 0.0,
+    'Coat Roughness': 0.03,
+    'Emission Color': (0.0, 0.0, 0.0, 1.0),
+    'Emission Strength': 0.0,
+}
 
-def update_zone_color(material: bpy.types.Material, zone: str, hex_color: str):
-    """Update base color for a zone"""
+
+def zone_table_id(vertex_color: Tuple[float, float, float]) -> int:
+    """Zone ID encoded by a vertex color"""
+    r, g, b = vertex_color
+    return int(round(r + 2 * g + 4 * b))
+
+
+ZONE_TABLE_IDS = {zone: zone_table_id(color) for zone, color in ZONES.items()}
+
+
+class _TableColorEntry:
+    """Socket-like view of a ramp element's RGB (alpha is left untouched)"""
+
+    def __init__(self, element):
+        self.element = element
+
+    @property
+    def default_value(self):
+        r, g, b, _ = self.element.color
+        return (r, g, b, 1.0)
+
+    @default_value.setter
+    def default_value(self, value):
+        color = self.element.color
+        color[0], color[1], color[2] = value[0], value[1], value[2]
+
+
+class _TableValueEntry:
+    """Socket-like view of one channel of a ramp element's color"""
+
+    def __init__(self, element, channel: int, scale: float = 1.0):
+        self.element = element
+        self.channel = channel
+        self.scale = scale
+
+    @property
+    def default_value(self):
+        return self.element.color[self.channel] * self.scale
+
+    @default_value.setter
+    def default_value(self, value):
+        self.element.color[self.channel] = value / self.scale
+
+
+class ZoneTableIndex(ZoneNodeIndex):
+    """
+    Zone index for the lookup-table graph
+    Each zone's "sockets" are entries of the parameter ramps, so the regular
+    update functions and shadow diffing work unchanged
+    """
+
+    def __init__(self, material: bpy.types.Material, bsdf, ramps: Dict):
+        self.material = material
+        self.node_tree = material.node_tree
+        self.shaders = {}
+        self.bsdfs = {zone: bsdf for zone in ZONES}
+        self.sockets = {}
+
+        for zone, zone_id in ZONE_TABLE_IDS.items():
+            base = ramps['BaseColor'].color_ramp.elements[zone_id]
+            surface = ramps['Surface'].color_ramp.elements[zone_id]
+            emission = ramps['Emission'].color_ramp.elements[zone_id]
+
+            self.sockets[zone] = {
+                'Base Color': _TableColorEntry(base),
+                'Metallic': _TableValueEntry(surface, 0),
+                'Roughness': _TableValueEntry(surface, 1),
+                'Coat Weight': _TableValueEntry(surface, 2),
+                'Coat Roughness': _TableValueEntry(surface, 3),
+                'Emission Color': _TableColorEntry(emission),
+                'Emission Strength': _TableValueEntry(emission, 3, EMISSION_STRENGTH_SCALE),
+            }
+
+        self._init_shadow()
+
+
+def _get_or_create_node(nodes, name: str, node_type: str, location: Tuple[float, float]):
+    node = nodes.get(name)
+    if not node:
+        node = nodes.new(type=node_type)
+        node.name = name
+    node.location = location
+    return node
+
+
+def _setup_table_ramp(ramp_node):
+    """Give a ramp TABLE_SIZE constant steps, entry i covering zone ID i"""
+    ramp = ramp_node.color_ramp
+    ramp.interpolation = 'CONSTANT'
+
+    while len(ramp.elements) < TABLE_SIZE:
+        ramp.elements.new(1.0)
+
+    # Step i starts halfway between IDs i-1 and i, so small vertex-color drift
+    # still lands on the right entry. Fac is zone ID / (TABLE_SIZE - 1).
+    for i, element in enumerate(sorted(ramp.elements, key=lambda e: e.position)):
+        element.position = max(0.0, (i - 0.5) / (TABLE_SIZE - 1))
+
+
+def setup_zone_table_material(material: bpy.types.Material) -> ZoneTableIndex:
+    """
+    Build the single-BSDF lookup-table graph for all 5 zones
+    Existing per-zone BSDF values are carried over into the table
+    """
     nodes = material.node_tree.nodes
-    bsdf = nodes.get(f"{zone}_BSDF")
+    links = material.node_tree.links
 
-    if not bsdf:
-        print(f"⚠️ BSDF for {zone} not found, creating...")
-        shader_group = get_or_create_zone_shader_group(material, zone)
-        bsdf = shader_group['bsdf']
+    output = None
+    for node in nodes:
+        if node.type == 'OUTPUT_MATERIAL':
+            output = node
+            break
+
+    if not output:
+        output = nodes.new(type='ShaderNodeOutputMaterial')
+    output.location = (1000, 0)
+
+    created = not nodes.get(TABLE_BSDF_NAME)
+
+    # Vertex color -> zone ID -> ramp Fac
+    color_attr = _get_or_create_node(nodes, f'{TABLE_PREFIX}_ColorAttribute', 'ShaderNodeVertexColor', (-1000, 0))
+    color_attr.layer_name = "Col"
+    separate = _get_or_create_node(nodes, f'{TABLE_PREFIX}_SeparateZone', 'ShaderNodeSeparateColor', (-800, 0))
+    add_green = _get_or_create_node(nodes, f'{TABLE_PREFIX}_AddGreen', 'ShaderNodeMath', (-600, 0))
+    add_blue = _get_or_create_node(nodes, f'{TABLE_PREFIX}_AddBlue', 'ShaderNodeMath', (-450, 0))
+    zone_fac = _get_or_create_node(nodes, f'{TABLE_PREFIX}_ZoneFac', 'ShaderNodeMath', (-300, 0))
+
+    add_green.operation = 'MULTIPLY_ADD'  # G * 2 + R
+    add_green.inputs[1].default_value = 2.0
+    add_blue.operation = 'MULTIPLY_ADD'   # B * 4 + (G * 2 + R)
+    add_blue.inputs[1].default_value = 4.0
+    zone_fac.operation = 'MULTIPLY'       # ID / (TABLE_SIZE - 1)
+    zone_fac.inputs[1].default_value = 1.0 / (TABLE_SIZE - 1)
+
+    links.new(color_attr.outputs['Color'], separate.inputs['Color'])
+    links.new(separate.outputs['Green'], add_green.inputs[0])
+    links.new(separate.outputs['Red'], add_green.inputs[2])
+    links.new(separate.outputs['Blue'], add_blue.inputs[0])
+    links.new(add_green.outputs['Value'], add_blue.inputs[2])
+    links.new(add_blue.outputs['Value'], zone_fac.inputs[0])
+
+    # Parameter tables
+    ramps = {}
+    for i, key in enumerate(('BaseColor', 'Surface', 'Emission')):
+        ramp = _get_or_create_node(nodes, f'{TABLE_PREFIX}_{key}', 'ShaderNodeValToRGB', (-100, 300 - i * 300))
+        _setup_table_ramp(ramp)
+        links.new(zone_fac.outputs['Value'], ramp.inputs['Fac'])
+        ramps[key] = ramp
+
+    surface_split = _get_or_create_node(nodes, f'{TABLE_PREFIX}_SurfaceSplit', 'ShaderNodeSeparateColor', (250, 0))
+    emission_scale = _get_or_create_node(nodes, f'{TABLE_PREFIX}_EmissionScale', 'ShaderNodeMath', (250, -300))
+    emission_scale.operation = 'MULTIPLY'
+    emission_scale.inputs[1].default_value = EMISSION_STRENGTH_SCALE
+
+    bsdf = _get_or_create_node(nodes, TABLE_BSDF_NAME, 'ShaderNodeBsdfPrincipled', (600, 0))
+
+    links.new(ramps['BaseColor'].outputs['Color'], bsdf.inputs['Base Color'])
+    links.new(ramps['Surface'].outputs['Color'], surface_split.inputs['Color'])
+    links.new(surface_split.outputs['Red'], bsdf.inputs['Metallic'])
+    links.new(surface_split.outputs['Green'], bsdf.inputs['Roughness'])
+    links.new(surface_split.outputs['Blue'], bsdf.inputs['Coat Weight'])
+    links.new(ramps['Surface'].outputs['Alpha'], bsdf.inputs['Coat Roughness'])
+    links.new(ramps['Emission'].outputs['Color'], bsdf.inputs['Emission Color'])
+    links.new(ramps['Emission'].outputs['Alpha'], emission_scale.inputs[0])
+    links.new(emission_scale.outputs['Value'], bsdf.inputs['Emission Strength'])
+    links.new(bsdf.outputs['BSDF'], output.inputs['Surface'])
+
+    index = ZoneTableIndex(material, bsdf, ramps)
+
+    if created:
+        # Carry over per-zone BSDF values, then drop the parallel zone nodes
+        for zone, sockets in index.sockets.items():
+            zone_bsdf = nodes.get(f"{zone}_BSDF")
+            for name, entry in sockets.items():
+                entry.default_value = _socket_value(zone_bsdf.inputs[name]) if zone_bsdf else TABLE_DEFAULTS[name]
+
+            for suffix in ('BSDF', 'ColorAttribute'):
+                node = nodes.get(f"{zone}_{suffix}")
+                if node:
+                    nodes.remove(node)
+
+        # Re-index so the shadow and tree signature reflect the cleaned-up graph
+        index = ZoneTableIndex(material, bsdf, ramps)
+
+    _ZONE_INDEX_CACHE[material.name] = index
+
+    logger.verbose(f"✅ Lookup-table material set up for {len(ZONE_TABLE_IDS)} zones")
+    return index
+
+
+# ============================================================
+# MATERIAL UPDATE FUNCTIONS
+# ============================================================
+
+def write_zone_sockets(material: bpy.types.Material, zone: str, targets: Dict) -> List[Dict]:
+    """
+    Write socket values for a zone, skipping sockets whose value is unchanged
+    Returns the changes actually made: [{zone, socket, old, new}, ...]
+    """
+    index = get_zone_index(material)
+    sockets = index.get(zone)
+
+    if not sockets:
+        logger.warn(f"⚠️ BSDF for {zone} not found", zone=zone)
+        return []
+
+    # Direct writes make the zone's property shadow unreliable
+    index.properties.pop(zone, None)
+
+    applied = index.applied[zone]
+    changes = []
+
+    for name, value in targets.items():
+        old = applied.get(name)
+        if old is not None and _values_equal(old, value):
+            continue
+
+        sockets[name].default_value = value
+        applied[name] = value
+        changes.append({'zone': zone, 'socket': name, 'old': old, 'new': value})
+
+    return changes
+
+
+def zone_socket_targets(properties: Dict) -> Dict:
+    """
+    Resolve webhook properties into {socket name: value}
+    Individual properties override finish preset values. Each property only sets
+    its own socket, except that a glow color sent without a strength turns
+    emission on at 1.0 (see SUPERSEDED_PROPERTIES).
+    """
+    targets = {}
+
+    if 'color' in properties:
+        targets['Base Color'] = hex_to_linear_rgba(properties['color'])
 
-    rgb = hex_to_rgb(hex_color)
-    bsdf.inputs['Base Color'].default_value = (*rgb, 1.0)
+    if 'finish' in properties:
+        preset = FINISH_PRESETS.get(properties['finish'])
+        if preset:
+            targets.update(finish_plan(preset).targets)
+        else:
+            logger.warn(f"⚠️ Unknown finish preset: {properties['finish']}", finish=properties['finish'])
 
-    print(f"✅ Updated {zone} color to {hex_color}")
+    if 'metallic' in properties:
+        targets['Metallic'] = properties['metallic']
 
+    if 'roughness' in properties:
+        targets['Roughness'] = properties['roughness']
 
-def update_zone_metallic(material: bpy.types.Material, zone: str, metallic: float):
+    if 'clearcoat' in properties:
+        targets['Coat Weight'] = properties['clearcoat']
+
+    if 'clearcoatRoughness' in properties:
+        targets['Coat Roughness'] = properties['clearcoatRoughness']
+
+    if 'emissive' in properties:
+        targets['Emission Color'] = hex_to_linear_rgba(properties['emissive'])
+        targets['Emission Strength'] = properties.get('emissiveIntensity', 1.0)
+    elif 'emissiveIntensity' in properties:
+        targets['Emission Strength'] = properties['emissiveIntensity']
+
+    return targets
+
+
+def update_zone_color(material: bpy.types.Material, zone: str, hex_color: str) -> List[Dict]:
+    """Update base color for a zone"""
+    changes = write_zone_sockets(material, zone, {'Base Color': hex_to_linear_rgba(hex_color)})
+
+    if changes:
+        logger.verbose(f"✅ Updated {zone} color to {hex_color}")
+    return changes
+
+
+def update_zone_metallic(material: bpy.types.Material, zone: str, metallic: float) -> List[Dict]:
     """Update metallic value for a zone"""
-    nodes = material.node_tree.nodes
-    bsdf = nodes.get(f"{zone}_BSDF")
+    changes = write_zone_sockets(material, zone, {'Metallic': metallic})
 
-    if bsdf:
-        bsdf.inputs['Metallic'].default_value = metallic
-        print(f"✅ Updated {zone} metallic to {metallic}")
-    else:
-        print(f"⚠️ BSDF for {zone} not found")
+    if changes:
+        logger.verbose(f"✅ Updated {zone} metallic to {metallic}")
+    return changes
 
 
-def update_zone_roughness(material: bpy.types.Material, zone: str, roughness: float):
+def update_zone_roughness(material: bpy.types.Material, zone: str, roughness: float) -> List[Dict]:
     """Update roughness value for a zone"""
-    nodes = material.node_tree.nodes
-    bsdf = nodes.get(f"{zone}_BSDF")
+    changes = write_zone_sockets(material, zone, {'Roughness': roughness})
 
-    if bsdf:
-        bsdf.inputs['Roughness'].default_value = roughness
-        print(f"✅ Updated {zone} roughness to {roughness}")
-    else:
-        print(f"⚠️ BSDF for {zone} not found")
+    if changes:
+        logger.verbose(f"✅ Updated {zone} roughness to {roughness}")
+    return changes
 
 
-def update_zone_clearcoat(material: bpy.types.Material, zone: str, clearcoat: float, clearcoat_roughness: float = 0.1):
+def update_zone_clearcoat(material: bpy.types.Material, zone: str, clearcoat: float, clearcoat_roughness: float = 0.1) -> List[Dict]:
     """Update clearcoat values for a zone"""
-    nodes = material.node_tree.nodes
-    bsdf = nodes.get(f"{zone}_BSDF")
+    changes = write_zone_sockets(material, zone, {
+        'Coat Weight': clearcoat,
+        'Coat Roughness': clearcoat_roughness,
+    })
 
-    if bsdf:
-        bsdf.inputs['Coat Weight'].default_value = clearcoat
-        bsdf.inputs['Coat Roughness'].default_value = clearcoat_roughness
-        print(f"✅ Updated {zone} clearcoat to {clearcoat}, roughness {clearcoat_roughness}")
-    else:
-        print(f"⚠️ BSDF for {zone} not found")
+    if changes:
+        logger.verbose(f"✅ Updated {zone} clearcoat to {clearcoat}, roughness {clearcoat_roughness}")
+    return changes
 
 
-def update_zone_emissive(material: bpy.types.Material, zone: str, hex_color: str, intensity: float = 1.0):
+def update_zone_emissive(material: bpy.types.Material, zone: str, hex_color: str, intensity: float = 1.0) -> List[Dict]:
     """Update emissive color and intensity for a zone"""
-    nodes = material.node_tree.nodes
-    bsdf = nodes.get(f"{zone}_BSDF")
+    changes = write_zone_sockets(material, zone, {
+        'Emission Color': hex_to_linear_rgba(hex_color),
+        'Emission Strength': intensity,
+    })
 
-    if bsdf:
-        rgb = hex_to_rgb(hex_color)
-        bsdf.inputs['Emission Color'].default_value = (*rgb, 1.0)
-        bsdf.inputs['Emission Strength'].default_value = intensity
-        print(f"✅ Updated {zone} emission to {hex_color} @ {intensity}")
-    else:
-        print(f"⚠️ BSDF for {zone} not found")
+    if changes:
+        logger.verbose(f"✅ Updated {zone} emission to {hex_color} @ {intensity}")
+    return changes
 
 
-def apply_finish_preset(material: bpy.types.Material, zone: str, finish: str):
+def apply_finish_preset(material: bpy.types.Material, zone: str, finish: str) -> List[Dict]:
     """Apply a material finish preset to a zone"""
     if finish not in FINISH_PRESETS:
-        print(f"⚠️ Unknown finish preset: {finish}")
-        return
+        logger.warn(f"⚠️ Unknown finish preset: {finish}", finish=finish)
+        return []
 
-    preset = FINISH_PRESETS[finish]
-    update_zone_metallic(material, zone, preset['metallic'])
-    update_zone_roughness(material, zone, preset['roughness'])
+    changes = write_zone_sockets(material, zone, finish_plan(FINISH_PRESETS[finish]).targets)
 
-    print(f"✅ Applied {finish} finish to {zone}")
+    if changes:
+        logger.verbose(f"✅ Applied {finish} finish to {zone}")
+    return changes
 
 
 # ============================================================
 # WEBHOOK INTEGRATION
 # ============================================================
 
-def apply_webhook_updates(updates: List[Dict]):
+def apply_webhook_updates(updates: List[Dict], material: Optional[bpy.types.Material] = None) -> Dict:
     """
     Apply material updates from webhook payload
 
     Args:
+        material: Already resolved and set-up helmet material (service mode).
+            When omitted the material is looked up and its zone system set up.
         updates: List of zone updates, e.g.:
         [
             {
@@ -254,53 +770,572 @@ def apply_webhook_updates(updates: List[Dict]):
             }
         ]
     """
-    material = find_helmet_material()
+    start = time.perf_counter()
+    lookup = 'given'
+
+    if material is None:
+        material = find_helmet_material()
+        lookup = _HELMET_LOOKUP['source']
+
+        if not material:
+            logger.warn("❌ No helmet material found!")
+            return {'success': False, 'error': 'No helmet material found'}
 
-    if not material:
-        print("❌ No helmet material found!")
-        return
+        # Ensure material system is set up (reuses the cached zone index)
+        get_zone_index(material)
 
-    print(f"🎨 Applying {len(updates)} material update(s) to '{material.name}'")
+    resolve_ms = (time.perf_counter() - start) * 1000
 
-    # Ensure material system is set up
-    setup_zone_based_material(material)
+    logger.verbose(f"🎨 Applying {len(updates)} material update(s) to '{material.name}'")
+
+    result = _apply_zone_updates(material, updates)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    logger.summary(
+        f"🎨 '{material.name}': {len(updates)} update(s), {len(result['changes'])} socket change(s), "
+        f"{result['unchanged']} unchanged, {len(result['invalid_zones'])} invalid in {elapsed_ms:.2f} ms "
+        f"(resolve {resolve_ms:.2f} ms, {lookup})",
+        {
+            'event': 'apply',
+            'material': material.name,
+            'updates': len(updates),
+            'zones_changed': len(result['updated_zones']),
+            'changes': len(result['changes']),
+            'unchanged': result['unchanged'],
+            'invalid': len(result['invalid_zones']),
+            'lookup': lookup,
+            'resolve_ms': round(resolve_ms, 3),
+            'elapsed_ms': round(elapsed_ms, 3),
+        },
+    )
+
+    return {
+        'success': True,
+        **result,
+        'lookup': lookup,
+        'resolve_ms': round(resolve_ms, 3),
+        'elapsed_ms': round(elapsed_ms, 3),
+    }
+
+
+def _apply_zone_updates(material: bpy.types.Material, updates: List[Dict]) -> Dict:
+    """
+    Write zone updates to a resolved material without logging a summary
+    Returns {material, updated_zones, invalid_zones, unchanged, changes}
+    """
+    index = get_zone_index(material)
+    updated_zones = []
+    invalid_zones = []
+    changes = []
+    unchanged = 0
 
     for update in updates:
         zone = update.get('zone')
         properties = update.get('properties', {})
 
         if not zone or zone not in ZONES:
-            print(f"⚠️ Invalid zone: {zone}")
+            logger.warn(f"⚠️ Invalid zone: {zone}", zone=zone)
+            invalid_zones.append(zone)
             continue
 
-        print(f"\n🔧 Updating {zone}:")
+        # Fast path: the zone's last applied properties are re-sent unchanged
+        if index.properties.get(zone) == properties:
+            unchanged += 1
+            continue
+
+        zone_changes = write_zone_sockets(material, zone, zone_socket_targets(properties))
+        index.properties[zone] = dict(properties)
+
+        if not zone_changes:
+            unchanged += 1
+            continue
+
+        updated_zones.append(zone)
+        changes.extend(zone_changes)
+
+        if logger.is_verbose:
+            logger.verbose(f"🔧 Updated {zone}:")
+            for change in zone_changes:
+                logger.verbose(f"   ✅ {change['socket']} → {change['new']}")
+
+    return {
+        'material': material.name,
+        'updated_zones': updated_zones,
+        'invalid_zones': invalid_zones,
+        'unchanged': unchanged,
+        'changes': changes,
+    }
+
+
+# ============================================================
+# BATCH UPDATES
+# ============================================================
+# Roster exports update many helmets (one material each) at once. A batch maps
+# material or object names to `updates` lists; all targets are resolved in one
+# pass over bpy.data.materials and applied in a single call with one summary.
+
+def _object_helmet_material(obj) -> Optional[bpy.types.Material]:
+    """First node-based material on an object's data"""
+    for material in getattr(obj.data, 'materials', None) or ():
+        if material and material.use_nodes:
+            return material
+    return None
+
 
-        # Apply color
-        if 'color' in properties:
-            update_zone_color(material, zone, properties['color'])
+def resolve_helmet_targets(names: List[str]) -> Tuple[Dict[str, bpy.types.Material], List[str]]:
+    """
+    Resolve material or object names to helmet materials
+    Material names are matched in one pass over bpy.data.materials; names that are
+    not node materials are looked up as objects. Returns ({name: material}, missing names).
+    """
+    pending = set(names)
+    materials = {}
 
-        # Apply finish preset
-        if 'finish' in properties:
-            apply_finish_preset(material, zone, properties['finish'])
+    for material in bpy.data.materials:
+        if material.name in pending and material.use_nodes:
+            materials[material.name] = material
+            pending.discard(material.name)
+            if not pending:
+                break
 
-        # Apply individual properties (override preset values)
-        if 'metallic' in properties:
-            update_zone_metallic(material, zone, properties['metallic'])
+    for name in pending:
+        obj = bpy.data.objects.get(name)
+        material = _object_helmet_material(obj) if obj else None
+        if material:
+            materials[name] = material
 
-        if 'roughness' in properties:
-            update_zone_roughness(material, zone, properties['roughness'])
+    targets = {name: materials[name] for name in names if name in materials}
+    missing = [name for name in names if name not in materials]
+    return targets, missing
 
-        if 'clearcoat' in properties or 'clearcoatRoughness' in properties:
-            clearcoat = properties.get('clearcoat', 0.0)
-            clearcoat_roughness = properties.get('clearcoatRoughness', 0.1)
-            update_zone_clearcoat(material, zone, clearcoat, clearcoat_roughness)
 
-        if 'emissive' in properties:
-            emissive_color = properties['emissive']
-            emissive_intensity = properties.get('emissiveIntensity', 1.0)
-            update_zone_emissive(material, zone, emissive_color, emissive_intensity)
+def apply_batch_updates(batch: Dict[str, List[Dict]]) -> Dict:
+    """
+    Apply updates to several helmets in one call
 
-    print("\n✅ All material updates applied successfully!")
+    Args:
+        batch: {material or object name: updates}, with updates as for
+            apply_webhook_updates, e.g.:
+        {
+            "Helmet_Player_07": [{"zone": "SHELL", "properties": {"color": "#1E3A8A"}}],
+            "Helmet_Player_12": [{"zone": "FACEMASK", "properties": {"finish": "chrome"}}]
+        }
+
+    Resolved helmets are updated even when others are missing; `success` is False
+    if any name could not be resolved. Per-helmet results are under `results`.
+    """
+    start = time.perf_counter()
+
+    targets, missing = resolve_helmet_targets(list(batch))
+    resolve_ms = (time.perf_counter() - start) * 1000
+    for name in missing:
+        logger.warn(f"⚠️ No helmet material for '{name}'", target=name)
+
+    results = {}
+    for name, material in targets.items():
+        results[name] = _apply_zone_updates(material, batch[name])
+
+    updates = sum(len(batch[name]) for name in targets)
+    changes = sum(len(result['changes']) for result in results.values())
+    unchanged = sum(result['unchanged'] for result in results.values())
+    invalid = sum(len(result['invalid_zones']) for result in results.values())
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    logger.summary(
+        f"🎨 {len(targets)} helmet(s): {updates} update(s), {changes} socket change(s), "
+        f"{unchanged} unchanged, {invalid} invalid, {len(missing)} missing in {elapsed_ms:.2f} ms "
+        f"(resolve {resolve_ms:.2f} ms)",
+        {
+            'event': 'apply_batch',
+            'helmets': len(targets),
+            'missing': len(missing),
+            'updates': updates,
+            'changes': changes,
+            'unchanged': unchanged,
+            'invalid': invalid,
+            'resolve_ms': round(resolve_ms, 3),
+            'elapsed_ms': round(elapsed_ms, 3),
+        },
+    )
+
+    return {
+        'success': not missing,
+        'helmets': len(targets),
+        'missing': missing,
+        'updates': updates,
+        'changes': changes,
+        'unchanged': unchanged,
+        'invalid': invalid,
+        'results': results,
+        'resolve_ms': round(resolve_ms, 3),
+        'elapsed_ms': round(elapsed_ms, 3),
+    }
+
+
+# ============================================================
+# UPDATE COALESCING
+# ============================================================
+# Slider drags send many `updates` arrays per second. Instead of applying each
+# one serially, updates are buffered, merged per (zone, property) with
+# latest-wins semantics and applied as one batch per frame interval.
+
+FRAME_INTERVAL = float(os.environ.get('HELMET_FRAME_INTERVAL', 1 / 30))  # seconds
+
+# Applying these properties also resets the listed ones (see zone_socket_targets),
+# so a newer value drops older pending values of the superseded properties. The
+# merged batch then leaves every socket as applying the updates one by one would.
+SUPERSEDED_PROPERTIES = {
+    'finish': ('metallic', 'roughness'),
+    'emissive': ('emissiveIntensity',),
+}
+
+
+def _is_ignored(key: str, value) -> bool:
+    """True for values zone_socket_targets skips (an unknown finish), which must not be merged"""
+    return key == 'finish' and value not in FINISH_PRESETS
+
+
+class UpdateCoalescer:
+    """
+    Buffers webhook updates and merges them per (zone, property), latest wins
+    flush() applies one consolidated batch; start() flushes once per frame interval
+    """
+
+    def __init__(self, apply=None, frame_interval: float = FRAME_INTERVAL):
+        self.apply = apply or apply_webhook_updates
+        self.frame_interval = frame_interval
+        self.running = False
+        self.total_received = 0
+        self.total_dropped = 0
+        self._pending: Dict[str, Dict] = {}
+        self._received = 0
+        self._dropped = 0
+        self._lock = threading.Lock()
+
+    def push(self, updates: List[Dict]):
+        """Merge updates into the pending batch (safe to call from any thread)"""
+        check_updates(updates)  # Nothing is merged from a malformed list
+        with self._lock:
+            for update in updates:
+                received = update.get('properties', {})
+                pending = self._pending.setdefault(update.get('zone'), {})
+
+                # Skipped when applied serially, so it must not replace a pending value either
+                properties = {key: value for key, value in received.items() if not _is_ignored(key, value)}
+                if len(properties) < len(received):
+                    logger.warn(f"⚠️ Unknown finish preset: {received['finish']}", finish=received['finish'])
+                    self._dropped += 1
+
+                for key in properties:
+                    for superseded in SUPERSEDED_PROPERTIES.get(key, ()):
+                        if superseded not in properties and superseded in pending:
+                            del pending[superseded]
+                            self._dropped += 1
+
+                for key, value in properties.items():
+                    if key in pending:
+                        self._dropped += 1
+                    pending[key] = value
+
+                self._received += len(received)
+
+    def take(self) -> Tuple[List[Dict], Dict]:
+        """Remove and return the pending batch with its coalescing stats"""
+        with self._lock:
+            batch = [
+                {'zone': zone, 'properties': properties}
+                for zone, properties in self._pending.items()
+            ]
+            stats = {'received': self._received, 'dropped': self._dropped}
+
+            self.total_received += self._received
+            self.total_dropped += self._dropped
+            self._pending = {}
+            self._received = 0
+            self._dropped = 0
+
+        return batch, stats
+
+    def flush(self) -> Optional[Dict]:
+        """Apply the pending batch; returns None when nothing was queued"""
+        batch, stats = self.take()
+        if not batch:
+            return None
+
+        result = self.apply(batch)
+        result['coalesced'] = stats
+
+        if stats['dropped']:
+            logger.verbose(f"🔀 Coalesced {stats['received']} update(s), dropped {stats['dropped']}")
+        return result
+
+    def _tick(self) -> Optional[float]:
+        self.flush()
+        return self.frame_interval if self.running else None
+
+    def start(self):
+        """Flush once per frame interval via bpy.app.timers"""
+        if not self.running:
+            self.running = True
+            bpy.app.timers.register(self._tick, first_interval=self.frame_interval, persistent=True)
+        return self
+
+    def stop(self):
+        """Unregister the timer and apply whatever is still pending"""
+        self.running = False
+        if bpy.app.timers.is_registered(self._tick):
+            bpy.app.timers.unregister(self._tick)
+        return self.flush()
+
+
+# ============================================================
+# SERVICE MODE
+# ============================================================
+# Keeps this module resident inside Blender so webhook calls only carry the
+# JSON `updates` list. Requests arrive on a local socket (one JSON document per
+# line) and are queued; bpy is not thread-safe, so once per frame interval the
+# queue is drained on the main thread by a bpy.app.timers callback (or
+# serve_forever() in --background) and applied as one coalesced batch.
+
+MODULE_NAME = 'update_helmet_materials'
+SERVICE_HOST = os.environ.get('HELMET_SERVICE_HOST', '127.0.0.1')
+SERVICE_PORT = int(os.environ.get('HELMET_SERVICE_PORT', '9877'))
+SERVICE_REQUEST_TIMEOUT = 10.0
+
+
+def check_updates(updates, label: str = 'updates'):
+    """Raise ValueError unless `updates` is a list of {zone: str, properties: dict}"""
+    if not isinstance(updates, list):
+        raise ValueError(f"'{label}' must be a list of {{zone, properties}} objects")
+    for i, update in enumerate(updates):
+        if not isinstance(update, dict):
+            raise ValueError(f"{label}[{i}] must be an object")
+        if not isinstance(update.get('zone'), str):
+            raise ValueError(f"{label}[{i}].zone must be a string")
+        if not isinstance(update.get('properties'), dict):
+            raise ValueError(f"{label}[{i}].properties must be an object")
+
+
+def check_batch(helmets):
+    """Raise ValueError unless `helmets` maps helmet names to update lists"""
+    if not isinstance(helmets, dict):
+        raise ValueError("'helmets' must map helmet names to update lists")
+    for name, updates in helmets.items():
+        check_updates(updates, f"helmets.{name}")
+
+
+class _ServiceRequestHandler(socketserver.StreamRequestHandler):
+    """Reads newline-delimited JSON payloads and writes one JSON result per line"""
+
+    def handle(self):
+        for line in self.rfile:
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                payload = json.loads(line)
+                if isinstance(payload, dict) and 'helmets' in payload:
+                    check_batch(payload['helmets'])
+                    result = self.server.service.submit(payload['helmets'], batch=True)
+                else:
+                    updates = payload.get('updates', []) if isinstance(payload, dict) else payload
+                    check_updates(updates)
+                    result = self.server.service.submit(updates)
+            except Exception as e:
+                result = {'success': False, 'error': str(e)}
+
+            self.wfile.write((json.dumps(result) + '\n').encode('utf-8'))
+            self.wfile.flush()
+
+
+class _ServiceServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class MaterialUpdateService:
+    """
+    Resident material updater
+    Resolves the helmet material and zone shaders once and reuses them for every update
+    """
+
+    def __init__(self, host: str = SERVICE_HOST, port: int = SERVICE_PORT,
+                 poll_interval: float = FRAME_INTERVAL):
+        self.host = host
+        self.port = port
+        self.poll_interval = poll_interval
+        self.coalescer = UpdateCoalescer(apply=self.apply, frame_interval=poll_interval)
+        self.material = None
+        self.zone_index = None
+        self.running = False
+        self._jobs = queue.Queue()
+        self._server = None
+        self._thread = None
+
+    def resolve(self) -> Optional[bpy.types.Material]:
+        """Return the cached helmet material, re-resolving only if it was removed"""
+        if self.material is not None:
+            try:
+                self.material.name  # Raises ReferenceError once the datablock is freed
+                self.zone_index = get_zone_index(self.material)
+                return self.material
+            except ReferenceError:
+                self.material = None
+                self.zone_index = None
+
+        material = find_helmet_material()
+        if material:
+            self.zone_index = build_zone_index(material)
+            self.material = material
+        return self.material
+
+    def apply(self, updates: List[Dict]) -> Dict:
+        """Apply updates on the calling (main) thread"""
+        material = self.resolve()
+        if not material:
+            logger.warn("❌ No helmet material found!")
+            return {'success': False, 'error': 'No helmet material found'}
+        return apply_webhook_updates(updates, material=material)
+
+    def submit(self, updates, timeout: float = SERVICE_REQUEST_TIMEOUT, batch: bool = False) -> Dict:
+        """
+        Queue updates from a worker thread and wait for the main thread to apply them
+        With batch=True `updates` is an apply_batch_updates mapping of helmet names to updates.
+        """
+        job = {'updates': updates, 'batch': batch, 'done': threading.Event(), 'result': None}
+        self._jobs.put(job)
+
+        if not job['done'].wait(timeout):
+            return {'success': False, 'error': f'Timed out after {timeout}s waiting for Blender'}
+        return job['result']
+
+    def drain(self) -> Optional[float]:
+        """
+        Coalesce every queued job into one batch and apply it
+        Registered as a bpy.app.timers callback; all drained jobs share the result.
+        Multi-helmet batch jobs are applied on their own.
+        """
+        jobs = []
+        while True:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                break
+
+            if job['batch']:
+                try:
+                    job['result'] = apply_batch_updates(job['updates'])
+                except Exception as e:
+                    job['result'] = {'success': False, 'error': str(e)}
+                job['done'].set()
+                continue
+
+            # A malformed job fails on its own instead of the whole drain pass
+            try:
+                self.coalescer.push(job['updates'])
+            except Exception as e:
+                job['result'] = {'success': False, 'error': str(e)}
+                job['done'].set()
+                continue
+            jobs.append(job)
+
+        if jobs:
+            try:
+                result = self.coalescer.flush() or {'success': True, 'changes': []}
+            except Exception as e:
+                result = {'success': False, 'error': str(e)}
+
+            for job in jobs:
+                job['result'] = result
+                job['done'].set()
+
+        return self.poll_interval if self.running else None
+
+    def start(self, use_timer: bool = True):
+        """Open the socket and start draining the queue"""
+        if self.running:
+            return self
+
+        self._server = _ServiceServer((self.host, self.port), _ServiceRequestHandler)
+        self._server.service = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        self.running = True
+
+        if use_timer:
+            bpy.app.timers.register(self.drain, first_interval=self.poll_interval, persistent=True)
+
+        logger.info(f"✅ Material update service listening on {self.host}:{self.port}")
+        return self
+
+    def serve_forever(self):
+        """Drain the queue on the main thread (for `blender --background`)"""
+        if not self.running:
+            self.start(use_timer=False)
+
+        try:
+            while self.running:
+                self.drain()
+                time.sleep(self.poll_interval)
+        except KeyboardInterrupt:
+            self.stop()
+
+    def stop(self):
+        """Close the socket and unregister the timer"""
+        self.running = False
+
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+        if bpy.app.timers.is_registered(self.drain):
+            bpy.app.timers.unregister(self.drain)
+
+        logger.info("🛑 Material update service stopped")
+
+
+def register_module() -> types.ModuleType:
+    """
+    Register this script as an importable module
+    When executed via MCP the source runs in a throwaway namespace, so later
+    calls can reach the resident service with `import update_helmet_materials`.
+    """
+    module = sys.modules.get(MODULE_NAME)
+    if module is None:
+        module = types.ModuleType(MODULE_NAME)
+        module.__dict__.update(globals())
+        sys.modules[MODULE_NAME] = module
+    return module
+
+
+def get_service() -> Optional[MaterialUpdateService]:
+    """Return the running service, if any"""
+    module = sys.modules.get(MODULE_NAME)
+    service = getattr(module, 'service', None) if module else None
+    return service if service and service.running else None
+
+
+def start_service(host: str = SERVICE_HOST, port: int = SERVICE_PORT,
+                  use_timer: bool = True) -> MaterialUpdateService:
+    """Start (or return the already running) resident material update service"""
+    service = get_service()
+    if service:
+        return service
+
+    module = register_module()
+    service = MaterialUpdateService(host, port)
+    service.resolve()
+    module.service = service
+    return service.start(use_timer=use_timer)
+
+
+def stop_service():
+    """Stop the resident service if it is running"""
+    service = get_service()
+    if service:
+        service.stop()
 
 
 # ============================================================
@@ -308,45 +1343,60 @@ def apply_webhook_updates(updates: List[Dict]):
 # ============================================================
 
 if __name__ == "__main__":
-    # Example: Update all zones with default colors and finishes
-    example_updates = [
-        {
-            "zone": "SHELL",
-            "properties": {
-                "color": "#1E3A8A",  # Navy blue
-                "finish": "glossy",
-                "clearcoat": 0.9,
-                "clearcoatRoughness": 0.1
-            }
-        },
-        {
-            "zone": "FACEMASK",
-            "properties": {
-                "color": "#C0C0C0",  # Chrome silver
-                "finish": "chrome",
-            }
-        },
-        {
-            "zone": "CHINSTRAP",
-            "properties": {
-                "color": "#1F2937",  # Dark gray
-                "finish": "matte",
-            }
-        },
-        {
-            "zone": "INTERIOR_PADDING",
-            "properties": {
-                "color": "#F3F4F6",  # Light gray
-                "finish": "matte",
-            }
-        },
-        {
-            "zone": "HARDWARE",
-            "properties": {
-                "color": "#FCD34D",  # Gold
-                "finish": "brushed",
-            }
-        },
-    ]
+    script_args = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+
+    if '--log-level' in script_args:
+        configure_logging(script_args[script_args.index('--log-level') + 1])
+
+    if '--service' in script_args:
+        service = start_service(use_timer=not bpy.app.background)
+        if bpy.app.background:
+            service.serve_forever()
+    elif '--batch' in script_args:
+        # Roster export: {material or object name: updates} from a JSON file
+        with open(script_args[script_args.index('--batch') + 1]) as f:
+            batch_result = apply_batch_updates(json.load(f))
+        sys.exit(0 if batch_result['success'] else 1)
+    else:
+        # Example: Update all zones with default colors and finishes
+        example_updates = [
+            {
+                "zone": "SHELL",
+                "properties": {
+                    "color": "#1E3A8A",  # Navy blue
+                    "finish": "glossy",
+                    "clearcoat": 0.9,
+                    "clearcoatRoughness": 0.1
+                }
+            },
+            {
+                "zone": "FACEMASK",
+                "properties": {
+                    "color": "#C0C0C0",  # Chrome silver
+                    "finish": "chrome",
+                }
+            },
+            {
+                "zone": "CHINSTRAP",
+                "properties": {
+                    "color": "#1F2937",  # Dark gray
+                    "finish": "matte",
+                }
+            },
+            {
+                "zone": "INTERIOR_PADDING",
+                "properties": {
+                    "color": "#F3F4F6",  # Light gray
+                    "finish": "matte",
+                }
+            },
+            {
+                "zone": "HARDWARE",
+                "properties": {
+                    "color": "#FCD34D",  # Gold
+                    "finish": "brushed",
+                }
+            },
+        ]
 
-    apply_webhook_updates(example_updates)
+        apply_webhook_updates(example_updates)
@@ -0,0 +1,278 @@
+"""
+GLB Mesh Budget Checker
+Reports download and geometry statistics for the shipped helmet GLB and fails
+when they exceed the configured budgets, for use in CI or before publishing
+
+Reports:
+    - File size, stored (Draco-compressed where used) vs decoded mesh bytes, image bytes
+    - Triangle and vertex counts per zone (see helmet_glb.py)
+    - Histogram of COLOR_0 vertex colors with the zone each one maps to
+
+Works on memory-mapped NumPy views (helmet_glb.GLBFile), so large files are never
+copied into Python objects. Draco primitives are decoded with DracoPy when it is
+installed; otherwise they are reported as UNDECODED from accessor metadata.
+
+Usage:
+    python3 scripts/check_glb_budget.py
+    python3 scripts/check_glb_budget.py public/helmet.glb --max-triangles 50000 --zone-triangles SHELL=20000
+    python3 scripts/check_glb_budget.py --budgets budgets.json --json
+
+Budget file (any subset of DEFAULT_BUDGETS; null disables a check):
+    {"fileBytes": 2000000, "triangles": 50000, "zoneTriangles": {"SHELL": 20000}}
+
+Exit code 1 when a budget is exceeded.
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+from helmet_glb import (
+    COMPONENT_DTYPES, GLB_PATH, TYPE_SIZES, UNMATCHED_ZONE, ZONE_TOLERANCE, DracoUnavailableError,
+    GLBFile, is_draco, mesh_instances, primitive_geometry, zone_palette, zone_stats,
+)
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+DEFAULT_BUDGETS = {
+    "fileBytes": 2_500_000,        # Download size of the GLB
+    "meshDecodedBytes": 8_000_000,  # Vertex + index data after decompression
+    "triangles": 60_000,           # All zones, every mesh instance
+    "zoneTriangles": {},           # Per zone, e.g. {"SHELL": 30000}
+    "unmatchedVertices": None,     # Vertices whose color is not a zone color
+}
+
+HISTOGRAM_SIZE = 10  # Most common colors to print
+
+# ============================================================
+# STATISTICS
+# ============================================================
+
+def accessor_bytes(glb, index):
+    """Size of an accessor's data once decoded"""
+    accessor = glb.json["accessors"][index]
+    itemsize = np.dtype(COMPONENT_DTYPES[accessor["componentType"]]).itemsize
+    return accessor["count"] * itemsize * TYPE_SIZES[accessor["type"]]
+
+
+def size_report(glb):
+    """Stored vs decoded mesh bytes (each mesh counted once) plus file and image sizes"""
+    stored = 0
+    decoded = 0
+    draco_primitives = 0
+    primitives = 0
+    counted = set()
+
+    for mesh in glb.json.get("meshes", []):
+        for primitive in mesh["primitives"]:
+            primitives += 1
+            accessors = set(primitive["attributes"].values())
+            if "indices" in primitive:
+                accessors.add(primitive["indices"])
+            accessors -= counted
+            counted |= accessors
+
+            decoded_bytes = sum(accessor_bytes(glb, index) for index in accessors)
+            decoded += decoded_bytes
+            if is_draco(primitive):
+                draco_primitives += 1
+                stored += glb.buffer_view_bytes(primitive["extensions"]["KHR_draco_mesh_compression"]["bufferView"])
+            else:
+                stored += decoded_bytes
+
+    image_bytes = sum(
+        glb.buffer_view_bytes(image["bufferView"])
+        for image in glb.json.get("images", []) if "bufferView" in image
+    )
+
+    return {
+        "fileBytes": glb.file_size,
+        "jsonBytes": glb.json_length,
+        "binBytes": glb.bin_length,
+        "meshStoredBytes": stored,
+        "meshDecodedBytes": decoded,
+        "imageBytes": image_bytes,
+        "primitives": primitives,
+        "dracoPrimitives": draco_primitives,
+    }
+
+
+def color_histogram(glb, tolerance=ZONE_TOLERANCE):
+    """
+    COLOR_0 values (quantized to 8 bits) by vertex count over every mesh instance
+    Returns [{"color": "#RRGGBB", "vertices", "zone"}], most common first.
+    """
+    names, palette = zone_palette()
+    counts = Counter()
+    meshes = glb.json.get("meshes", [])
+
+    for _, mesh_index, _ in mesh_instances(glb):
+        for primitive in meshes[mesh_index]["primitives"]:
+            try:
+                _, colors, _ = primitive_geometry(glb, primitive)
+            except DracoUnavailableError:
+                continue
+            if colors is None:
+                continue
+
+            quantized = np.rint(np.clip(colors[:, :3], 0.0, 1.0) * 255).astype(np.uint32)
+            keys = (quantized[:, 0] << 16) | (quantized[:, 1] << 8) | quantized[:, 2]
+            unique, unique_counts = np.unique(keys, return_counts=True)
+            counts.update(dict(zip(unique.tolist(), unique_counts.tolist())))
+
+    histogram = []
+    for key, vertices in counts.most_common():
+        rgb = np.array([(key >> 16) & 0xFF, (key >> 8) & 0xFF, key & 0xFF], dtype=np.float32) / 255
+        distances = np.sqrt(np.square(palette - rgb).sum(axis=1))
+        zone_index = int(distances.argmin())
+        histogram.append({
+            "color": f"#{key:06X}",
+            "vertices": vertices,
+            "zone": names[zone_index] if distances[zone_index] <= tolerance else UNMATCHED_ZONE,
+        })
+    return histogram
+
+
+def build_report(glb, tolerance=ZONE_TOLERANCE):
+    stats = zone_stats(glb, tolerance=tolerance)
+    return {
+        "file": str(glb.path),
+        "sizes": size_report(glb),
+        "triangles": sum(zone["triangles"] for zone in stats["zones"].values()),
+        "vertices": sum(zone["vertices"] for zone in stats["zones"].values()),
+        "zones": {
+            name: {"vertices": zone["vertices"], "triangles": zone["triangles"]}
+            for name, zone in stats["zones"].items()
+        },
+        "colors": color_histogram(glb, tolerance),
+    }
+
+
+# ============================================================
+# BUDGETS
+# ============================================================
+
+def check_budgets(report, budgets):
+    """List of human-readable budget violations (empty when within budget)"""
+    violations = []
+
+    def check(label, value, limit):
+        if limit is not None and value > limit:
+            violations.append(f"{label}: {value:,} > {limit:,}")
+
+    check("File size (bytes)", report["sizes"]["fileBytes"], budgets.get("fileBytes"))
+    check("Decoded mesh size (bytes)", report["sizes"]["meshDecodedBytes"], budgets.get("meshDecodedBytes"))
+    check("Triangles", report["triangles"], budgets.get("triangles"))
+    check(
+        "Unmatched vertices",
+        report["zones"].get(UNMATCHED_ZONE, {}).get("vertices", 0),
+        budgets.get("unmatchedVertices"),
+    )
+
+    for zone_name, limit in (budgets.get("zoneTriangles") or {}).items():
+        zone = report["zones"].get(zone_name)
+        if zone is None:
+            violations.append(f"{zone_name}: unknown zone in budget")
+            continue
+        check(f"{zone_name} triangles", zone["triangles"], limit)
+
+    return violations
+
+
+def load_budgets(args):
+    """DEFAULT_BUDGETS, overridden by --budgets file, overridden by individual flags"""
+    budgets = dict(DEFAULT_BUDGETS, zoneTriangles=dict(DEFAULT_BUDGETS["zoneTriangles"]))
+
+    if args.budgets:
+        with open(args.budgets) as f:
+            overrides = json.load(f)
+        unknown = set(overrides) - set(DEFAULT_BUDGETS)
+        if unknown:
+            raise ValueError(f"Unknown budget(s) in {args.budgets}: {', '.join(sorted(unknown))}")
+        budgets.update(overrides)
+
+    if args.max_file_bytes is not None:
+        budgets["fileBytes"] = args.max_file_bytes
+    if args.max_triangles is not None:
+        budgets["triangles"] = args.max_triangles
+    if args.max_unmatched is not None:
+        budgets["unmatchedVertices"] = args.max_unmatched
+    for entry in args.zone_triangles:
+        zone_name, _, limit = entry.partition("=")
+        budgets["zoneTriangles"][zone_name.strip().upper()] = int(limit)
+
+    return budgets
+
+
+# ============================================================
+# MAIN
+# ============================================================
+
+def print_report(report, budgets):
+    sizes = report["sizes"]
+    print(f"\n📦 {report['file']}")
+    print(f"   File: {sizes['fileBytes']:,} bytes (JSON {sizes['jsonBytes']:,}, BIN {sizes['binBytes']:,})")
+    print(f"   Mesh: {sizes['meshStoredBytes']:,} bytes stored → {sizes['meshDecodedBytes']:,} decoded "
+          f"({sizes['dracoPrimitives']}/{sizes['primitives']} primitive(s) Draco-compressed)")
+    print(f"   Images: {sizes['imageBytes']:,} bytes")
+
+    zone_budgets = budgets.get("zoneTriangles") or {}
+    print(f"\n{'Zone':<18}{'Vertices':>10}{'Triangles':>11}{'Budget':>10}")
+    for name, zone in report["zones"].items():
+        limit = zone_budgets.get(name)
+        print(f"{name:<18}{zone['vertices']:>10,}{zone['triangles']:>11,}{(f'{limit:,}' if limit else '-'):>10}")
+    limit = budgets.get("triangles")
+    print(f"{'TOTAL':<18}{report['vertices']:>10,}{report['triangles']:>11,}{(f'{limit:,}' if limit else '-'):>10}")
+
+    print(f"\n{'Vertex color':<14}{'Vertices':>10}   Zone")
+    for entry in report["colors"][:HISTOGRAM_SIZE]:
+        print(f"{entry['color']:<14}{entry['vertices']:>10,}   {entry['zone']}")
+    if len(report["colors"]) > HISTOGRAM_SIZE:
+        print(f"... {len(report['colors']) - HISTOGRAM_SIZE} more color(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check a helmet GLB against download and triangle budgets")
+    parser.add_argument("glb", nargs="?", type=Path, default=GLB_PATH, help="GLB file (default: public/helmet.glb)")
+    parser.add_argument("--budgets", type=Path, help="JSON file overriding DEFAULT_BUDGETS")
+    parser.add_argument("--max-file-bytes", type=int, help="Max GLB file size")
+    parser.add_argument("--max-triangles", type=int, help="Max triangles over all zones")
+    parser.add_argument("--max-unmatched", type=int, help="Max vertices whose color is not a zone color")
+    parser.add_argument("--zone-triangles", action="append", default=[], metavar="ZONE=N", help="Max triangles for one zone")
+    parser.add_argument("--tolerance", type=float, default=ZONE_TOLERANCE, help="Max RGB distance from a zone color")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    try:
+        budgets = load_budgets(args)
+    except ValueError as e:
+        parser.error(str(e))
+
+    with GLBFile(args.glb) as glb:
+        report = build_report(glb, args.tolerance)
+
+    violations = check_budgets(report, budgets)
+    report["budgets"] = budgets
+    report["violations"] = violations
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, budgets)
+        print()
+        for violation in violations:
+            print(f"❌ Over budget: {violation}")
+        if not violations:
+            print("✅ Within budget")
+
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
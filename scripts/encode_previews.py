@@ -0,0 +1,247 @@
+"""
+Web Encoding Stage for Rendered Previews
+Encodes the PNG previews listed in public/material-previews/manifest.json into
+WebP/AVIF variants at several responsive widths and records them in the manifest
+
+Runs on an existing output directory, independently of Blender. Images are encoded
+in a process pool; variants newer than their source PNG are skipped, so re-running
+after a render only encodes what changed.
+
+Usage:
+    python3 scripts/encode_previews.py
+    python3 scripts/encode_previews.py public/material-previews --workers 8 --formats webp
+
+Requires Pillow (`pip install Pillow`). AVIF needs Pillow 11.3+ or the
+pillow-avif-plugin package; without it only WebP is written.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+OUTPUT_DIR = Path(__file__).parent.parent / "public" / "material-previews"
+ENCODED_DIR_NAME = "encoded"
+URL_PREFIX = "/material-previews"
+
+# Responsive widths; widths above the source width are skipped
+WIDTHS = (256, 512, 1024)
+
+# Pillow save options per format, in preference order (first is the <picture> fallback)
+FORMATS = {
+    "avif": {"quality": 60, "speed": 6},
+    "webp": {"quality": 82, "method": 6},
+}
+
+# ============================================================
+# ENCODING
+# ============================================================
+
+def available_formats():
+    """Formats from FORMATS the installed Pillow can write"""
+    try:
+        import pillow_avif  # noqa: F401 - registers AVIF on Pillow < 11.3
+    except ImportError:
+        pass
+
+    Image.init()
+    return [name for name in FORMATS if name.upper() in Image.SAVE]
+
+
+def variant_name(source_name, width, format_name):
+    return f"{Path(source_name).stem}-{width}w.{format_name}"
+
+
+def encode_image(source, variants):
+    """
+    Write `variants` [(path, format, width)] of one source image
+    Runs in a worker process; returns [(path, bytes)] for the written files.
+    """
+    written = []
+    with Image.open(source) as image:
+        image.load()
+        for path, format_name, width in variants:
+            if width == image.width:
+                resized = image
+            else:
+                height = round(image.height * width / image.width)
+                resized = image.resize((width, height), Image.LANCZOS)
+
+            path = Path(path)
+            tmp_path = path.with_name(path.name + ".tmp")
+            resized.save(tmp_path, format=format_name.upper(), **FORMATS[format_name])
+            tmp_path.replace(path)
+            written.append((str(path), path.stat().st_size))
+    return written
+
+
+def plan_variants(source, encoded_dir, formats, widths, force=False):
+    """(all variants, stale variants) of one source image as [(path, format, width)]"""
+    with Image.open(source) as image:
+        source_width = image.width
+
+    source_mtime = source.stat().st_mtime
+    variants = [
+        (encoded_dir / variant_name(source.name, width, format_name), format_name, width)
+        for format_name in formats
+        for width in sorted({min(width, source_width) for width in widths})
+    ]
+    stale = [
+        variant for variant in variants
+        if force or not variant[0].exists() or variant[0].stat().st_mtime < source_mtime
+    ]
+    return variants, stale
+
+
+def encoded_entry(source, source_url, variants):
+    """Manifest entry for one preview: original size plus a srcset per format"""
+    entry = {
+        "source": source_url,
+        "bytes": source.stat().st_size,
+        "formats": {},
+    }
+
+    for path, format_name, width in variants:
+        url = f"{URL_PREFIX}/{ENCODED_DIR_NAME}/{path.name}"
+        encoded = entry["formats"].setdefault(format_name, {"srcset": "", "variants": []})
+        encoded["variants"].append({"url": url, "width": width, "bytes": path.stat().st_size})
+
+    for encoded in entry["formats"].values():
+        encoded["srcset"] = ", ".join(f"{variant['url']} {variant['width']}w" for variant in encoded["variants"])
+
+    return entry
+
+
+def encode_output_dir(output_dir=OUTPUT_DIR, workers=None, formats=None, widths=WIDTHS, force=False):
+    """
+    Encode every preview in `output_dir`/manifest.json and record the variants under
+    finishes.<finish>.encoded.<color>; returns a summary dict
+    """
+    output_dir = Path(output_dir)
+    manifest_path = output_dir / "manifest.json"
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    supported = available_formats()
+    formats = [name for name in (formats or FORMATS) if name in supported]
+    if not formats:
+        raise RuntimeError(f"Pillow cannot write any of: {', '.join(FORMATS)}")
+
+    encoded_dir = output_dir / ENCODED_DIR_NAME
+    encoded_dir.mkdir(parents=True, exist_ok=True)
+
+    # (finish, color, source path, source url, variants)
+    previews = []
+    tasks = []
+    missing = 0
+    for finish_key, finish in manifest["finishes"].items():
+        for color_name, url in finish["previews"].items():
+            source = output_dir / url.rsplit("/", 1)[-1]
+            if not source.exists():
+                missing += 1
+                continue
+
+            variants, stale = plan_variants(source, encoded_dir, formats, widths, force)
+            previews.append((finish_key, color_name, source, url, variants))
+            if stale:
+                tasks.append((source, stale))
+
+    started = time.perf_counter()
+    encoded_files = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(encode_image, source, stale) for source, stale in tasks]
+        for done, future in enumerate(futures, 1):
+            encoded_files += len(future.result())
+            print(f"[{done}/{len(futures)}] ✅ {tasks[done - 1][0].name}")
+
+    source_bytes = 0
+    smallest_bytes = 0
+    for finish_key, color_name, source, url, variants in previews:
+        entry = encoded_entry(source, url, variants)
+        manifest["finishes"][finish_key].setdefault("encoded", {})[color_name] = entry
+
+        source_bytes += entry["bytes"]
+        smallest_bytes += min(
+            encoded["variants"][-1]["bytes"] for encoded in entry["formats"].values()
+        )
+
+    manifest["encoding"] = {"formats": formats, "widths": list(widths)}
+
+    tmp_path = manifest_path.with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    tmp_path.replace(manifest_path)
+
+    return {
+        "previews": len(previews),
+        "encoded": len(tasks),
+        "skipped": len(previews) - len(tasks),
+        "missing": missing,
+        "files": encoded_files,
+        "formats": formats,
+        "sourceBytes": source_bytes,
+        "encodedBytes": smallest_bytes,  # Full-width variant in the smallest format
+        "elapsedSeconds": round(time.perf_counter() - started, 3),
+    }
+
+
+# ============================================================
+# MAIN
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Encode rendered previews to WebP/AVIF responsive variants")
+    parser.add_argument("output_dir", nargs="?", type=Path, default=OUTPUT_DIR, help="Directory containing manifest.json")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Encoder processes")
+    parser.add_argument("--formats", default=",".join(FORMATS), help="Comma-separated formats (avif,webp)")
+    parser.add_argument("--widths", default=",".join(map(str, WIDTHS)), help="Comma-separated widths")
+    parser.add_argument("--force", action="store_true", help="Re-encode variants even if up to date")
+    args = parser.parse_args()
+
+    if Image is None:
+        print("❌ Pillow is required: pip install Pillow")
+        return 1
+
+    if not (args.output_dir / "manifest.json").exists():
+        print(f"❌ No manifest.json in {args.output_dir}")
+        return 1
+
+    formats = [name.strip() for name in args.formats.split(",") if name.strip()]
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        parser.error(f"Unknown format(s): {', '.join(sorted(unknown))}")
+    widths = tuple(int(width) for width in args.widths.split(","))
+
+    skipped_formats = set(formats) - set(available_formats())
+    if skipped_formats:
+        print(f"⚠️ Pillow cannot write {', '.join(sorted(skipped_formats))}; skipping")
+
+    try:
+        summary = encode_output_dir(args.output_dir, args.workers, formats, widths, args.force)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+
+    print(f"\n✅ Encoded {summary['encoded']} preview(s), {summary['skipped']} up to date, "
+          f"{summary['missing']} missing ({', '.join(summary['formats'])})")
+    if summary["sourceBytes"]:
+        saved = 100.0 * (1 - summary["encodedBytes"] / summary["sourceBytes"])
+        print(f"📦 {summary['sourceBytes'] / 1e6:.1f} MB PNG → {summary['encodedBytes'] / 1e6:.1f} MB "
+              f"at full width ({saved:.0f}% smaller)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1260 @@
+"""
+Offline bpy Stand-in
+A small in-process fake of the parts of Blender's Python API that the helmet
+scripts use, so their logic can be exercised and profiled with plain Python
+
+Covers bpy.data (materials, objects, meshes, images, textures, worlds), shader
+node trees (nodes, sockets, links, color ramps), ID custom properties,
+bpy.context.scene with its render/cycles settings, bpy.ops.object (light/camera
+add, select by type, delete), bpy.ops.render.render, bpy.app (timers driven by a
+virtual clock, handlers) and a minimal mathutils.
+
+Rendered and saved images are written as small stub files that record only the
+image size; bpy.data.images.load reads them back with blank pixels, so output
+paths, caches and manifests behave as with real files.
+
+Every API call is counted and timed by `recorder`, so a benchmark can separate
+time spent in the scripts from time spent in (stand-in) Blender calls. Timings
+of the stand-in itself say nothing about real Blender; call counts do.
+
+Mismatches with Blender 4.x (unknown socket names, wrong value shapes) are
+recorded as issues; with install(strict=True) they raise like Blender would.
+
+Usage:
+    import fake_bpy
+    fake_bpy.install()              # registers `bpy` and `mathutils` in sys.modules
+    import update_helmet_materials  # imports the stand-in
+
+    fake_bpy.reset()                # empty scene, cleared recorder
+    material = bpy.data.materials.new("HelmetMaterial")
+    material.use_nodes = True
+    ...
+    print(fake_bpy.recorder.report())
+"""
+
+import array
+import functools
+import math
+import re
+import sys
+import time
+import types
+from collections import Counter, defaultdict
+from pathlib import Path
+
+# ============================================================
+# CALL RECORDER
+# ============================================================
+
+class CallRecorder:
+    """
+    Counts and times stand-in API calls by name
+    `api_seconds` only counts outermost calls, so nested calls (e.g. nodes created
+    by materials.new) are not added twice.
+    """
+
+    def __init__(self, keep_trace=False):
+        self.keep_trace = keep_trace
+        self.strict = False
+        self.reset()
+
+    def reset(self):
+        self.calls = Counter()
+        self.seconds = defaultdict(float)
+        self.issues = Counter()
+        self.trace = []
+        self.api_seconds = 0.0
+        self._depth = 0
+
+    def record(self, name, seconds, args=(), kwargs=None):
+        self.calls[name] += 1
+        self.seconds[name] += seconds
+        if self._depth == 0:
+            self.api_seconds += seconds
+        if self.keep_trace:
+            self.trace.append((name, args, kwargs or {}))
+
+    def issue(self, message, error=TypeError):
+        """Record an API mismatch; raises `error` in strict mode"""
+        if self.strict:
+            raise error(message)
+        self.issues[message] += 1
+
+    def total_calls(self):
+        return sum(self.calls.values())
+
+    def report(self, top=None):
+        by_call = sorted(self.calls.items(), key=lambda item: item[1], reverse=True)
+        return {
+            "calls": self.total_calls(),
+            "apiSeconds": round(self.api_seconds, 6),
+            "byCall": {
+                name: {"calls": count, "ms": round(self.seconds[name] * 1000, 3)}
+                for name, count in by_call[:top]
+            },
+            "issues": dict(self.issues),
+        }
+
+
+recorder = CallRecorder()
+
+
+def _recorded(name):
+    """
+    Count and time calls of the decorated function under `name`
+    `name` may be a callable taking the first argument (self), e.g. for per-collection names.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            recorder._depth += 1
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                recorder._depth -= 1
+                recorder.record(name(args[0]) if callable(name) else name, elapsed, args, kwargs)
+        return wrapper
+    return decorate
+
+
+def _unique_name(name, taken):
+    """Blender-style unique name: 'Name', 'Name.001', 'Name.002', ..."""
+    if name not in taken:
+        return name
+    base = name.rsplit('.', 1)[0] if name[-4:-3] == '.' and name[-3:].isdigit() else name
+    for i in range(1, 1000):
+        candidate = f"{base}.{i:03d}"
+        if candidate not in taken:
+            return candidate
+    raise ValueError(f"No free name for {name}")
+
+
+# ============================================================
+# MATHUTILS
+# ============================================================
+
+class Vector:
+    """Subset of mathutils.Vector"""
+
+    def __init__(self, values=(0.0, 0.0, 0.0)):
+        self._values = [float(value) for value in values]
+
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __getitem__(self, index):
+        return self._values[index]
+
+    def __setitem__(self, index, value):
+        self._values[index] = float(value)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return f"Vector({tuple(self._values)})"
+
+    def __add__(self, other):
+        return Vector(a + b for a, b in zip(self, other))
+
+    def __sub__(self, other):
+        return Vector(a - b for a, b in zip(self, other))
+
+    def __mul__(self, scalar):
+        return Vector(a * scalar for a in self)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, scalar):
+        return Vector(a / scalar for a in self)
+
+    def __neg__(self):
+        return Vector(-a for a in self)
+
+    x = property(lambda self: self._values[0], lambda self, value: self.__setitem__(0, value))
+    y = property(lambda self: self._values[1], lambda self, value: self.__setitem__(1, value))
+    z = property(lambda self: self._values[2], lambda self, value: self.__setitem__(2, value))
+
+    @property
+    def length(self):
+        return math.sqrt(self.dot(self))
+
+    def dot(self, other):
+        return sum(a * b for a, b in zip(self, other))
+
+    def cross(self, other):
+        ax, ay, az = self
+        bx, by, bz = other
+        return Vector((ay * bz - az * by, az * bx - ax * bz, ax * by - ay * bx))
+
+    def normalized(self):
+        length = self.length
+        return Vector(self) if length == 0 else self / length
+
+    def copy(self):
+        return Vector(self)
+
+    def to_tuple(self):
+        return tuple(self._values)
+
+
+class Color(Vector):
+    """Subset of mathutils.Color"""
+
+    r = Vector.x
+    g = Vector.y
+    b = Vector.z
+
+
+class Matrix:
+    """Subset of mathutils.Matrix (square, row-major)"""
+
+    def __init__(self, rows=None):
+        rows = rows if rows is not None else [[float(i == j) for j in range(4)] for i in range(4)]
+        self._rows = [[float(value) for value in row] for row in rows]
+
+    @classmethod
+    def Identity(cls, size):
+        return cls([[float(i == j) for j in range(size)] for i in range(size)])
+
+    @classmethod
+    def Translation(cls, vector):
+        matrix = cls.Identity(4)
+        for i, value in enumerate(vector):
+            matrix._rows[i][3] = float(value)
+        return matrix
+
+    def __iter__(self):
+        return (Vector(row) for row in self._rows)
+
+    def __getitem__(self, index):
+        return Vector(self._rows[index])
+
+    def __matmul__(self, other):
+        if isinstance(other, Matrix):
+            columns = list(zip(*other._rows))
+            return Matrix([[sum(a * b for a, b in zip(row, column)) for column in columns] for row in self._rows])
+        values = list(other)
+        homogeneous = len(values) == len(self._rows) - 1
+        if homogeneous:
+            values.append(1.0)
+        result = [sum(a * b for a, b in zip(row, values)) for row in self._rows]
+        return Vector(result[:-1] if homogeneous else result)
+
+    def to_translation(self):
+        return Vector(row[3] for row in self._rows[:3])
+
+    def inverted(self):
+        """Inverse of a rigid transform (rotation + translation)"""
+        rotation = [list(column) for column in zip(*(row[:3] for row in self._rows[:3]))]
+        translation = [-sum(rotation[i][j] * self._rows[j][3] for j in range(3)) for i in range(3)]
+        return Matrix([rotation[i] + [translation[i]] for i in range(3)] + [[0.0, 0.0, 0.0, 1.0]])
+
+
+# ============================================================
+# ID DATABLOCKS
+# ============================================================
+
+class _FreedID:
+    """Class of removed datablocks: any access raises ReferenceError like Blender"""
+
+    def __getattr__(self, name):
+        raise ReferenceError("StructRNA of type ID has been removed")
+
+    def __setattr__(self, name, value):
+        raise ReferenceError("StructRNA of type ID has been removed")
+
+
+class ID:
+    """Named datablock with custom properties (material["key"] = value)"""
+
+    def __init__(self, name, collection=None):
+        self._collection = collection
+        self._name = name
+        self._properties = {}
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        if self._collection is not None:
+            value = self._collection._rename(self, value)
+        self._name = value
+
+    @_recorded('ID.__getitem__')
+    def __getitem__(self, key):
+        return self._properties[key]
+
+    @_recorded('ID.__setitem__')
+    def __setitem__(self, key, value):
+        self._properties[key] = value
+
+    def __delitem__(self, key):
+        del self._properties[key]
+
+    def __contains__(self, key):
+        return key in self._properties
+
+    @_recorded('ID.get')
+    def get(self, key, default=None):
+        return self._properties.get(key, default)
+
+    def keys(self):
+        return self._properties.keys()
+
+    def __repr__(self):
+        return f"bpy.data.{type(self).__name__.lower()}s['{self._name}']"
+
+
+class IDCollection:
+    """bpy.data.<collection>: datablocks by unique name"""
+
+    def __init__(self, label, factory):
+        self.label = label
+        self._factory = factory
+        self._items = {}
+
+    @_recorded(lambda self: f'{self.label}.new')
+    def new(self, name, *args, **kwargs):
+        name = _unique_name(name, self._items)
+        item = self._factory(name, self, *args, **kwargs)
+        self._items[name] = item
+        return item
+
+    def _rename(self, item, name):
+        del self._items[item._name]
+        name = _unique_name(name, self._items)
+        self._items[name] = item
+        return name
+
+    @_recorded(lambda self: f'{self.label}.get')
+    def get(self, name, default=None):
+        return self._items.get(name, default)
+
+    @_recorded(lambda self: f'{self.label}.remove')
+    def remove(self, item, do_unlink=True):
+        if self._items.get(item.name) is not item:
+            raise ReferenceError(f"{item!r} is not in bpy.data.{self.label}")
+        del self._items[item.name]
+        item.__dict__.clear()
+        item.__class__ = _FreedID
+
+    @_recorded(lambda self: f'{self.label}.__getitem__')
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return list(self._items.values())[key]
+        try:
+            return self._items[key]
+        except KeyError:
+            raise KeyError(f'bpy_prop_collection[key]: key "{key}" not found') from None
+
+    def __iter__(self):
+        recorder.record(f'{self.label}.__iter__', 0.0)
+        return iter(list(self._items.values()))
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items if isinstance(key, str) else key in self._items.values()
+
+    def keys(self):
+        return list(self._items)
+
+    def values(self):
+        return list(self._items.values())
+
+    def items(self):
+        return list(self._items.items())
+
+
+# ============================================================
+# SHADER NODES
+# ============================================================
+
+PRINCIPLED_INPUTS = {
+    'Base Color': (0.8, 0.8, 0.8, 1.0),
+    'Metallic': 0.0,
+    'Roughness': 0.5,
+    'IOR': 1.5,
+    'Alpha': 1.0,
+    'Normal': (0.0, 0.0, 0.0),
+    'Weight': 0.0,
+    'Subsurface Weight': 0.0,
+    'Subsurface Radius': (1.0, 0.2, 0.1),
+    'Subsurface Scale': 0.05,
+    'Subsurface Anisotropy': 0.0,
+    'Specular IOR Level': 0.5,
+    'Specular Tint': (1.0, 1.0, 1.0, 1.0),
+    'Anisotropic': 0.0,
+    'Anisotropic Rotation': 0.0,
+    'Tangent': (0.0, 0.0, 0.0),
+    'Transmission Weight': 0.0,
+    'Coat Weight': 0.0,
+    'Coat Roughness': 0.03,
+    'Coat IOR': 1.5,
+    'Coat Tint': (1.0, 1.0, 1.0, 1.0),
+    'Coat Normal': (0.0, 0.0, 0.0),
+    'Sheen Weight': 0.0,
+    'Sheen Roughness': 0.5,
+    'Sheen Tint': (1.0, 1.0, 1.0, 1.0),
+    'Emission Color': (1.0, 1.0, 1.0, 1.0),
+    'Emission Strength': 0.0,
+    'Thin Film Thickness': 0.0,
+    'Thin Film IOR': 1.33,
+}
+
+# bl_idname: (node.type, default name, inputs {name: default}, outputs, extra attributes)
+# Input defaults: float, 3-tuple (vector) or 4-tuple (color); None for shader sockets
+NODE_TYPES = {
+    'ShaderNodeBsdfPrincipled': ('BSDF_PRINCIPLED', 'Principled BSDF', PRINCIPLED_INPUTS, ('BSDF',),
+                                 {'distribution': 'MULTI_GGX', 'subsurface_method': 'RANDOM_WALK'}),
+    'ShaderNodeOutputMaterial': ('OUTPUT_MATERIAL', 'Material Output',
+                                 {'Surface': None, 'Volume': None, 'Displacement': (0.0, 0.0, 0.0)}, (),
+                                 {'target': 'ALL', 'is_active_output': True}),
+    'ShaderNodeVertexColor': ('VERTEX_COLOR', 'Color Attribute', {}, ('Color', 'Alpha'), {'layer_name': ''}),
+    'ShaderNodeSeparateColor': ('SEPARATE_COLOR', 'Separate Color', {'Color': (0.8, 0.8, 0.8, 1.0)},
+                                ('Red', 'Green', 'Blue'), {'mode': 'RGB'}),
+    'ShaderNodeMath': ('MATH', 'Math', {'Value': 0.5, 'Value_001': 0.5, 'Value_002': 0.5}, ('Value',),
+                       {'operation': 'ADD', 'use_clamp': False}),
+    'ShaderNodeValToRGB': ('VALTORGB', 'Color Ramp', {'Fac': 0.5}, ('Color', 'Alpha'), {}),
+    'ShaderNodeBackground': ('BACKGROUND', 'Background', {'Color': (0.8, 0.8, 0.8, 1.0), 'Strength': 1.0},
+                             ('Background',), {}),
+    'ShaderNodeOutputWorld': ('OUTPUT_WORLD', 'World Output', {'Surface': None, 'Volume': None}, (),
+                              {'target': 'ALL', 'is_active_output': True}),
+    'ShaderNodeTexCoord': ('TEX_COORD', 'Texture Coordinate', {},
+                           ('Generated', 'Normal', 'UV', 'Object', 'Camera', 'Window', 'Reflection'),
+                           {'object': None, 'from_instancer': False}),
+    'ShaderNodeMapping': ('MAPPING', 'Mapping', {'Vector': (0.0, 0.0, 0.0), 'Location': (0.0, 0.0, 0.0),
+                                                 'Rotation': (0.0, 0.0, 0.0), 'Scale': (1.0, 1.0, 1.0)},
+                          ('Vector',), {'vector_type': 'POINT'}),
+    'ShaderNodeTexVoronoi': ('TEX_VORONOI', 'Voronoi Texture', {'Vector': (0.0, 0.0, 0.0), 'Scale': 5.0,
+                                                                'Detail': 0.0, 'Roughness': 0.5,
+                                                                'Lacunarity': 2.0, 'Randomness': 1.0},
+                             ('Distance', 'Color', 'Position'),
+                             {'feature': 'F1', 'voronoi_dimensions': '3D', 'distance': 'EUCLIDEAN'}),
+    'ShaderNodeBump': ('BUMP', 'Bump', {'Strength': 1.0, 'Distance': 1.0, 'Height': 1.0,
+                                        'Normal': (0.0, 0.0, 0.0)}, ('Normal',), {'invert': False}),
+    'ShaderNodeLayerWeight': ('LAYER_WEIGHT', 'Layer Weight', {'Blend': 0.5, 'Normal': (0.0, 0.0, 0.0)},
+                              ('Fresnel', 'Facing'), {}),
+}
+
+
+class NodeSocket:
+    """Node input or output; inputs carry a default_value"""
+
+    def __init__(self, node, name, default=None, is_output=False, identifier=None):
+        self.node = node
+        self.name = name
+        self.identifier = identifier or name
+        self.is_output = is_output
+        self.links = []
+        self._value = list(default) if isinstance(default, tuple) else default
+
+    @property
+    def is_linked(self):
+        return bool(self.links)
+
+    @property
+    @_recorded('NodeSocket.default_value.get')
+    def default_value(self):
+        if self._value is None:
+            raise AttributeError(f"'{self.name}' socket has no default_value")
+        return self._value
+
+    @default_value.setter
+    @_recorded('NodeSocket.default_value.set')
+    def default_value(self, value):
+        if self._value is None:
+            raise AttributeError(f"'{self.name}' socket has no default_value")
+
+        if isinstance(self._value, list):
+            if not hasattr(value, '__len__') or len(value) != len(self._value):
+                recorder.issue(f"{self.node.bl_idname}.inputs['{self.name}']: expected a sequence of "
+                               f"{len(self._value)} floats")
+                return
+            self._value = [float(component) for component in value]
+        else:
+            if hasattr(value, '__len__'):
+                recorder.issue(f"{self.node.bl_idname}.inputs['{self.name}']: expected a float")
+                return
+            self._value = float(value)
+
+    def __repr__(self):
+        return f"<NodeSocket {self.node.name}.{'outputs' if self.is_output else 'inputs'}['{self.name}']>"
+
+
+class NodeSockets:
+    """node.inputs / node.outputs: sockets by index or name (first match)"""
+
+    def __init__(self, node, sockets):
+        self._node = node
+        self._sockets = sockets
+
+    @_recorded('NodeSockets.__getitem__')
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return self._sockets[key]
+        for socket in self._sockets:
+            if socket.name == key:
+                return socket
+
+        # Unknown names (e.g. pre-4.0 Principled inputs) raise KeyError in Blender
+        recorder.issue(f"{self._node.bl_idname}: no socket '{key}'", KeyError)
+        socket = NodeSocket(self._node, key, 0.0, self._sockets[0].is_output if self._sockets else False)
+        self._sockets.append(socket)
+        return socket
+
+    def get(self, key, default=None):
+        return next((socket for socket in self._sockets if socket.name == key), default)
+
+    def __iter__(self):
+        return iter(self._sockets)
+
+    def __len__(self):
+        return len(self._sockets)
+
+
+class ColorRampElement:
+    def __init__(self, position, color):
+        self.position = position
+        self.color = color
+
+    @property
+    def color(self):
+        return self._color
+
+    @color.setter
+    def color(self, value):
+        self._color = [float(component) for component in value]
+
+    @property
+    def alpha(self):
+        return self._color[3]
+
+    @alpha.setter
+    def alpha(self, value):
+        self._color[3] = float(value)
+
+
+class ColorRampElements:
+    def __init__(self):
+        self._elements = [
+            ColorRampElement(0.0, (0.0, 0.0, 0.0, 1.0)),
+            ColorRampElement(1.0, (1.0, 1.0, 1.0, 1.0)),
+        ]
+
+    @_recorded('ColorRampElements.new')
+    def new(self, position):
+        element = ColorRampElement(position, (0.0, 0.0, 0.0, 1.0))
+        self._elements.append(element)
+        self._elements.sort(key=lambda e: e.position)
+        return element
+
+    @_recorded('ColorRampElements.remove')
+    def remove(self, element):
+        if len(self._elements) == 1:
+            raise RuntimeError("Unable to remove the last element")
+        self._elements.remove(element)
+
+    def __getitem__(self, index):
+        return self._elements[index]
+
+    def __iter__(self):
+        return iter(self._elements)
+
+    def __len__(self):
+        return len(self._elements)
+
+
+class ColorRamp:
+    def __init__(self):
+        self.elements = ColorRampElements()
+        self.interpolation = 'LINEAR'
+        self.color_mode = 'RGB'
+
+
+class Node:
+    """Shader node built from its NODE_TYPES entry"""
+
+    def __init__(self, tree, bl_idname, name):
+        node_type, _, inputs, outputs, attributes = NODE_TYPES[bl_idname]
+        self._tree = tree
+        self._name = name
+        self.bl_idname = bl_idname
+        self.type = node_type
+        self.label = ''
+        self.location = (0.0, 0.0)
+        self.mute = False
+        self.inputs = NodeSockets(self, [
+            NodeSocket(self, name.split('_0')[0], default, identifier=name) for name, default in inputs.items()
+        ])
+        self.outputs = NodeSockets(self, [NodeSocket(self, name, None, is_output=True) for name in outputs])
+        for attribute, value in attributes.items():
+            setattr(self, attribute, value)
+        if bl_idname == 'ShaderNodeValToRGB':
+            self.color_ramp = ColorRamp()
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        self._name = self._tree.nodes._rename(self, value)
+
+    def __repr__(self):
+        return f"<Node {self.bl_idname} '{self._name}'>"
+
+
+class NodeLink:
+    def __init__(self, from_socket, to_socket):
+        self.from_socket = from_socket
+        self.to_socket = to_socket
+        self.from_node = from_socket.node
+        self.to_node = to_socket.node
+        self.is_valid = True
+
+
+class Nodes:
+    """node_tree.nodes"""
+
+    def __init__(self, tree):
+        self._tree = tree
+        self._nodes = []
+        self._by_name = {}
+
+    def _rename(self, node, name):
+        self._by_name.pop(node._name, None)
+        name = _unique_name(name, self._by_name)
+        self._by_name[name] = node
+        return name
+
+    @_recorded('nodes.new')
+    def new(self, type):
+        if type not in NODE_TYPES:
+            raise RuntimeError(f"Node type {type} undefined")
+        node = Node(self._tree, type, _unique_name(NODE_TYPES[type][1], self._by_name))
+        self._nodes.append(node)
+        self._by_name[node._name] = node
+        return node
+
+    @_recorded('nodes.get')
+    def get(self, name, default=None):
+        return self._by_name.get(name, default)
+
+    @_recorded('nodes.__getitem__')
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return self._nodes[key]
+        try:
+            return self._by_name[key]
+        except KeyError:
+            raise KeyError(f'bpy_prop_collection[key]: key "{key}" not found') from None
+
+    @_recorded('nodes.remove')
+    def remove(self, node):
+        for link in list(self._tree.links):
+            if link.from_node is node or link.to_node is node:
+                self._tree.links._unlink(link)
+        self._nodes.remove(node)
+        del self._by_name[node._name]
+
+    @_recorded('nodes.clear')
+    def clear(self):
+        self._tree.links.clear()
+        self._nodes.clear()
+        self._by_name.clear()
+
+    def __iter__(self):
+        recorder.record('nodes.__iter__', 0.0)
+        return iter(list(self._nodes))
+
+    def __len__(self):
+        return len(self._nodes)
+
+
+class Links:
+    """node_tree.links; a new link into an input replaces the existing one"""
+
+    def __init__(self):
+        self._links = []
+
+    @_recorded('links.new')
+    def new(self, from_socket, to_socket):
+        if not from_socket.is_output or to_socket.is_output:
+            recorder.issue(f"links.new: {from_socket!r} -> {to_socket!r} is not output -> input", RuntimeError)
+        for link in list(to_socket.links):
+            self._unlink(link)
+
+        link = NodeLink(from_socket, to_socket)
+        self._links.append(link)
+        from_socket.links.append(link)
+        to_socket.links.append(link)
+        return link
+
+    def _unlink(self, link):
+        self._links.remove(link)
+        link.from_socket.links.remove(link)
+        link.to_socket.links.remove(link)
+        link.is_valid = False
+
+    @_recorded('links.remove')
+    def remove(self, link):
+        self._unlink(link)
+
+    def clear(self):
+        for link in list(self._links):
+            self._unlink(link)
+
+    def __iter__(self):
+        return iter(list(self._links))
+
+    def __len__(self):
+        return len(self._links)
+
+
+class NodeTree:
+    def __init__(self, name, tree_type='SHADER'):
+        self.name = name
+        self.type = tree_type
+        self.nodes = Nodes(self)
+        self.links = Links()
+
+
+# ============================================================
+# DATABLOCK TYPES
+# ============================================================
+
+class Material(ID):
+    def __init__(self, name, collection=None):
+        super().__init__(name, collection)
+        self.node_tree = None
+        self.diffuse_color = [0.8, 0.8, 0.8, 1.0]
+        self.pass_index = 0
+        self._use_nodes = False
+
+    @property
+    def use_nodes(self):
+        return self._use_nodes
+
+    @use_nodes.setter
+    def use_nodes(self, value):
+        # Like Blender, the first enable creates Principled BSDF -> Material Output
+        self._use_nodes = bool(value)
+        if self._use_nodes and self.node_tree is None:
+            self.node_tree = NodeTree("Shader Nodetree")
+            bsdf = self.node_tree.nodes.new('ShaderNodeBsdfPrincipled')
+            output = self.node_tree.nodes.new('ShaderNodeOutputMaterial')
+            bsdf.location, output.location = (10.0, 300.0), (300.0, 300.0)
+            self.node_tree.links.new(bsdf.outputs['BSDF'], output.inputs['Surface'])
+
+
+class World(ID):
+    def __init__(self, name, collection=None):
+        super().__init__(name, collection)
+        self.use_nodes = True
+        self.node_tree = NodeTree("Shader Nodetree")
+        background = self.node_tree.nodes.new('ShaderNodeBackground')
+        output = self.node_tree.nodes.new('ShaderNodeOutputWorld')
+        self.node_tree.links.new(background.outputs['Background'], output.inputs['Surface'])
+
+
+class _MeshElements:
+    """mesh.vertices / mesh.loops with foreach_get of a flat attribute array"""
+
+    def __init__(self, attribute, values, width):
+        self._attribute = attribute
+        self._values = values
+        self._width = width
+
+    def __len__(self):
+        return len(self._values) // self._width
+
+    def foreach_get(self, attribute, sequence):
+        if attribute != self._attribute:
+            raise AttributeError(f"foreach_get: no attribute '{attribute}'")
+        sequence[:] = type(sequence)(sequence.typecode, self._values) if hasattr(sequence, 'typecode') \
+            else self._values
+
+
+class MeshMaterials(list):
+    """mesh.materials"""
+
+    @_recorded('mesh.materials.clear')
+    def clear(self):
+        super().clear()
+
+    @_recorded('mesh.materials.append')
+    def append(self, material):
+        super().append(material)
+
+
+class Mesh(ID):
+    def __init__(self, name, collection=None, coords=(), loops=None):
+        super().__init__(name, collection)
+        self.materials = MeshMaterials()
+        self.set_geometry(coords, loops)
+
+    def set_geometry(self, coords, loops=None):
+        """Flat vertex coordinates [x, y, z, ...] and loop vertex indices (default: one per vertex)"""
+        coords = [float(value) for value in coords]
+        self.vertices = _MeshElements("co", coords, 3)
+        self.loops = _MeshElements("vertex_index", list(loops if loops is not None else range(len(coords) // 3)), 1)
+
+    def bounds(self):
+        coords = self.vertices._values
+        if not coords:
+            return (0.0, 0.0, 0.0), (0.0, 0.0, 0.0)
+        axes = [coords[axis::3] for axis in range(3)]
+        return tuple(min(axis) for axis in axes), tuple(max(axis) for axis in axes)
+
+
+class Camera(ID):
+    def __init__(self, name, collection=None):
+        super().__init__(name, collection)
+        self.lens = 50.0
+        self.sensor_width = 36.0
+        self.sensor_fit = 'AUTO'
+        self.clip_start = 0.1
+        self.clip_end = 1000.0
+
+
+class Light(ID):
+    def __init__(self, name, collection=None, type='POINT'):
+        super().__init__(name, collection)
+        self.type = type
+        self.energy = 1000.0 if type == 'AREA' else 10.0
+        self.size = 0.25
+        self.color = [1.0, 1.0, 1.0]
+
+
+class Texture(ID):
+    def __init__(self, name, collection=None, type='NONE'):
+        super().__init__(name, collection)
+        self.type = type
+
+
+IMAGE_STUB_HEADER = "FAKE_BPY_IMAGE"
+
+
+def _write_image_stub(path, width, height):
+    with open(path, 'w') as f:
+        f.write(f"{IMAGE_STUB_HEADER} {width} {height}\n")
+
+
+class ImagePixels(list):
+    """image.pixels"""
+
+    @_recorded('Image.pixels.foreach_get')
+    def foreach_get(self, sequence):
+        if len(sequence) != len(self):
+            raise RuntimeError(f"foreach_get: expected {len(self)} values, got a sequence of {len(sequence)}")
+        sequence[:] = array.array(sequence.typecode, self) if hasattr(sequence, 'typecode') else self
+
+    @_recorded('Image.pixels.foreach_set')
+    def foreach_set(self, sequence):
+        if len(sequence) != len(self):
+            raise RuntimeError(f"foreach_set: expected {len(self)} values, got a sequence of {len(sequence)}")
+        self[:] = sequence
+
+
+class Image(ID):
+    def __init__(self, name, collection=None, width=0, height=0, alpha=True):
+        super().__init__(name, collection)
+        self.size = (width, height)
+        self.channels = 4
+        self.alpha_mode = 'STRAIGHT' if alpha else 'NONE'
+        self.filepath_raw = ''
+        self.file_format = 'PNG'
+        self._pixels = None
+
+    @property
+    def pixels(self):
+        # Allocated on first use: most images (e.g. Render Result) are never read
+        if self._pixels is None:
+            self._pixels = ImagePixels([0.0] * (self.size[0] * self.size[1] * self.channels))
+        return self._pixels
+
+    @pixels.setter
+    def pixels(self, values):
+        self._pixels = ImagePixels(values)
+
+    @_recorded('Image.save_render')
+    def save_render(self, filepath, scene=None):
+        _write_image_stub(filepath, *self.size)
+
+    @_recorded('Image.save')
+    def save(self):
+        _write_image_stub(self.filepath_raw, *self.size)
+
+
+class ImageCollection(IDCollection):
+    """bpy.data.images, which can also load the stub files written above"""
+
+    @_recorded('images.load')
+    def load(self, filepath, check_existing=False):
+        path = Path(filepath)
+        if check_existing:
+            for image in self._items.values():
+                if image.filepath_raw == str(path):
+                    return image
+        try:
+            header, width, height = path.read_text().split()
+        except (OSError, UnicodeDecodeError, ValueError):
+            raise RuntimeError(f"Error: Cannot read file \"{path}\"") from None
+        if header != IMAGE_STUB_HEADER:
+            raise RuntimeError(f"Error: Cannot read file \"{path}\"")
+
+        name = _unique_name(path.name, self._items)
+        image = Image(name, self, int(width), int(height))
+        image.filepath_raw = str(path)
+        self._items[name] = image
+        return image
+
+
+_DATA_TYPES = {
+    'ID': ID, 'Material': Material, 'World': World, 'Mesh': Mesh, 'Camera': Camera,
+    'Light': Light, 'Texture': Texture, 'Image': Image,
+}
+
+
+class Object(ID):
+    def __init__(self, name, collection=None, data=None):
+        super().__init__(name, collection)
+        self.data = data
+        self.type = {Mesh: 'MESH', Camera: 'CAMERA', Light: 'LIGHT'}.get(type(data), 'EMPTY')
+        self.location = Vector((0.0, 0.0, 0.0))
+        self.rotation_euler = Vector((0.0, 0.0, 0.0))
+        self.scale = Vector((1.0, 1.0, 1.0))
+        self.matrix_world = Matrix.Identity(4)
+        self.matrix_parent_inverse = Matrix.Identity(4)
+        self.parent = None
+        self.hide_render = False
+        self.animation_data = None
+        self._selected = False
+
+    @property
+    def bound_box(self):
+        if self.type != 'MESH':
+            return [(0.0, 0.0, 0.0)] * 8
+        low, high = self.data.bounds()
+        return [
+            (x, y, z)
+            for x in (low[0], high[0]) for y in (low[1], high[1]) for z in (low[2], high[2])
+        ]
+
+    def select_get(self):
+        return self._selected
+
+    def select_set(self, state):
+        self._selected = bool(state)
+
+    @_recorded('Object.keyframe_insert')
+    def keyframe_insert(self, data_path, index=-1, frame=None):
+        return True
+
+    def animation_data_clear(self):
+        self.animation_data = None
+
+
+class BlendData:
+    """bpy.data"""
+
+    def __init__(self):
+        self.materials = IDCollection('materials', Material)
+        self.objects = IDCollection('objects', Object)
+        self.meshes = IDCollection('meshes', Mesh)
+        self.cameras = IDCollection('cameras', Camera)
+        self.lights = IDCollection('lights', Light)
+        self.textures = IDCollection('textures', Texture)
+        self.images = ImageCollection('images', Image)
+        self.worlds = IDCollection('worlds', World)
+
+
+# ============================================================
+# SCENE AND CONTEXT
+# ============================================================
+
+class _ObjectLinks:
+    """scene.collection.objects"""
+
+    def __init__(self):
+        self._objects = []
+
+    def link(self, obj):
+        self._objects.append(obj)
+
+    def unlink(self, obj):
+        self._objects.remove(obj)
+
+    def __iter__(self):
+        return iter(list(self._objects))
+
+    def __len__(self):
+        return len(self._objects)
+
+
+class Scene(ID):
+    def __init__(self, name, world):
+        super().__init__(name)
+        self.render = types.SimpleNamespace(
+            engine='BLENDER_EEVEE_NEXT', resolution_x=1920, resolution_y=1080, resolution_percentage=100,
+            pixel_aspect_x=1.0, pixel_aspect_y=1.0, filepath='//', file_extension='.png',
+            film_transparent=False, use_compositing=True, use_persistent_data=False,
+            threads_mode='AUTO', threads=1, fps=24,
+            image_settings=types.SimpleNamespace(file_format='PNG', color_mode='RGBA', color_depth='8',
+                                                 compression=15),
+        )
+        self.cycles = types.SimpleNamespace(
+            device='CPU', samples=4096, preview_samples=1024, seed=0, use_denoising=True,
+            use_adaptive_sampling=True, adaptive_threshold=0.01, use_auto_tile=True, tile_size=2048,
+        )
+        self.view_settings = types.SimpleNamespace(view_transform='AgX', look='None', exposure=0.0, gamma=1.0)
+        self.world = world
+        self.camera = None
+        self.collection = types.SimpleNamespace(objects=_ObjectLinks())
+        self.frame_start = 1
+        self.frame_end = 250
+        self.frame_current = 1
+
+    def frame_set(self, frame, subframe=0.0):
+        self.frame_current = frame
+
+
+class Context:
+    """bpy.context"""
+
+    def __init__(self, scene):
+        self.scene = scene
+        self.object = None
+        # No add-ons: detect_gpu_backend() sees no Cycles preferences and falls back to CPU
+        self.preferences = types.SimpleNamespace(addons={})
+
+    @property
+    def selected_objects(self):
+        return [obj for obj in bpy.data.objects if obj.select_get()]
+
+
+# ============================================================
+# OPERATORS
+# ============================================================
+
+class _ObjectOps:
+    """bpy.ops.object"""
+
+    @staticmethod
+    @_recorded('ops.object.select_all')
+    def select_all(action='TOGGLE'):
+        objects = list(bpy.data.objects)
+        state = action == 'SELECT' or (action == 'TOGGLE' and not any(obj.select_get() for obj in objects))
+        for obj in objects:
+            obj.select_set(state)
+        return {'FINISHED'}
+
+    @staticmethod
+    @_recorded('ops.object.select_by_type')
+    def select_by_type(extend=False, type='MESH'):
+        for obj in bpy.data.objects:
+            if obj.type == type:
+                obj.select_set(True)
+            elif not extend:
+                obj.select_set(False)
+        return {'FINISHED'}
+
+    @staticmethod
+    @_recorded('ops.object.delete')
+    def delete(use_global=False, confirm=True):
+        for obj in bpy.context.selected_objects:
+            bpy.data.objects.remove(obj)
+        return {'FINISHED'}
+
+    @staticmethod
+    def _add(name, data, location):
+        obj = bpy.data.objects.new(name, data)
+        obj.location = Vector(location)
+        bpy.context.scene.collection.objects.link(obj)
+        for other in bpy.data.objects:
+            other.select_set(other is obj)
+        bpy.context.object = obj
+        return {'FINISHED'}
+
+    @staticmethod
+    @_recorded('ops.object.light_add')
+    def light_add(type='POINT', location=(0.0, 0.0, 0.0), **_):
+        name = type.capitalize()
+        return _ObjectOps._add(name, bpy.data.lights.new(name, type=type), location)
+
+    @staticmethod
+    @_recorded('ops.object.camera_add')
+    def camera_add(location=(0.0, 0.0, 0.0), **_):
+        return _ObjectOps._add("Camera", bpy.data.cameras.new("Camera"), location)
+
+
+class _RenderOps:
+    """bpy.ops.render; renders take `render_seconds` of wall time and write stub image files"""
+
+    render_seconds = 0.0
+
+    @staticmethod
+    @_recorded('ops.render.render')
+    def render(animation=False, write_still=False, **_):
+        scene = bpy.context.scene
+        frames = scene.frame_end - scene.frame_start + 1 if animation else 1
+        samples = scene.cycles.samples
+        for frame in range(frames):
+            for handler in bpy.app.handlers.render_stats:
+                handler(f"Fra:{scene.frame_start + frame} | Sample 1/{samples}")
+            if _RenderOps.render_seconds:
+                time.sleep(_RenderOps.render_seconds)
+            if animation or write_still:
+                _RenderOps._write_output(scene, scene.frame_start + frame if animation else None)
+        if "Render Result" not in bpy.data.images:
+            bpy.data.images.new("Render Result", scene.render.resolution_x, scene.render.resolution_y)
+        return {'FINISHED'}
+
+    @staticmethod
+    def _write_output(scene, frame):
+        render = scene.render
+        path = render.filepath
+        if frame is not None:
+            if '#' in path:
+                path = re.sub(r'#+', lambda run: f"{frame:0{len(run.group())}d}", path)
+            else:
+                path = f"{path}{frame:04d}"
+        if not Path(path).suffix:
+            path += render.file_extension
+        scale = render.resolution_percentage / 100.0
+        _write_image_stub(path, int(render.resolution_x * scale), int(render.resolution_y * scale))
+
+
+# ============================================================
+# APP
+# ============================================================
+
+class Timers:
+    """
+    bpy.app.timers on a virtual clock
+    Nothing runs on its own: advance(seconds) moves the clock and calls each due
+    timer once, rescheduling it by its returned interval (None unregisters it).
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self._due = {}
+
+    @_recorded('app.timers.register')
+    def register(self, function, first_interval=0.0, persistent=False):
+        self._due[function] = self.now + first_interval
+
+    @_recorded('app.timers.unregister')
+    def unregister(self, function):
+        if function not in self._due:
+            raise ValueError("Error: function is not registered")
+        del self._due[function]
+
+    def is_registered(self, function):
+        return function in self._due
+
+    def advance(self, seconds=0.0):
+        """Move the clock forward and run due timers; returns how many ran"""
+        self.now += seconds
+        due = sorted((when, i, function) for i, (function, when) in enumerate(self._due.items()) if when <= self.now)
+        for _, _, function in due:
+            if function not in self._due:
+                continue  # Unregistered by an earlier timer
+            interval = function()
+            if function not in self._due:
+                continue
+            if interval is None:
+                del self._due[function]
+            else:
+                self._due[function] = self.now + interval
+        return len(due)
+
+
+def _app_module():
+    app = types.SimpleNamespace(
+        background=True,
+        version=(4, 5, 0),
+        version_string="4.5.0 (offline stand-in)",
+        timers=Timers(),
+        handlers=types.SimpleNamespace(
+            render_stats=[], render_pre=[], render_post=[], render_complete=[],
+            depsgraph_update_post=[], load_post=[],
+        ),
+    )
+    return app
+
+
+# ============================================================
+# INSTALLATION
+# ============================================================
+
+bpy = None  # The installed stand-in module
+
+
+def reset(render_seconds=0.0):
+    """Start from an empty scene (world, no objects) and clear the recorder"""
+    data = BlendData()
+    world = data.worlds.new("World")
+    bpy.data = data
+    bpy.context = Context(Scene("Scene", world))
+    bpy.app = _app_module()
+    _RenderOps.render_seconds = render_seconds
+    recorder.reset()
+    return bpy
+
+
+def install(strict=None, keep_trace=None):
+    """
+    Register the stand-in as `bpy` (with bpy.types) and `mathutils` in sys.modules
+    Refuses to replace a real bpy. strict/keep_trace set the recorder options when
+    given (repeated installs keep them). Returns the bpy module.
+    """
+    global bpy
+
+    existing = sys.modules.get('bpy')
+    if existing is not None and existing is not bpy:
+        raise RuntimeError("A real bpy module is already imported")
+
+    if strict is not None:
+        recorder.strict = strict
+    if keep_trace is not None:
+        recorder.keep_trace = keep_trace
+
+    if bpy is None:
+        bpy_types = types.ModuleType('bpy.types')
+        for name, cls in {**_DATA_TYPES, 'Object': Object, 'Scene': Scene, 'Node': Node,
+                          'NodeSocket': NodeSocket, 'NodeTree': NodeTree, 'NodeLink': NodeLink}.items():
+            setattr(bpy_types, name, cls)
+
+        bpy = types.ModuleType('bpy')
+        bpy.__doc__ = "Offline bpy stand-in (see scripts/fake_bpy.py)"
+        bpy.types = bpy_types
+        bpy.ops = types.SimpleNamespace(object=_ObjectOps(), render=_RenderOps())
+
+        mathutils = types.ModuleType('mathutils')
+        mathutils.Vector, mathutils.Color, mathutils.Matrix = Vector, Color, Matrix
+
+        sys.modules['bpy'] = bpy
+        sys.modules['bpy.types'] = bpy_types
+        sys.modules['mathutils'] = mathutils
+        reset()
+
+    return bpy
+
+
+def add_mesh_object(name, coords=(-0.5, -0.5, -0.5, 0.5, 0.5, 0.5), loops=None):
+    """Create a linked mesh object (default: two vertices spanning a unit box)"""
+    mesh = bpy.data.meshes.new(name, coords=coords, loops=loops)
+    obj = bpy.data.objects.new(name, mesh)
+    bpy.context.scene.collection.objects.link(obj)
+    return obj
@@ -0,0 +1,292 @@
+"""
+Finish Presets
+Single source of the material finishes used by the Blender scripts
+
+finish_presets.json holds three catalogs:
+    webhook  finishes the webhook accepts (export of FINISH_PRESETS in lib/constants.ts);
+             used by blender/update_helmet_materials.py
+    preview  basic preview finishes (render_material_previews.py)
+    premium  premium preview finishes (render_premium_material_previews.py, setup_and_render.py)
+
+The file is read and validated once per process. Every finish carries a compiled
+FinishPlan, the Principled BSDF writes for that finish, so applying a finish is one
+pass over precomputed (socket, value) pairs. Hex colors convert to linear RGBA
+through a bounded cache.
+
+No bpy import: usable from plain Python (load tests, benchmarks) and inside Blender.
+
+Usage:
+    # Summary of all catalogs (validates the file)
+    python3 scripts/finish_presets.py
+
+    # Re-export the webhook catalog after editing lib/constants.ts, or check it is in sync
+    python3 scripts/finish_presets.py --export
+    python3 scripts/finish_presets.py --check
+"""
+
+import argparse
+import functools
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+SCRIPT_DIR = Path(__file__).parent
+PRESETS_PATH = SCRIPT_DIR / "finish_presets.json"
+WEB_CONSTANTS_PATH = SCRIPT_DIR.parent / "lib" / "constants.ts"
+PRESETS_VERSION = 1
+
+CATALOGS = ("webhook", "preview", "premium")
+
+# Preset field → Principled BSDF input (Blender 4.x names)
+FINISH_SOCKETS = {
+    "metalness": "Metallic",
+    "roughness": "Roughness",
+    "clearcoat": "Coat Weight",
+    "clearcoat_roughness": "Coat Roughness",
+    "sheen": "Sheen Weight",
+    "specular": "Specular IOR Level",
+    "anisotropic": "Anisotropic",
+    "anisotropic_rotation": "Anisotropic Rotation",
+    "transmission": "Transmission Weight",
+}
+FINISH_FLAGS = ("has_texture", "has_iridescence")
+FINISH_TEXT = ("name", "description")
+REQUIRED_FIELDS = ("name", "metalness", "roughness")
+
+# Preview materials are built from scratch, so their plans also reset these inputs.
+# Webhook finishes only set what they define (metallic and roughness).
+RENDER_DEFAULTS = {
+    "metalness": 0.0,
+    "roughness": 0.5,
+    "clearcoat": 0.0,
+    "clearcoat_roughness": 0.03,
+    "sheen": 0.0,
+    "specular": 0.5,
+}
+CATALOG_DEFAULTS = {"webhook": {}, "preview": RENDER_DEFAULTS, "premium": RENDER_DEFAULTS}
+
+HEX_CACHE_SIZE = 1024  # Distinct colors kept converted
+
+# ============================================================
+# COLORS
+# ============================================================
+
+def _srgb_to_linear(channel: float) -> float:
+    if channel <= 0.04045:
+        return channel / 12.92
+    return ((channel + 0.055) / 1.055) ** 2.4
+
+
+@functools.lru_cache(maxsize=HEX_CACHE_SIZE)
+def hex_to_rgb(hex_color: str) -> Tuple[float, float, float]:
+    """Convert hex color to an sRGB float tuple (0.0-1.0)"""
+    hex_color = hex_color.lstrip('#')
+    return tuple(int(hex_color[i:i + 2], 16) / 255.0 for i in (0, 2, 4))
+
+
+def srgb_to_linear_rgba(rgb) -> Tuple[float, float, float, float]:
+    """Convert an sRGB float triple to the scene-linear RGBA tuple Blender color sockets expect"""
+    return (*(_srgb_to_linear(channel) for channel in rgb), 1.0)
+
+
+@functools.lru_cache(maxsize=HEX_CACHE_SIZE)
+def hex_to_linear_rgba(hex_color: str) -> Tuple[float, float, float, float]:
+    """Convert hex color to a scene-linear RGBA tuple"""
+    return srgb_to_linear_rgba(hex_to_rgb(hex_color))
+
+
+# ============================================================
+# PLANS
+# ============================================================
+
+class FinishPlan:
+    """Precomputed Principled BSDF writes for one finish"""
+
+    __slots__ = ("finish", "writes", "targets", "has_texture", "has_iridescence")
+
+    def __init__(self, finish: str, preset: Dict, defaults: Optional[Dict] = None):
+        values = dict(defaults or {})
+        values.update((field, preset[field]) for field in FINISH_SOCKETS if field in preset)
+
+        self.finish = finish
+        self.writes = tuple((FINISH_SOCKETS[field], float(value)) for field, value in values.items())
+        self.targets = dict(self.writes)
+        self.has_texture = bool(preset.get("has_texture"))
+        self.has_iridescence = bool(preset.get("has_iridescence"))
+
+    def apply(self, inputs):
+        """Write every socket of the finish to a Principled BSDF's inputs"""
+        for name, value in self.writes:
+            inputs[name].default_value = value
+
+    def __repr__(self):
+        return f"FinishPlan({self.finish!r}, {len(self.writes)} socket(s))"
+
+
+class FinishPreset(dict):
+    """
+    Preset fields as loaded from finish_presets.json, plus its compiled `plan`
+    Still a plain dict for callers that hash or serialize presets.
+    """
+
+    def __init__(self, finish: str, fields: Dict, defaults: Optional[Dict] = None):
+        super().__init__(fields)
+        self.plan = FinishPlan(finish, fields, defaults)
+
+
+def finish_plan(preset: Dict, finish: str = "") -> FinishPlan:
+    """The compiled plan of a loaded preset (compiled on the fly for plain dicts)"""
+    plan = getattr(preset, "plan", None)
+    return plan if plan is not None else FinishPlan(finish or preset.get("name", ""), preset)
+
+
+# ============================================================
+# LOADING AND VALIDATION
+# ============================================================
+
+def validate_finish(finish: str, preset: Dict):
+    """Return the problems with one preset ([] when valid)"""
+    problems = []
+    if not re.fullmatch(r"[a-z][a-z0-9_]*", finish):
+        problems.append(f"{finish}: key must be lower_snake_case")
+
+    for field in REQUIRED_FIELDS:
+        if field not in preset:
+            problems.append(f"{finish}: missing '{field}'")
+
+    for field, value in preset.items():
+        if field in FINISH_SOCKETS:
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0.0 <= value <= 1.0:
+                problems.append(f"{finish}.{field}: {value!r} is not a number in [0, 1]")
+        elif field in FINISH_FLAGS:
+            if not isinstance(value, bool):
+                problems.append(f"{finish}.{field}: {value!r} is not true/false")
+        elif field in FINISH_TEXT:
+            if not isinstance(value, str) or not value:
+                problems.append(f"{finish}.{field}: expected a non-empty string")
+        else:
+            problems.append(f"{finish}: unknown field '{field}'")
+
+    return problems
+
+
+def load_catalogs(path=PRESETS_PATH) -> Dict[str, Dict[str, FinishPreset]]:
+    """
+    Read and validate finish_presets.json; returns {catalog: {finish: FinishPreset}}
+    Raises ValueError listing every problem found.
+    """
+    with open(path) as f:
+        data = json.load(f)
+
+    if data.get("version") != PRESETS_VERSION:
+        raise ValueError(f"{path}: unsupported version {data.get('version')!r}, expected {PRESETS_VERSION}")
+
+    problems = [f"missing catalog '{catalog}'" for catalog in CATALOGS if catalog not in data]
+    for catalog in CATALOGS:
+        for finish, preset in data.get(catalog, {}).items():
+            problems.extend(f"{catalog}.{problem}" for problem in validate_finish(finish, preset))
+    if problems:
+        raise ValueError(f"Invalid finish presets in {path}:\n  " + "\n  ".join(problems))
+
+    return {
+        catalog: {
+            finish: FinishPreset(finish, preset, CATALOG_DEFAULTS[catalog])
+            for finish, preset in data[catalog].items()
+        }
+        for catalog in CATALOGS
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _default_catalogs() -> Dict[str, Dict[str, FinishPreset]]:
+    return load_catalogs(PRESETS_PATH)
+
+
+def finish_catalog(catalog: str) -> Dict[str, FinishPreset]:
+    """Validated finishes of one catalog ('webhook', 'preview' or 'premium'), loaded once"""
+    if catalog not in CATALOGS:
+        raise ValueError(f"Unknown finish catalog '{catalog}', expected one of {list(CATALOGS)}")
+    return _default_catalogs()[catalog]
+
+
+# ============================================================
+# WEB EXPORT
+# ============================================================
+
+WEB_PRESET_PATTERN = re.compile(
+    r"(\w+):\s*\{\s*name:\s*'([^']*)',\s*metalness:\s*([\d.]+),\s*roughness:\s*([\d.]+),?\s*\}"
+)
+
+
+def parse_web_finishes(path=WEB_CONSTANTS_PATH) -> Dict[str, Dict]:
+    """Finishes from the FINISH_PRESETS object in lib/constants.ts"""
+    text = Path(path).read_text()
+    start = text.find("export const FINISH_PRESETS")
+    end = text.find("\n};", start)
+    if start == -1 or end == -1:
+        raise ValueError(f"No FINISH_PRESETS object in {path}")
+
+    finishes = {
+        key: {"name": name, "metalness": float(metalness), "roughness": float(roughness)}
+        for key, name, metalness, roughness in WEB_PRESET_PATTERN.findall(text[start:end])
+    }
+    if not finishes:
+        raise ValueError(f"FINISH_PRESETS in {path} has no finishes in the expected format")
+    return finishes
+
+
+def export_web_finishes(path=PRESETS_PATH, source=WEB_CONSTANTS_PATH) -> bool:
+    """Rewrite the webhook catalog from lib/constants.ts; returns True when it changed"""
+    with open(path) as f:
+        data = json.load(f)
+
+    finishes = parse_web_finishes(source)
+    if data.get("webhook") == finishes:
+        return False
+
+    data["webhook"] = finishes
+    tmp_path = Path(path).with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+    tmp_path.replace(path)
+    return True
+
+
+# ============================================================
+# MAIN
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate and export the shared finish presets")
+    parser.add_argument("--export", action="store_true", help="Re-export the webhook catalog from lib/constants.ts")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if the webhook catalog is out of date")
+    args = parser.parse_args()
+
+    if args.export:
+        changed = export_web_finishes()
+        print(f"✅ {'Updated' if changed else 'Unchanged'}: {PRESETS_PATH.name}")
+
+    catalogs = load_catalogs()
+
+    if args.check:
+        web = parse_web_finishes()
+        if {finish: dict(preset) for finish, preset in catalogs["webhook"].items()} != web:
+            print(f"❌ {PRESETS_PATH.name} is out of date with {WEB_CONSTANTS_PATH.name}; run with --export")
+            return 1
+
+    for catalog, finishes in catalogs.items():
+        print(f"\n{catalog}: {len(finishes)} finish(es)")
+        for finish, preset in finishes.items():
+            print(f"   {finish:<24}{preset.plan}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,443 @@
+"""
+Helmet GLB Reader
+Reads public/helmet.glb without Blender and reports geometry per helmet zone
+
+The binary chunk is memory-mapped and accessors are exposed as zero-copy NumPy
+views, so inspecting even large files only touches the bytes actually used.
+Vertices are classified into the ZONES of blender/update_helmet_materials.py by
+their COLOR_0 value: the nearest zone color, if it is within ZONE_TOLERANCE.
+Draco-compressed primitives (KHR_draco_mesh_compression) are decoded with the
+optional DracoPy package; without it they are counted from accessor metadata.
+
+Usage:
+    python3 scripts/helmet_glb.py
+    python3 scripts/helmet_glb.py public/helmet.glb --json
+
+    from helmet_glb import GLBFile, zone_stats
+    with GLBFile("public/helmet.glb") as glb:
+        stats = zone_stats(glb)   # {"zones": {zone: {vertices, triangles, bounds}}, ...}
+"""
+
+import argparse
+import ast
+import json
+import mmap
+import struct
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+SCRIPT_DIR = Path(__file__).parent
+GLB_PATH = SCRIPT_DIR.parent / "public" / "helmet.glb"
+MATERIALS_SCRIPT = SCRIPT_DIR / "blender" / "update_helmet_materials.py"
+
+GLB_MAGIC = b"glTF"
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+
+COMPONENT_DTYPES = {
+    5120: np.int8,
+    5121: np.uint8,
+    5122: np.int16,
+    5123: np.uint16,
+    5125: np.uint32,
+    5126: np.float32,
+}
+TYPE_SIZES = {"SCALAR": 1, "VEC2": 2, "VEC3": 3, "VEC4": 4, "MAT2": 4, "MAT3": 9, "MAT4": 16}
+
+MODE_TRIANGLES = 4
+
+# Max RGB distance from a zone color; farther vertices are reported as UNMATCHED
+ZONE_TOLERANCE = 0.1
+UNMATCHED_ZONE = "UNMATCHED"
+UNASSIGNED_ZONE = "UNASSIGNED"  # Primitives without COLOR_0
+UNDECODED_ZONE = "UNDECODED"  # Draco primitives when DracoPy is not installed
+
+DRACO_EXTENSION = "KHR_draco_mesh_compression"
+
+
+def load_zones(path=MATERIALS_SCRIPT):
+    """
+    ZONES ({name: (r, g, b)}) from update_helmet_materials.py
+    Parsed from the source rather than imported, since that module needs bpy.
+    """
+    tree = ast.parse(Path(path).read_text())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id == "ZONES" for target in node.targets
+        ):
+            return ast.literal_eval(node.value)
+    raise ValueError(f"No ZONES definition in {path}")
+
+
+ZONES = load_zones()
+
+# ============================================================
+# GLB FILE
+# ============================================================
+
+class UnsupportedGLBError(ValueError):
+    """Raised for valid glTF features this reader does not handle (sparse accessors, external buffers)"""
+
+
+class GLBFile:
+    """
+    Memory-mapped binary glTF
+    `json` is the parsed JSON chunk; accessor() returns NumPy views into the BIN
+    chunk (writable when opened with writable=True, changes go straight to disk).
+    Views must be released (or copied) before the file is closed.
+    """
+
+    def __init__(self, path, writable=False):
+        self.path = Path(path)
+        self.writable = writable
+        self._file = open(self.path, "r+b" if writable else "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+
+        magic, version, length = struct.unpack_from("<4sII", self._mmap, 0)
+        if magic != GLB_MAGIC or version != 2:
+            self.close()
+            raise ValueError(f"{self.path} is not a glTF 2.0 binary")
+
+        self.json = None
+        self.json_length = 0
+        self.bin_offset = 0
+        self.bin_length = 0
+
+        offset = 12
+        while offset < length:
+            chunk_length, chunk_type = struct.unpack_from("<II", self._mmap, offset)
+            if chunk_type == CHUNK_JSON:
+                self.json = json.loads(self._mmap[offset + 8:offset + 8 + chunk_length])
+                self.json_length = chunk_length
+            elif chunk_type == CHUNK_BIN and not self.bin_length:
+                self.bin_offset = offset + 8
+                self.bin_length = chunk_length
+            offset += 8 + chunk_length
+
+        if self.json is None:
+            self.close()
+            raise ValueError(f"{self.path} has no JSON chunk")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def flush(self):
+        """Write modified pages of a writable file back to disk"""
+        self._mmap.flush()
+
+    @property
+    def file_size(self):
+        return len(self._mmap)
+
+    def buffer_view_bytes(self, view_index):
+        """Byte length of a buffer view"""
+        return self.json["bufferViews"][view_index]["byteLength"]
+
+    def accessor(self, index):
+        """Accessor data as a (count, components) array viewing the mapped file"""
+        accessor = self.json["accessors"][index]
+        dtype = np.dtype(COMPONENT_DTYPES[accessor["componentType"]])
+        components = TYPE_SIZES[accessor["type"]]
+        count = accessor["count"]
+
+        if "sparse" in accessor:
+            raise UnsupportedGLBError(f"{self.path}: accessor {index} is sparse, which is not supported")
+        if "bufferView" not in accessor:
+            # No data (e.g. Draco-compressed attribute); spec says all zeros
+            return np.zeros((count, components), dtype=dtype)
+
+        view = self.json["bufferViews"][accessor["bufferView"]]
+        buffer = view.get("buffer", 0)
+        if buffer != 0 or not self.bin_length:
+            raise UnsupportedGLBError(
+                f"{self.path}: accessor {index} reads buffer {buffer}, which is not the GLB binary chunk"
+            )
+
+        offset = self.bin_offset + view.get("byteOffset", 0) + accessor.get("byteOffset", 0)
+        stride = view.get("byteStride") or dtype.itemsize * components
+        return np.ndarray(
+            shape=(count, components),
+            dtype=dtype,
+            buffer=self._mmap,
+            offset=offset,
+            strides=(stride, dtype.itemsize),
+        )
+
+    def accessor_float(self, index):
+        """Accessor as float32, dequantizing normalized integer data"""
+        accessor = self.json["accessors"][index]
+        data = self.accessor(index)
+        if not accessor.get("normalized"):
+            return data.astype(np.float32, copy=False)
+        return data.astype(np.float32) / np.float32(np.iinfo(data.dtype).max)
+
+    def primitive_indices(self, primitive):
+        """Triangle vertex indices of a primitive as a flat array"""
+        if "indices" in primitive:
+            return self.accessor(primitive["indices"]).reshape(-1)
+        count = self.json["accessors"][primitive["attributes"]["POSITION"]]["count"]
+        return np.arange(count, dtype=np.uint32)
+
+    def draco_bytes(self, primitive):
+        """Compressed Draco payload of a primitive as a zero-copy memoryview"""
+        view = self.json["bufferViews"][primitive["extensions"][DRACO_EXTENSION]["bufferView"]]
+        offset = self.bin_offset + view.get("byteOffset", 0)
+        return memoryview(self._mmap)[offset:offset + view["byteLength"]]
+
+
+# ============================================================
+# DRACO
+# ============================================================
+
+class DracoUnavailableError(RuntimeError):
+    """Raised when a Draco primitive needs decoding but DracoPy is not installed"""
+
+
+def is_draco(primitive):
+    return DRACO_EXTENSION in primitive.get("extensions", {})
+
+
+def decode_draco(glb, primitive):
+    """(positions, colors or None, flat indices) of a Draco primitive via DracoPy"""
+    try:
+        import DracoPy
+    except ImportError:
+        raise DracoUnavailableError("Decoding Draco primitives requires DracoPy (pip install DracoPy)")
+
+    mesh = DracoPy.decode(bytes(glb.draco_bytes(primitive)))
+    positions = np.asarray(mesh.points, dtype=np.float32).reshape(-1, 3)
+    indices = np.asarray(mesh.faces, dtype=np.uint32).reshape(-1)
+
+    colors = getattr(mesh, "colors", None)
+    if colors is not None:
+        colors = np.asarray(colors)
+        if np.issubdtype(colors.dtype, np.integer):
+            colors = colors.astype(np.float32) / np.float32(np.iinfo(colors.dtype).max)
+        colors = colors.reshape(len(positions), -1)
+    return positions, colors, indices
+
+
+def primitive_geometry(glb, primitive):
+    """(positions, COLOR_0 as float or None, flat indices) of a primitive, decoding Draco"""
+    if is_draco(primitive):
+        return decode_draco(glb, primitive)
+
+    attributes = primitive["attributes"]
+    colors = glb.accessor_float(attributes["COLOR_0"]) if "COLOR_0" in attributes else None
+    return glb.accessor(attributes["POSITION"]), colors, glb.primitive_indices(primitive)
+
+
+# ============================================================
+# SCENE
+# ============================================================
+
+def node_matrix(node):
+    """Local 4x4 transform of a glTF node"""
+    if "matrix" in node:
+        return np.array(node["matrix"], dtype=np.float64).reshape(4, 4).T
+
+    x, y, z, w = node.get("rotation", (0.0, 0.0, 0.0, 1.0))
+    rotation = np.array([
+        [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+        [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+        [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)],
+    ])
+    matrix = np.identity(4)
+    matrix[:3, :3] = rotation * np.array(node.get("scale", (1.0, 1.0, 1.0)))
+    matrix[:3, 3] = node.get("translation", (0.0, 0.0, 0.0))
+    return matrix
+
+
+def mesh_instances(glb):
+    """Yield (node name, mesh index, world matrix) for every mesh node in the default scene"""
+    document = glb.json
+    nodes = document.get("nodes", [])
+    scenes = document.get("scenes", [])
+    roots = scenes[document.get("scene", 0)]["nodes"] if scenes else range(len(nodes))
+
+    stack = [(index, np.identity(4)) for index in roots]
+    while stack:
+        index, parent_matrix = stack.pop()
+        node = nodes[index]
+        matrix = parent_matrix @ node_matrix(node)
+        if "mesh" in node:
+            yield node.get("name", f"node_{index}"), node["mesh"], matrix
+        stack.extend((child, matrix) for child in node.get("children", []))
+
+
+# ============================================================
+# ZONES
+# ============================================================
+
+def zone_palette(zones=None):
+    """(zone names, (zones, 3) float32 color array) in ZONES order"""
+    zones = zones or ZONES
+    return list(zones), np.array(list(zones.values()), dtype=np.float32)
+
+
+def classify_colors(colors, palette):
+    """
+    Nearest palette entry per color
+    Returns (zone index per vertex as uint8, distance to that zone color). Works on
+    one contiguous channel at a time with a running minimum to stay fast on
+    multi-million vertex buffers.
+    """
+    channels = [np.ascontiguousarray(colors[:, channel], dtype=np.float32) for channel in range(3)]
+    best = np.full(len(colors), np.inf, dtype=np.float32)
+    zone_indices = np.zeros(len(colors), dtype=np.uint8)
+    distance = np.empty(len(colors), dtype=np.float32)
+    term = np.empty(len(colors), dtype=np.float32)
+
+    for zone_index, zone_color in enumerate(palette):
+        np.subtract(channels[0], zone_color[0], out=distance)
+        np.square(distance, out=distance)
+        for channel in (1, 2):
+            np.subtract(channels[channel], zone_color[channel], out=term)
+            np.square(term, out=term)
+            distance += term
+
+        closer = distance < best
+        np.copyto(best, distance, where=closer)
+        zone_indices[closer] = zone_index
+
+    return zone_indices, np.sqrt(best, out=best)
+
+
+def triangle_zones(vertex_zones, indices):
+    """Zone per triangle: the zone shared by at least two of its vertices, else the first's"""
+    corners = vertex_zones[indices[:len(indices) - len(indices) % 3]].reshape(-1, 3)
+    return np.where(corners[:, 1] == corners[:, 2], corners[:, 1], corners[:, 0])
+
+
+def zone_stats(glb, zones=None, tolerance=ZONE_TOLERANCE):
+    """
+    Per-zone vertex/triangle counts and world-space bounds of every mesh instance
+    Vertices farther than `tolerance` from every zone color are reported under
+    UNMATCHED, primitives without COLOR_0 under UNASSIGNED (both only when present).
+    Draco primitives that cannot be decoded are counted under UNDECODED, with
+    bounds from their POSITION accessor min/max.
+    Non-triangle primitives contribute vertices but no triangles.
+    """
+    started = time.perf_counter()
+    names, palette = zone_palette(zones)
+    all_names = names + [UNMATCHED_ZONE, UNASSIGNED_ZONE, UNDECODED_ZONE]
+    unmatched, unassigned, undecoded = len(names), len(names) + 1, len(names) + 2
+
+    vertices = np.zeros(len(all_names), dtype=np.int64)
+    triangles = np.zeros(len(all_names), dtype=np.int64)
+    bounds_min = np.full((len(all_names), 3), np.inf)
+    bounds_max = np.full((len(all_names), 3), -np.inf)
+    primitives = 0
+
+    meshes = glb.json.get("meshes", [])
+    for _, mesh_index, matrix in mesh_instances(glb):
+        for primitive in meshes[mesh_index]["primitives"]:
+            primitives += 1
+            try:
+                positions, colors, indices = primitive_geometry(glb, primitive)
+            except DracoUnavailableError:
+                # Counts and bounds from the accessors, which Draco primitives still declare
+                position_accessor = glb.json["accessors"][primitive["attributes"]["POSITION"]]
+                positions = np.array([position_accessor["min"], position_accessor["max"]], dtype=np.float32)
+                colors = None
+                index_count = glb.json["accessors"][primitive["indices"]]["count"] if "indices" in primitive else 0
+                vertices[undecoded] += position_accessor["count"]
+                triangles[undecoded] += index_count // 3
+                world = positions @ matrix[:3, :3].T + matrix[:3, 3]
+                bounds_min[undecoded] = np.minimum(bounds_min[undecoded], world.min(axis=0))
+                bounds_max[undecoded] = np.maximum(bounds_max[undecoded], world.max(axis=0))
+                continue
+
+            world = positions @ matrix[:3, :3].T + matrix[:3, 3]
+
+            if colors is not None:
+                vertex_zones, distances = classify_colors(colors, palette)
+                vertex_zones[distances > tolerance] = unmatched
+            else:
+                vertex_zones = np.full(len(positions), unassigned, dtype=np.uint8)
+
+            vertices += np.bincount(vertex_zones, minlength=len(all_names))
+            if primitive.get("mode", MODE_TRIANGLES) == MODE_TRIANGLES:
+                face_zones = triangle_zones(vertex_zones, indices)
+                triangles += np.bincount(face_zones, minlength=len(all_names))
+
+            for zone_index in np.unique(vertex_zones):
+                zone_points = world[vertex_zones == zone_index]
+                bounds_min[zone_index] = np.minimum(bounds_min[zone_index], zone_points.min(axis=0))
+                bounds_max[zone_index] = np.maximum(bounds_max[zone_index], zone_points.max(axis=0))
+
+    result = {}
+    for zone_index, name in enumerate(all_names):
+        if name in (UNMATCHED_ZONE, UNASSIGNED_ZONE, UNDECODED_ZONE) and not vertices[zone_index]:
+            continue
+        has_vertices = bool(vertices[zone_index])
+        result[name] = {
+            "vertices": int(vertices[zone_index]),
+            "triangles": int(triangles[zone_index]),
+            "bounds": {
+                "min": [round(float(value), 6) for value in bounds_min[zone_index]] if has_vertices else None,
+                "max": [round(float(value), 6) for value in bounds_max[zone_index]] if has_vertices else None,
+            },
+        }
+
+    return {
+        "file": str(glb.path),
+        "primitives": primitives,
+        "zones": result,
+        "elapsedMs": round((time.perf_counter() - started) * 1000, 3),
+    }
+
+
+# ============================================================
+# MAIN
+# ============================================================
+
+def print_zone_stats(stats):
+    print(f"\n{'Zone':<18}{'Vertices':>10}{'Triangles':>11}   Bounds (min → max)")
+    for name, zone in stats["zones"].items():
+        bounds = zone["bounds"]
+        extent = (
+            f"({', '.join(f'{v:.3f}' for v in bounds['min'])}) → ({', '.join(f'{v:.3f}' for v in bounds['max'])})"
+            if bounds["min"] else "-"
+        )
+        print(f"{name:<18}{zone['vertices']:>10}{zone['triangles']:>11}   {extent}")
+    print(f"\n✅ {stats['primitives']} primitive(s) in {stats['elapsedMs']:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-zone geometry of a helmet GLB")
+    parser.add_argument("glb", nargs="?", type=Path, default=GLB_PATH, help="GLB file (default: public/helmet.glb)")
+    parser.add_argument("--tolerance", type=float, default=ZONE_TOLERANCE, help="Max RGB distance from a zone color")
+    parser.add_argument("--json", action="store_true", help="Print the stats as JSON")
+    args = parser.parse_args()
+
+    with GLBFile(args.glb) as glb:
+        stats = zone_stats(glb, tolerance=args.tolerance)
+
+    if args.json:
+        print(json.dumps(stats, indent=2))
+    else:
+        print_zone_stats(stats)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
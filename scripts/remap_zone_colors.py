@@ -0,0 +1,163 @@
+"""
+Vertex-Color Zone Remapper
+Snaps drifted COLOR_0 values in a helmet GLB to the exact ZONES colors of
+blender/update_helmet_materials.py and writes them back into the file in place
+
+Exports can drift from the exact zone colors (e.g. 0.996 instead of 1.0), which
+breaks zone matching in the material node graph. Colors within --max-distance of
+a zone color are snapped to it; colors farther from every zone are left alone and
+reported as unmatched. Only the RGB of COLOR_0 is touched (alpha is kept), and the
+file size and layout do not change.
+
+Usage:
+    python3 scripts/remap_zone_colors.py --dry-run       # report only
+    python3 scripts/remap_zone_colors.py public/helmet.glb --max-distance 0.2
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from helmet_glb import GLB_PATH, GLBFile, classify_colors, is_draco, zone_palette
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+# Max RGB distance a color is snapped over; larger differences are not drift
+MAX_SNAP_DISTANCE = 0.25
+
+# ============================================================
+# REMAPPING
+# ============================================================
+
+def palette_values(palette, dtype, normalized):
+    """Zone colors in an accessor's storage type"""
+    if normalized:
+        return np.rint(palette * np.iinfo(dtype).max).astype(dtype)
+    return palette.astype(dtype)
+
+
+def remap_colors(colors, palette, normalized, max_distance=MAX_SNAP_DISTANCE, write=True):
+    """
+    Snap the RGB of a (count, 3|4) color view to the nearest palette entry
+    Returns (snapped per zone, exact per zone, unmatched count); writes into `colors`.
+    """
+    values = colors[:, :3].astype(np.float32)
+    if normalized:
+        values /= np.float32(np.iinfo(colors.dtype).max)
+
+    zone_indices, distances = classify_colors(values, palette)
+    snap = (distances > 0.0) & (distances <= max_distance)
+    exact = distances == 0.0
+
+    if write and snap.any():
+        colors[snap, :3] = palette_values(palette, colors.dtype, normalized)[zone_indices[snap]]
+
+    zone_count = len(palette)
+    return (
+        np.bincount(zone_indices[snap], minlength=zone_count),
+        np.bincount(zone_indices[exact], minlength=zone_count),
+        int((distances > max_distance).sum()),
+    )
+
+
+def remap_glb(path, max_distance=MAX_SNAP_DISTANCE, dry_run=False):
+    """
+    Snap COLOR_0 of every primitive in `path` (each accessor once); returns a summary
+    Draco-compressed primitives cannot be edited in place and are skipped.
+    """
+    started = time.perf_counter()
+    names, palette = zone_palette()
+    snapped = np.zeros(len(names), dtype=np.int64)
+    exact = np.zeros(len(names), dtype=np.int64)
+    unmatched = 0
+    vertices = 0
+    skipped_draco = 0
+    stale_bounds = 0
+    seen = set()
+
+    with GLBFile(path, writable=not dry_run) as glb:
+        for mesh in glb.json.get("meshes", []):
+            for primitive in mesh["primitives"]:
+                if is_draco(primitive):
+                    skipped_draco += 1
+                    continue
+                accessor_index = primitive["attributes"].get("COLOR_0")
+                if accessor_index is None or accessor_index in seen:
+                    continue
+                seen.add(accessor_index)
+
+                accessor = glb.json["accessors"][accessor_index]
+                colors = glb.accessor(accessor_index)
+                zone_snapped, zone_exact, accessor_unmatched = remap_colors(
+                    colors, palette, accessor.get("normalized", False), max_distance, write=not dry_run,
+                )
+                del colors  # Release the view before the file is closed
+
+                snapped += zone_snapped
+                exact += zone_exact
+                unmatched += accessor_unmatched
+                vertices += accessor["count"]
+                if zone_snapped.any() and ("min" in accessor or "max" in accessor):
+                    stale_bounds += 1
+
+        if not dry_run:
+            glb.flush()
+
+    return {
+        "file": str(path),
+        "dryRun": dry_run,
+        "vertices": vertices,
+        "zones": {
+            name: {"exact": int(exact[index]), "snapped": int(snapped[index])}
+            for index, name in enumerate(names)
+        },
+        "snapped": int(snapped.sum()),
+        "unmatched": unmatched,
+        "skippedDracoPrimitives": skipped_draco,
+        "staleAccessorBounds": stale_bounds,
+        "elapsedMs": round((time.perf_counter() - started) * 1000, 3),
+    }
+
+
+# ============================================================
+# MAIN
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Snap drifted vertex colors in a helmet GLB to exact zone colors")
+    parser.add_argument("glb", nargs="?", type=Path, default=GLB_PATH, help="GLB file, edited in place (default: public/helmet.glb)")
+    parser.add_argument("--max-distance", type=float, default=MAX_SNAP_DISTANCE, help="Max RGB distance to snap over")
+    parser.add_argument("--dry-run", action="store_true", help="Report misclassified vertices without writing")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args()
+
+    summary = remap_glb(args.glb, args.max_distance, args.dry_run)
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return 0
+
+    print(f"\n{'Zone':<18}{'Exact':>10}{'Snapped':>10}")
+    for name, zone in summary["zones"].items():
+        print(f"{name:<18}{zone['exact']:>10,}{zone['snapped']:>10,}")
+
+    action = "would be snapped" if args.dry_run else "snapped"
+    print(f"\n✅ {summary['snapped']:,} of {summary['vertices']:,} vertices {action} "
+          f"in {summary['elapsedMs']:.1f} ms")
+    if summary["unmatched"]:
+        print(f"⚠️ {summary['unmatched']:,} vertices are farther than {args.max_distance} from every zone color (left as is)")
+    if summary["skippedDracoPrimitives"]:
+        print(f"⚠️ Skipped {summary['skippedDracoPrimitives']} Draco-compressed primitive(s)")
+    if summary["staleAccessorBounds"]:
+        print(f"⚠️ {summary['staleAccessorBounds']} COLOR_0 accessor(s) declare min/max that may now be stale")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,14 +11,26 @@ Usage:
 
     Or run from command line:
     blender Final_Helmet-Blend.blend --background --python render_material_previews.py
+
+    # Render device options (see render_utils.render_device_options)
+    blender Final_Helmet-Blend.blend --background --python render_material_previews.py -- --device cpu --threads 8
+    blender Final_Helmet-Blend.blend --background --python render_material_previews.py -- --calibrate
 """
 
 import bpy
 import os
+import sys
 from pathlib import Path
 from mathutils import Vector, Color
 import math
 
+sys.path.insert(0, str(Path(__file__).parent))
+from render_utils import (
+    MaterialPool, RenderCache, calibrate_render_device, configure_render_device,
+    hash_mesh_data, render_device_options, stable_hash,
+)
+from finish_presets import finish_catalog, finish_plan, hex_to_linear_rgba
+
 # ============================================================
 # CONFIGURATION
 # ============================================================
@@ -26,37 +38,8 @@ import math
 # Output directory (relative to project root)
 OUTPUT_DIR = Path(__file__).parent.parent / "public" / "material-previews"
 
-# Material finish presets matching your web app
-FINISH_PRESETS = {
-    "glossy": {
-        "name": "Glossy",
-        "metalness": 0.0,
-        "roughness": 0.2,
-        "clearcoat": 0.5,
-        "sheen": 0.0,
-    },
-    "matte": {
-        "name": "Matte",
-        "metalness": 0.0,
-        "roughness": 0.9,
-        "clearcoat": 0.0,
-        "sheen": 0.1,
-    },
-    "metallic": {
-        "name": "Metallic",
-        "metalness": 1.0,
-        "roughness": 0.3,
-        "clearcoat": 0.0,
-        "sheen": 0.0,
-    },
-    "chrome": {
-        "name": "Chrome",
-        "metalness": 1.0,
-        "roughness": 0.05,
-        "clearcoat": 1.0,
-        "sheen": 0.0,
-    },
-}
+# Material finish presets (the "preview" catalog of finish_presets.json)
+FINISH_PRESETS = finish_catalog("preview")
 
 # Sample colors for previews
 PREVIEW_COLORS = [
@@ -74,29 +57,44 @@ RENDER_HEIGHT = 800
 RENDER_SAMPLES = 128  # Increase for final quality (256-512)
 USE_DENOISE = True
 
+# Finish materials kept alive between renders (only the base color is swapped)
+MATERIAL_POOL_SIZE = int(os.environ.get("PREVIEW_MATERIAL_POOL_SIZE", 4))
+
+# Studio lighting (rotation in degrees)
+STUDIO_LIGHTS = [
+    {"name": "Key_Light", "location": (3, -3, 4), "rotation": (60, 0, 45), "energy": 300, "size": 3},   # Main light, 45° angle
+    {"name": "Fill_Light", "location": (-2, -2, 3), "rotation": (60, 0, -45), "energy": 150, "size": 4},  # Soften shadows
+    {"name": "Rim_Light", "location": (0, 3, 3), "rotation": (30, 0, 180), "energy": 200, "size": 2},    # Edge definition
+]
+WORLD_COLOR = (1, 1, 1, 1)  # White
+WORLD_STRENGTH = 0.5
+
+CAMERA = {"location": (0, -5, 1.5), "rotation": (85, 0, 0), "lens": 50, "sensor_width": 36}
+
+# Skip previews whose inputs are unchanged since the last render (see render_utils.RenderCache)
+RENDER_INDEX_FILE = "render-index.json"
+RENDER_CACHE_VERSION = 2  # Bump when material/scene code changes in ways not captured by the settings above
+FORCE_RENDER = os.environ.get("PREVIEW_FORCE_RENDER") == "1"
+
 # ============================================================
 # HELPER FUNCTIONS
 # ============================================================
 
-def hex_to_rgb(hex_color):
-    """Convert hex color to RGB tuple (0-1 range)"""
-    hex_color = hex_color.lstrip('#')
-    return tuple(int(hex_color[i:i+2], 16) / 255.0 for i in (0, 2, 4))
-
-
-def setup_scene():
+def setup_scene(device_options=None):
     """Configure scene for optimal preview rendering"""
     scene = bpy.context.scene
 
     # Set render engine to Cycles (best quality)
     scene.render.engine = 'CYCLES'
-    scene.cycles.device = 'GPU'  # Use GPU if available
 
     # Render settings
     scene.render.resolution_x = RENDER_WIDTH
     scene.render.resolution_y = RENDER_HEIGHT
     scene.cycles.samples = RENDER_SAMPLES
 
+    # GPU if available, otherwise tuned CPU settings (PREVIEW_RENDER_* env vars)
+    configure_render_device(scene, **(device_options or render_device_options()))
+
     # Enable denoising for cleaner renders
     if USE_DENOISE:
         scene.cycles.use_denoising = True
@@ -118,29 +116,13 @@ def setup_lighting():
     bpy.ops.object.select_by_type(type='LIGHT')
     bpy.ops.object.delete()
 
-    # Key light (main light, 45° angle)
-    bpy.ops.object.light_add(type='AREA', location=(3, -3, 4))
-    key_light = bpy.context.object
-    key_light.name = "Key_Light"
-    key_light.data.energy = 300
-    key_light.data.size = 3
-    key_light.rotation_euler = (math.radians(60), 0, math.radians(45))
-
-    # Fill light (soften shadows, opposite side)
-    bpy.ops.object.light_add(type='AREA', location=(-2, -2, 3))
-    fill_light = bpy.context.object
-    fill_light.name = "Fill_Light"
-    fill_light.data.energy = 150
-    fill_light.data.size = 4
-    fill_light.rotation_euler = (math.radians(60), 0, math.radians(-45))
-
-    # Rim light (edge definition, from behind)
-    bpy.ops.object.light_add(type='AREA', location=(0, 3, 3))
-    rim_light = bpy.context.object
-    rim_light.name = "Rim_Light"
-    rim_light.data.energy = 200
-    rim_light.data.size = 2
-    rim_light.rotation_euler = (math.radians(30), 0, math.radians(180))
+    for light in STUDIO_LIGHTS:
+        bpy.ops.object.light_add(type='AREA', location=light["location"])
+        light_obj = bpy.context.object
+        light_obj.name = light["name"]
+        light_obj.data.energy = light["energy"]
+        light_obj.data.size = light["size"]
+        light_obj.rotation_euler = tuple(math.radians(angle) for angle in light["rotation"])
 
     # Add HDRI environment for realistic reflections
     world = bpy.context.scene.world
@@ -150,8 +132,8 @@ def setup_lighting():
 
     # Environment texture node
     env_node = nodes.new(type='ShaderNodeBackground')
-    env_node.inputs['Strength'].default_value = 0.5
-    env_node.inputs['Color'].default_value = (1, 1, 1, 1)  # White
+    env_node.inputs['Strength'].default_value = WORLD_STRENGTH
+    env_node.inputs['Color'].default_value = WORLD_COLOR
 
     output_node = nodes.new(type='ShaderNodeOutputWorld')
     world.node_tree.links.new(env_node.outputs['Background'], output_node.inputs['Surface'])
@@ -167,19 +149,19 @@ def setup_camera():
             bpy.data.objects.remove(obj, do_unlink=True)
 
     # Create camera
-    bpy.ops.object.camera_add(location=(0, -5, 1.5))
+    bpy.ops.object.camera_add(location=CAMERA["location"])
     camera = bpy.context.object
     camera.name = "Preview_Camera"
 
     # Point camera at helmet (assuming helmet is at origin)
-    camera.rotation_euler = (math.radians(85), 0, 0)
+    camera.rotation_euler = tuple(math.radians(angle) for angle in CAMERA["rotation"])
 
     # Set as active camera
     bpy.context.scene.camera = camera
 
     # Camera settings for nice depth of field (optional)
-    camera.data.lens = 50  # 50mm lens
-    camera.data.sensor_width = 36
+    camera.data.lens = CAMERA["lens"]
+    camera.data.sensor_width = CAMERA["sensor_width"]
 
     print("✅ Camera positioned")
 
@@ -207,6 +189,18 @@ def find_helmet_objects():
 
 def create_material(name, base_color_hex, finish_preset):
     """Create a Principled BSDF material with specified properties"""
+    mat = build_material(name, finish_preset)
+    set_material_color(mat, base_color_hex)
+    return mat
+
+
+def set_material_color(mat, base_color_hex):
+    """Swap the base color of a preview material"""
+    mat.node_tree.nodes['Preview_BSDF'].inputs['Base Color'].default_value = hex_to_linear_rgba(base_color_hex)
+
+
+def build_material(name, finish_preset):
+    """Build the finish node tree; the color is set separately by set_material_color"""
     # Create new material
     mat = bpy.data.materials.new(name=name)
     mat.use_nodes = True
@@ -215,17 +209,11 @@ def create_material(name, base_color_hex, finish_preset):
 
     # Create Principled BSDF
     bsdf = nodes.new(type='ShaderNodeBsdfPrincipled')
+    bsdf.name = 'Preview_BSDF'
     bsdf.location = (0, 0)
 
-    # Set base color
-    rgb = hex_to_rgb(base_color_hex)
-    bsdf.inputs['Base Color'].default_value = (*rgb, 1.0)
-
     # Set finish properties
-    bsdf.inputs['Metallic'].default_value = finish_preset['metalness']
-    bsdf.inputs['Roughness'].default_value = finish_preset['roughness']
-    bsdf.inputs['Sheen Tint'].default_value = finish_preset['sheen']
-    bsdf.inputs['Clearcoat'].default_value = finish_preset.get('clearcoat', 0.0)
+    finish_plan(finish_preset).apply(bsdf.inputs)
 
     # Output node
     output = nodes.new(type='ShaderNodeOutputMaterial')
@@ -237,6 +225,18 @@ def create_material(name, base_color_hex, finish_preset):
     return mat
 
 
+def scene_digest(helmet_objects):
+    """Hash of everything besides finish and color that affects a preview image"""
+    return stable_hash(
+        RENDER_CACHE_VERSION,
+        {"width": RENDER_WIDTH, "height": RENDER_HEIGHT, "samples": RENDER_SAMPLES, "denoise": USE_DENOISE},
+        STUDIO_LIGHTS,
+        [WORLD_COLOR, WORLD_STRENGTH],
+        CAMERA,
+        hash_mesh_data(helmet_objects),
+    )
+
+
 def apply_material_to_objects(objects, material):
     """Apply material to all objects"""
     for obj in objects:
@@ -265,17 +265,26 @@ def render_preview(output_path):
 # MAIN RENDERING FUNCTION
 # ============================================================
 
-def render_all_material_previews():
-    """Main function - renders all material finish previews"""
+def render_all_material_previews(device_options=None):
+    """
+    Main function - renders all material finish previews
+
+    Args:
+        device_options: See render_utils.render_device_options (defaults from environment)
+    """
     print("=" * 60)
     print("HELMET MATERIAL PREVIEW RENDERER")
     print("=" * 60)
 
     # Setup scene
-    setup_scene()
+    device_options = device_options or render_device_options()
+    setup_scene(device_options)
     setup_lighting()
     setup_camera()
 
+    if device_options["calibrate"]:
+        calibrate_render_device(bpy.context.scene, device_options["threads"])
+
     # Find helmet objects
     helmet_objects = find_helmet_objects()
 
@@ -286,6 +295,18 @@ def render_all_material_previews():
     # Create output directory
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+    # One material per finish; only the base color changes between renders
+    pool = MaterialPool(
+        build=lambda key, data: build_material(f"Preview_{key}", data),
+        recolor=set_material_color,
+        capacity=MATERIAL_POOL_SIZE,
+    )
+    applied_material = None
+
+    # Only re-render previews whose inputs changed since the last run
+    cache = RenderCache(OUTPUT_DIR / RENDER_INDEX_FILE, force=FORCE_RENDER)
+    base_digest = scene_digest(helmet_objects)
+
     # Render preview for each finish type
     for finish_key, finish_data in FINISH_PRESETS.items():
         print(f"\n{'='*60}")
@@ -294,23 +315,31 @@ def render_all_material_previews():
 
         # Render with different colors
         for color_hex, color_name in PREVIEW_COLORS:
-            # Create material
-            mat_name = f"Preview_{finish_key}_{color_name}"
-            material = create_material(mat_name, color_hex, finish_data)
+            output_file = OUTPUT_DIR / f"{finish_key}_{color_name}.png"
+            digest = stable_hash(base_digest, finish_key, finish_data, color_hex)
 
-            # Apply to helmet
-            apply_material_to_objects(helmet_objects, material)
+            if cache.is_fresh(output_file, digest):
+                print(f"⏭️ {output_file.name} unchanged, skipping")
+                continue
+
+            material = pool.get(finish_key, finish_data, color_hex)
+
+            # Apply to helmet (once per finish)
+            if material is not applied_material:
+                apply_material_to_objects(helmet_objects, material)
+                applied_material = material
 
             # Render
-            output_file = OUTPUT_DIR / f"{finish_key}_{color_name}.png"
             render_preview(output_file)
+            cache.record(output_file, digest)
 
-            # Clean up material
-            bpy.data.materials.remove(material)
+    # Clean up materials
+    pool.clear()
 
     print("\n" + "=" * 60)
     print("✅ ALL PREVIEWS RENDERED SUCCESSFULLY!")
     print(f"📁 Output directory: {OUTPUT_DIR}")
+    print(f"⏭️ Render cache: {cache.stats()}")
     print("=" * 60)
 
     # Generate JSON manifest for web app
@@ -373,9 +402,27 @@ def render_single_preview(finish="glossy", color="#FF0000"):
 # EXECUTION
 # ============================================================
 
+def parse_script_args():
+    """Parse arguments passed after `--` on the Blender command line"""
+    import argparse
+
+    argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    parser = argparse.ArgumentParser(prog="render_material_previews.py")
+    parser.add_argument("--device", choices=["auto", "cpu", "gpu"], help="Render device (default: PREVIEW_RENDER_DEVICE or auto)")
+    parser.add_argument("--threads", type=int, help="CPU render threads (default: all cores)")
+    parser.add_argument("--tile-size", type=int, help="CPU tile size (default: single tile for small frames)")
+    parser.add_argument("--calibrate", action="store_true", default=None, help="Pick device settings from a quick test render")
+    args = parser.parse_args(argv)
+
+    args.device_options = render_device_options(args.device, args.threads, args.tile_size, args.calibrate)
+    return args
+
+
 if __name__ == "__main__":
+    args = parse_script_args()
+
     # Render all previews
-    render_all_material_previews()
+    render_all_material_previews(args.device_options)
 
     # Uncomment to render single test preview:
     # render_single_preview(finish="chrome", color="#FFD700")
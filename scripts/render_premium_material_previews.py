@@ -7,14 +7,26 @@ Usage:
     Run this script inside Blender with your helmet file open
     or from command line:
     blender helmet.blend --background --python render_premium_material_previews.py
+
+    # 24-angle turntable sprite sheets instead of stills
+    blender helmet.blend --background --python render_premium_material_previews.py -- --turntable 24
 """
 
 import bpy
 import os
+import sys
 from pathlib import Path
 from mathutils import Vector, Color
 import math
 
+sys.path.insert(0, str(Path(__file__).parent))
+from render_utils import (
+    MaterialPool, RenderCache, calibrate_noise_target, calibrate_render_device, configure_render_device,
+    build_sprite_sheet, derive_sample_budget, hash_mesh_data, measure_render_noise, pack_atlas,
+    render_device_options, render_turntable, setup_turntable, sprite_sheet_layout, stable_hash,
+)
+from finish_presets import finish_catalog, finish_plan, hex_to_linear_rgba, hex_to_rgb, srgb_to_linear_rgba
+
 # ============================================================
 # CONFIGURATION
 # ============================================================
@@ -22,175 +34,8 @@ import math
 OUTPUT_DIR = Path(__file__).parent.parent / "public" / "material-previews"
 
 # Premium finish presets inspired by automotive and sports equipment
-FINISH_PRESETS = {
-    # Basic finishes
-    "glossy": {
-        "name": "Glossy",
-        "description": "Classic high-gloss plastic finish",
-        "metalness": 0.0,
-        "roughness": 0.15,
-        "clearcoat": 0.8,
-        "clearcoat_roughness": 0.05,
-        "sheen": 0.0,
-        "specular": 0.5,
-    },
-    "matte": {
-        "name": "Matte",
-        "description": "Non-reflective flat surface",
-        "metalness": 0.0,
-        "roughness": 0.95,
-        "clearcoat": 0.0,
-        "clearcoat_roughness": 0.3,
-        "sheen": 0.15,
-        "specular": 0.2,
-    },
-
-    # Premium automotive-inspired finishes
-    "pearl_coat": {
-        "name": "Pearl Coat",
-        "description": "Car-paint style with soft iridescence",
-        "metalness": 0.1,
-        "roughness": 0.25,
-        "clearcoat": 1.0,
-        "clearcoat_roughness": 0.02,
-        "sheen": 0.3,
-        "specular": 0.6,
-        "anisotropic": 0.2,  # Subtle directional highlights
-    },
-    "satin_automotive": {
-        "name": "Satin Automotive",
-        "description": "Premium wrap finish - no glare but rich",
-        "metalness": 0.05,
-        "roughness": 0.45,
-        "clearcoat": 0.3,
-        "clearcoat_roughness": 0.15,
-        "sheen": 0.2,
-        "specular": 0.4,
-    },
-    "metallic_flake": {
-        "name": "Metallic Flake",
-        "description": "Classic sparkle with reflective flakes",
-        "metalness": 0.3,
-        "roughness": 0.2,
-        "clearcoat": 0.9,
-        "clearcoat_roughness": 0.05,
-        "sheen": 0.0,
-        "specular": 0.7,
-        "anisotropic": 0.3,
-    },
-    "wet_clearcoat": {
-        "name": "Wet Clear Coat",
-        "description": "Looks freshly waxed - full specular",
-        "metalness": 0.0,
-        "roughness": 0.08,
-        "clearcoat": 1.0,
-        "clearcoat_roughness": 0.01,
-        "sheen": 0.0,
-        "specular": 0.8,
-    },
-
-    # Metal finishes
-    "chrome": {
-        "name": "Chrome",
-        "description": "Mirror-like polished metal",
-        "metalness": 1.0,
-        "roughness": 0.02,
-        "clearcoat": 0.5,
-        "clearcoat_roughness": 0.01,
-        "sheen": 0.0,
-        "specular": 1.0,
-    },
-    "anodized_metal": {
-        "name": "Anodized Metal",
-        "description": "Colored engineered metal - tough look",
-        "metalness": 1.0,
-        "roughness": 0.15,
-        "clearcoat": 0.4,
-        "clearcoat_roughness": 0.08,
-        "sheen": 0.0,
-        "specular": 0.9,
-    },
-    "brushed_titanium": {
-        "name": "Brushed Titanium",
-        "description": "Industrial elite engineering vibe",
-        "metalness": 1.0,
-        "roughness": 0.25,
-        "clearcoat": 0.2,
-        "clearcoat_roughness": 0.1,
-        "sheen": 0.0,
-        "specular": 0.85,
-        "anisotropic": 0.9,  # Strong directional brushing
-        "anisotropic_rotation": 0.0,
-    },
-    "weathered_metal": {
-        "name": "Weathered Metal",
-        "description": "Patina finish for themed alternates",
-        "metalness": 0.85,
-        "roughness": 0.6,
-        "clearcoat": 0.0,
-        "clearcoat_roughness": 0.3,
-        "sheen": 0.1,
-        "specular": 0.5,
-    },
-
-    # Modern/tactical finishes
-    "carbon_fiber": {
-        "name": "Carbon Fiber",
-        "description": "High-tech woven pattern",
-        "metalness": 0.5,
-        "roughness": 0.3,
-        "clearcoat": 0.8,
-        "clearcoat_roughness": 0.05,
-        "sheen": 0.0,
-        "specular": 0.7,
-        "has_texture": True,  # Will add procedural carbon pattern
-    },
-    "rubberized_softtouch": {
-        "name": "Rubberized Soft-Touch",
-        "description": "Tactical stealth look - less reflective",
-        "metalness": 0.0,
-        "roughness": 0.85,
-        "clearcoat": 0.0,
-        "clearcoat_roughness": 0.4,
-        "sheen": 0.25,
-        "specular": 0.15,
-    },
-    "ceramic_gloss": {
-        "name": "Ceramic Gloss",
-        "description": "Ultra-premium clean finish - Apple-ish",
-        "metalness": 0.0,
-        "roughness": 0.12,
-        "clearcoat": 0.95,
-        "clearcoat_roughness": 0.02,
-        "sheen": 0.0,
-        "specular": 0.65,
-    },
-
-    # Special effect finishes
-    "frosted_polycarbonate": {
-        "name": "Frosted Polycarbonate",
-        "description": "Translucent futuristic look",
-        "metalness": 0.0,
-        "roughness": 0.4,
-        "clearcoat": 0.5,
-        "clearcoat_roughness": 0.2,
-        "sheen": 0.1,
-        "specular": 0.4,
-        "transmission": 0.3,  # Slight translucency
-    },
-    "holographic_foil": {
-        "name": "Holographic Foil",
-        "description": "Color-shifting refractive finish",
-        "metalness": 0.4,
-        "roughness": 0.1,
-        "clearcoat": 1.0,
-        "clearcoat_roughness": 0.01,
-        "sheen": 0.5,
-        "specular": 0.9,
-        "anisotropic": 0.7,
-        "has_iridescence": True,
-    },
-}
+# (the "premium" catalog of finish_presets.json)
+FINISH_PRESETS = finish_catalog("premium")
 
 # Color palette
 PREVIEW_COLORS = [
@@ -211,27 +56,86 @@ RENDER_HEIGHT = 1024
 RENDER_SAMPLES = 256  # Higher quality for premium finishes
 USE_DENOISE = True
 
+# Finish materials kept alive between renders (only the base color is swapped)
+MATERIAL_POOL_SIZE = int(os.environ.get("PREVIEW_MATERIAL_POOL_SIZE", 4))
+
+# Professional automotive-style lighting (rotation in degrees)
+STUDIO_LIGHTS = [
+    {"name": "Key_Light", "location": (4, -4, 5), "rotation": (55, 0, 45), "energy": 400, "size": 4},
+    {"name": "Fill_Light", "location": (-3, -3, 4), "rotation": (55, 0, -45), "energy": 200, "size": 5},
+    {"name": "Rim_Light", "location": (0, 4, 4), "rotation": (25, 0, 180), "energy": 250, "size": 3},  # Edge definition
+    {"name": "Bottom_Light", "location": (0, 0, -2), "rotation": (180, 0, 0), "energy": 100, "size": 6},  # Subtle
+]
+WORLD_COLOR = (0.95, 0.95, 1.0, 1.0)  # Slight cool tint
+WORLD_STRENGTH = 0.4
+
+CAMERA = {"location": (0, -6, 1.8), "rotation": (82, 0, 0), "lens": 60, "sensor_width": 36}
+
+# Turntable mode (--turntable N): every finish/color is rendered from N angles as one
+# animation around the helmet and packed into a sprite sheet under OUTPUT_DIR/turntables
+TURNTABLE_ANGLES = int(os.environ.get("PREVIEW_TURNTABLE_ANGLES", 0))  # 0 renders stills
+TURNTABLE_MIN_ANGLES = 8
+TURNTABLE_MAX_ANGLES = 36
+TURNTABLE_SIZE = 512  # Frame width and height
+TURNTABLE_CENTER = (0, 0, 0)  # Orbit center; the helmet sits at the origin
+TURNTABLE_DIR = OUTPUT_DIR / "turntables"
+
+# Progressive tiers, rendered breadth-first across the whole matrix: every thumbnail
+# exists before any mid tier starts, and the manifest is rewritten after each tier so
+# the frontend can show the best image so far. The final tier keeps the plain preview
+# path; lower tiers get an @<size> suffix. samples=None uses the finish's sample budget.
+PREVIEW_TIERS = [
+    {"tier": "thumbnail", "size": 128, "samples": 16},
+    {"tier": "mid", "size": 512, "samples": 64},
+    {"tier": "final", "size": RENDER_WIDTH, "samples": None},
+]
+ENABLED_TIERS = os.environ.get("PREVIEW_TIERS", "thumbnail,mid,final")  # Comma separated
+
+# Thumbnail atlases: one or a few pages per finish, so the finish grid loads in a few requests
+ATLAS_DIR = OUTPUT_DIR / "atlases"
+ATLAS_TIER = "thumbnail"
+ATLAS_MAX_SIZE = 2048
+ATLAS_PADDING = 2
+
+# Per-finish sample budgets from a low-sample pilot render: finishes that converge
+# faster than the reference finish (matte, soft-touch) stop early, noisier ones
+# (holographic foil, frosted polycarbonate) get more samples, up to MAX_SAMPLES. The
+# noise target is calibrated against the current output: the reference finish's
+# (undenoised) noise at RENDER_SAMPLES, estimated from its pilot, so every finish
+# reaches that quality before the same denoiser unless it hits the cap.
+# On by default; PREVIEW_ADAPTIVE_SAMPLES=0 renders every finish at RENDER_SAMPLES.
+# Budgets are stored next to this script and re-piloted when the preset or scene changes.
+ADAPTIVE_SAMPLES = os.environ.get("PREVIEW_ADAPTIVE_SAMPLES", "1") == "1"
+SAMPLE_BUDGETS_PATH = Path(__file__).parent / "premium_sample_budgets.json"
+PILOT_SAMPLES = 32
+PILOT_SCALE = 25  # percent of the final resolution
+PILOT_COLOR = "#808080"  # Neutral mid gray
+NOISE_REFERENCE = "glossy"  # Finish whose RENDER_SAMPLES output sets the noise target
+NOISE_TARGET = float(os.environ.get("PREVIEW_NOISE_TARGET", 0)) or None  # Fixed target instead of calibrating
+MIN_SAMPLES = 32
+MAX_SAMPLES = int(os.environ.get("PREVIEW_MAX_SAMPLES", RENDER_SAMPLES * 4))  # Bounds the noisiest finishes
+
+# Skip previews whose inputs are unchanged since the last render (see render_utils.RenderCache)
+RENDER_INDEX_FILE = "render-index.json"
+RENDER_CACHE_VERSION = 2  # Bump when material/scene code changes in ways not captured by the settings above
+FORCE_RENDER = os.environ.get("PREVIEW_FORCE_RENDER") == "1"
+
 # ============================================================
 # HELPER FUNCTIONS
 # ============================================================
 
-def hex_to_rgb(hex_color):
-    """Convert hex color to RGB tuple"""
-    hex_color = hex_color.lstrip('#')
-    return tuple(int(hex_color[i:i+2], 16) / 255.0 for i in (0, 2, 4))
-
-
-def setup_scene():
+def setup_scene(device_options=None):
     """Configure scene for premium quality rendering"""
     scene = bpy.context.scene
 
     scene.render.engine = 'CYCLES'
-    scene.cycles.device = 'GPU'
 
     scene.render.resolution_x = RENDER_WIDTH
     scene.render.resolution_y = RENDER_HEIGHT
     scene.cycles.samples = RENDER_SAMPLES
 
+    configure_render_device(scene, **(device_options or render_device_options()))
+
     if USE_DENOISE:
         scene.cycles.use_denoising = True
         scene.render.use_compositing = True
@@ -253,33 +157,13 @@ def setup_studio_lighting():
     bpy.ops.object.select_by_type(type='LIGHT')
     bpy.ops.object.delete()
 
-    # Key light (main)
-    bpy.ops.object.light_add(type='AREA', location=(4, -4, 5))
-    key_light = bpy.context.object
-    key_light.data.energy = 400
-    key_light.data.size = 4
-    key_light.rotation_euler = (math.radians(55), 0, math.radians(45))
-
-    # Fill light
-    bpy.ops.object.light_add(type='AREA', location=(-3, -3, 4))
-    fill_light = bpy.context.object
-    fill_light.data.energy = 200
-    fill_light.data.size = 5
-    fill_light.rotation_euler = (math.radians(55), 0, math.radians(-45))
-
-    # Rim light (for edge definition)
-    bpy.ops.object.light_add(type='AREA', location=(0, 4, 4))
-    rim_light = bpy.context.object
-    rim_light.data.energy = 250
-    rim_light.data.size = 3
-    rim_light.rotation_euler = (math.radians(25), 0, math.radians(180))
-
-    # Bottom fill (subtle)
-    bpy.ops.object.light_add(type='AREA', location=(0, 0, -2))
-    bottom_light = bpy.context.object
-    bottom_light.data.energy = 100
-    bottom_light.data.size = 6
-    bottom_light.rotation_euler = (math.radians(180), 0, 0)
+    for light in STUDIO_LIGHTS:
+        bpy.ops.object.light_add(type='AREA', location=light["location"])
+        light_obj = bpy.context.object
+        light_obj.name = light["name"]
+        light_obj.data.energy = light["energy"]
+        light_obj.data.size = light["size"]
+        light_obj.rotation_euler = tuple(math.radians(angle) for angle in light["rotation"])
 
     # HDRI-style environment
     world = bpy.context.scene.world
@@ -288,8 +172,8 @@ def setup_studio_lighting():
     nodes.clear()
 
     env_node = nodes.new(type='ShaderNodeBackground')
-    env_node.inputs['Strength'].default_value = 0.4
-    env_node.inputs['Color'].default_value = (0.95, 0.95, 1.0, 1.0)  # Slight cool tint
+    env_node.inputs['Strength'].default_value = WORLD_STRENGTH
+    env_node.inputs['Color'].default_value = WORLD_COLOR
 
     output_node = nodes.new(type='ShaderNodeOutputWorld')
     world.node_tree.links.new(env_node.outputs['Background'], output_node.inputs['Surface'])
@@ -303,13 +187,13 @@ def setup_camera():
         if obj.type == 'CAMERA':
             bpy.data.objects.remove(obj, do_unlink=True)
 
-    bpy.ops.object.camera_add(location=(0, -6, 1.8))
+    bpy.ops.object.camera_add(location=CAMERA["location"])
     camera = bpy.context.object
-    camera.rotation_euler = (math.radians(82), 0, 0)
+    camera.rotation_euler = tuple(math.radians(angle) for angle in CAMERA["rotation"])
 
     bpy.context.scene.camera = camera
-    camera.data.lens = 60
-    camera.data.sensor_width = 36
+    camera.data.lens = CAMERA["lens"]
+    camera.data.sensor_width = CAMERA["sensor_width"]
 
     print("✅ Camera positioned")
 
@@ -341,6 +225,29 @@ def create_carbon_fiber_texture():
 
 def create_premium_material(name, base_color_hex, finish_preset):
     """Create advanced Principled BSDF material with all features"""
+    mat = build_premium_material(name, finish_preset)
+    set_material_color(mat, base_color_hex)
+    return mat
+
+
+def set_material_color(mat, base_color_hex):
+    """Swap the base color (and iridescence ramp) of a preview material"""
+    nodes = mat.node_tree.nodes
+    color = hex_to_linear_rgba(base_color_hex)
+
+    nodes['Preview_BSDF'].inputs['Base Color'].default_value = color
+
+    color_ramp = nodes.get('Iridescence_Ramp')
+    if color_ramp:
+        color_ramp.color_ramp.elements[0].color = color
+        # Shift to complementary color
+        rgb = hex_to_rgb(base_color_hex)
+        shift_rgb = ((rgb[0] + 0.5) % 1.0, (rgb[1] + 0.3) % 1.0, (rgb[2] + 0.7) % 1.0)
+        color_ramp.color_ramp.elements[1].color = srgb_to_linear_rgba(shift_rgb)
+
+
+def build_premium_material(name, finish_preset):
+    """Build the finish node tree; the color is set separately by set_material_color"""
     mat = bpy.data.materials.new(name=name)
     mat.use_nodes = True
     nodes = mat.node_tree.nodes
@@ -349,32 +256,15 @@ def create_premium_material(name, base_color_hex, finish_preset):
 
     # Main shader
     bsdf = nodes.new(type='ShaderNodeBsdfPrincipled')
+    bsdf.name = 'Preview_BSDF'
     bsdf.location = (0, 0)
 
-    # Base color
-    rgb = hex_to_rgb(base_color_hex)
-    bsdf.inputs['Base Color'].default_value = (*rgb, 1.0)
-
-    # Apply finish properties
-    bsdf.inputs['Metallic'].default_value = finish_preset.get('metalness', 0.0)
-    bsdf.inputs['Roughness'].default_value = finish_preset.get('roughness', 0.5)
-    bsdf.inputs['Sheen Tint'].default_value = finish_preset.get('sheen', 0.0)
-    bsdf.inputs['Clearcoat'].default_value = finish_preset.get('clearcoat', 0.0)
-    bsdf.inputs['Clearcoat Roughness'].default_value = finish_preset.get('clearcoat_roughness', 0.03)
-    bsdf.inputs['Specular IOR Level'].default_value = finish_preset.get('specular', 0.5)
-
-    # Anisotropic (for brushed metals, pearl coat)
-    if 'anisotropic' in finish_preset:
-        bsdf.inputs['Anisotropic'].default_value = finish_preset['anisotropic']
-        if 'anisotropic_rotation' in finish_preset:
-            bsdf.inputs['Anisotropic Rotation'].default_value = finish_preset['anisotropic_rotation']
-
-    # Transmission (for frosted polycarbonate)
-    if 'transmission' in finish_preset:
-        bsdf.inputs['Transmission Weight'].default_value = finish_preset['transmission']
+    # Apply finish properties (coat, sheen, specular, anisotropy, transmission) in one pass
+    plan = finish_plan(finish_preset)
+    plan.apply(bsdf.inputs)
 
     # Carbon fiber texture
-    if finish_preset.get('has_texture'):
+    if plan.has_texture:
         # Add bump/normal map for carbon weave pattern
         tex_coord = nodes.new(type='ShaderNodeTexCoord')
         tex_coord.location = (-600, 0)
@@ -398,17 +288,14 @@ def create_premium_material(name, base_color_hex, finish_preset):
         links.new(bump.outputs['Normal'], bsdf.inputs['Normal'])
 
     # Iridescence simulation (for holographic)
-    if finish_preset.get('has_iridescence'):
+    if plan.has_iridescence:
         # Add layer weight for fresnel-based color shift
         layer_weight = nodes.new(type='ShaderNodeLayerWeight')
         layer_weight.location = (-400, -300)
 
         color_ramp = nodes.new(type='ShaderNodeValToRGB')
+        color_ramp.name = 'Iridescence_Ramp'
         color_ramp.location = (-200, -300)
-        color_ramp.color_ramp.elements[0].color = (*rgb, 1.0)
-        # Shift to complementary color
-        shift_rgb = ((rgb[0] + 0.5) % 1.0, (rgb[1] + 0.3) % 1.0, (rgb[2] + 0.7) % 1.0)
-        color_ramp.color_ramp.elements[1].color = (*shift_rgb, 1.0)
 
         links.new(layer_weight.outputs['Facing'], color_ramp.inputs['Fac'])
         links.new(color_ramp.outputs['Color'], bsdf.inputs['Base Color'])
@@ -421,6 +308,88 @@ def create_premium_material(name, base_color_hex, finish_preset):
     return mat
 
 
+def scene_digest(helmet_objects):
+    """Hash of everything besides finish and color that affects a preview image"""
+    return stable_hash(
+        RENDER_CACHE_VERSION,
+        {"width": RENDER_WIDTH, "height": RENDER_HEIGHT, "samples": RENDER_SAMPLES, "denoise": USE_DENOISE},
+        STUDIO_LIGHTS,
+        [WORLD_COLOR, WORLD_STRENGTH],
+        CAMERA,
+        hash_mesh_data(helmet_objects),
+    )
+
+
+def load_sample_budgets():
+    """Read stored per-finish sample budgets ({finish: {key, samples, pilotNoise}})"""
+    import json
+
+    if not SAMPLE_BUDGETS_PATH.exists():
+        return {}
+    with open(SAMPLE_BUDGETS_PATH) as f:
+        return json.load(f)
+
+
+def pilot_sample_budgets(helmet_objects, pool, finish_keys, base_digest):
+    """
+    Return {finish: samples}, piloting finishes whose stored pilot is missing or stale
+    A pilot's key covers the preset, pilot settings and scene, so edits re-pilot it. The
+    NOISE_REFERENCE finish is always piloted too, since it calibrates the noise target.
+    """
+    import json
+
+    budgets = load_sample_budgets()
+    scene = bpy.context.scene
+    piloted = 0
+    noises = {}
+
+    for finish_key in dict.fromkeys([NOISE_REFERENCE, *finish_keys]):
+        finish_data = FINISH_PRESETS[finish_key]
+        key = stable_hash(base_digest, finish_data, PILOT_SAMPLES, PILOT_SCALE, PILOT_COLOR)
+        stored = budgets.get(finish_key, {})
+
+        if stored.get("key") == key:
+            noises[finish_key] = stored["pilotNoise"]
+            continue
+
+        material = pool.get(finish_key, finish_data, PILOT_COLOR)
+        apply_material_to_objects(helmet_objects, material)
+
+        noises[finish_key] = measure_render_noise(scene, PILOT_SAMPLES, PILOT_SCALE)
+        budgets[finish_key] = {"key": key, "pilotNoise": round(noises[finish_key], 6)}
+        piloted += 1
+
+        print(f"🧪 {finish_data['name']}: pilot noise {noises[finish_key]:.4f}")
+
+    target = NOISE_TARGET or calibrate_noise_target(noises[NOISE_REFERENCE], PILOT_SAMPLES, RENDER_SAMPLES)
+    changed = piloted > 0
+
+    for finish_key, noise in noises.items():
+        needed = derive_sample_budget(noise, PILOT_SAMPLES, target, MIN_SAMPLES, math.inf)
+        samples = min(needed, MAX_SAMPLES)
+        if needed > MAX_SAMPLES:
+            capped_noise = noise * math.sqrt(PILOT_SAMPLES / MAX_SAMPLES)
+            print(
+                f"⚠️ {FINISH_PRESETS[finish_key]['name']}: needs ~{needed} samples, capped at "
+                f"MAX_SAMPLES={MAX_SAMPLES} (noise ~{capped_noise:.4f} vs target {target:.4f})"
+            )
+        budget = budgets[finish_key]
+        if budget.get("samples") != samples or budget.get("noiseTarget") != round(target, 6):
+            budget.update(samples=samples, noiseTarget=round(target, 6))
+            changed = True
+
+    source = "fixed" if NOISE_TARGET else f"{NOISE_REFERENCE} at {RENDER_SAMPLES} samples"
+    print(f"🧪 Noise target {target:.4f} ({source})")
+
+    if changed:
+        tmp_path = SAMPLE_BUDGETS_PATH.with_suffix(".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(budgets, f, indent=2)
+        tmp_path.replace(SAMPLE_BUDGETS_PATH)
+
+    return {finish_key: budgets[finish_key]["samples"] for finish_key in finish_keys}
+
+
 def apply_material_to_objects(objects, material):
     """Apply material to objects"""
     for obj in objects:
@@ -439,17 +408,125 @@ def render_preview(output_path):
     print(f"✅ Rendered: {output_path}")
 
 
+def tier_file_name(finish_key, color_name, tier):
+    """Preview file name for a tier; the final tier has no size suffix"""
+    if tier["tier"] == "final":
+        return f"{finish_key}_{color_name}.png"
+    return f"{finish_key}_{color_name}@{tier['size']}.png"
+
+
+def tier_samples(tier, sample_budget):
+    """Samples for a tier, never more than the finish's budget"""
+    if tier["samples"] is None:
+        return sample_budget
+    return min(tier["samples"], sample_budget)
+
+
+def set_tier_resolution(tier):
+    """Render size for a tier, keeping the final aspect ratio"""
+    scene = bpy.context.scene
+    scene.render.resolution_x = tier["size"]
+    scene.render.resolution_y = round(tier["size"] * RENDER_HEIGHT / RENDER_WIDTH)
+
+
+def select_tiers(names):
+    """PREVIEW_TIERS entries named in `names` (comma separated), in tier order"""
+    selected = {name.strip() for name in names.split(",") if name.strip()}
+    unknown = selected - {tier["tier"] for tier in PREVIEW_TIERS}
+    if unknown:
+        raise ValueError(f"Unknown preview tier(s): {', '.join(sorted(unknown))}")
+    return [tier for tier in PREVIEW_TIERS if tier["tier"] in selected]
+
+
+def setup_turntable_mode(angles):
+    """Switch the scene to turntable frames: smaller resolution, camera orbiting the helmet"""
+    scene = bpy.context.scene
+    scene.render.resolution_x = TURNTABLE_SIZE
+    scene.render.resolution_y = TURNTABLE_SIZE
+    setup_turntable(scene, scene.camera, angles, TURNTABLE_CENTER)
+    print(f"✅ Turntable: {angles} angles at {TURNTABLE_SIZE}x{TURNTABLE_SIZE}")
+
+
+def turntable_paths(finish_key, color_name):
+    """(sprite sheet, frame directory) of a turntable; names differ from the stills for the render index"""
+    return (
+        TURNTABLE_DIR / f"{finish_key}_{color_name}_turntable.png",
+        TURNTABLE_DIR / f"{finish_key}_{color_name}",
+    )
+
+
+def render_turntable_preview(sprite_path, frame_dir):
+    """Render all turntable frames for the applied material, then pack them into `sprite_path`"""
+    print(f"🎨 Rendering turntable {frame_dir.name}...")
+    frame_paths = render_turntable(bpy.context.scene, frame_dir)
+    layout = build_sprite_sheet(frame_paths, sprite_path)
+    print(f"✅ Rendered: {sprite_path} ({layout['columns']}x{layout['rows']} frames)")
+
+
+def turntable_manifest_entry(finish_key, color_name, angles):
+    """Manifest entry for one turntable; the layout matches build_sprite_sheet"""
+    columns, rows = sprite_sheet_layout(angles)
+    base_url = f"/material-previews/turntables/{finish_key}_{color_name}"
+    return {
+        "sprite": f"{base_url}_turntable.png",
+        "frames": [f"{base_url}/frame_{frame:04d}.png" for frame in range(1, angles + 1)],
+        "columns": columns,
+        "rows": rows,
+        "frameWidth": TURNTABLE_SIZE,
+        "frameHeight": TURNTABLE_SIZE,
+    }
+
+
 # ============================================================
 # MAIN
 # ============================================================
 
-def render_all_premium_previews():
-    """Render all premium material previews"""
+def preview_jobs(shard_index=0, shard_count=1):
+    """
+    Flattened finish × color matrix, optionally restricted to one shard
+    Shards take every `shard_count`-th job so expensive finishes are spread across workers
+    """
+    jobs = [
+        (finish_key, finish_data, color_hex, color_name, color_label)
+        for finish_key, finish_data in FINISH_PRESETS.items()
+        for color_hex, color_name, color_label in PREVIEW_COLORS
+    ]
+    return jobs[shard_index::shard_count]
+
+
+def render_all_premium_previews(shard_index=0, shard_count=1, work_dir=None, device_options=None,
+                                pilot_only=False, turntable_angles=0, tiers=None):
+    """
+    Render all premium material previews
+
+    Args:
+        shard_index, shard_count: Render only this worker's share of the matrix
+        work_dir: Shard working directory (see render_previews_parallel.py). When set,
+            the render index, a partial manifest (after every tier) and a result summary
+            are written there instead of updating OUTPUT_DIR directly.
+        device_options: See render_utils.render_device_options (defaults from environment)
+        pilot_only: Only refresh the per-finish sample budgets, render no previews
+        turntable_angles: Render turntable sprite sheets with this many angles instead of stills
+        tiers: PREVIEW_TIERS entries to render breadth-first (default: ENABLED_TIERS).
+            Turntables are rendered at their own size only.
+
+    Returns:
+        Run summary (renders, cache and pool stats, timings), or None when nothing
+        was rendered (no helmet objects, pilot_only)
+    """
+    import json
+    import time
+
     print("=" * 70)
     print("PREMIUM HELMET MATERIAL PREVIEW RENDERER")
+    if shard_count > 1:
+        print(f"Shard {shard_index + 1}/{shard_count}")
     print("=" * 70)
 
-    setup_scene()
+    started = time.perf_counter()
+
+    device_options = device_options or render_device_options()
+    setup_scene(device_options)
     setup_studio_lighting()
     setup_camera()
 
@@ -458,40 +535,176 @@ def render_all_premium_previews():
         print("❌ No helmet objects found!")
         return
 
+    if device_options["calibrate"]:
+        calibrate_render_device(bpy.context.scene, device_options["threads"])
+
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-    total_renders = len(FINISH_PRESETS) * len(PREVIEW_COLORS)
+    jobs = preview_jobs(shard_index, shard_count)
+    if turntable_angles:
+        tiers = [None]
+    elif tiers is None:
+        tiers = select_tiers(ENABLED_TIERS)
+    total_renders = len(jobs) * len(tiers)
+
+    pool = MaterialPool(
+        build=lambda key, data: build_premium_material(f"Preview_{key}", data),
+        recolor=set_material_color,
+        capacity=MATERIAL_POOL_SIZE,
+    )
+    applied_material = None
+
+    if work_dir:
+        work_dir = Path(work_dir)
+        cache = RenderCache(
+            work_dir / f"render-index.{shard_index}.json",
+            force=FORCE_RENDER,
+            seed_paths=[OUTPUT_DIR / RENDER_INDEX_FILE],
+        )
+    else:
+        cache = RenderCache(OUTPUT_DIR / RENDER_INDEX_FILE, force=FORCE_RENDER)
+    base_digest = scene_digest(helmet_objects)
+
+    finish_keys = list(dict.fromkeys(job[0] for job in jobs))
+    if ADAPTIVE_SAMPLES or pilot_only:
+        sample_budgets = pilot_sample_budgets(helmet_objects, pool, finish_keys, base_digest)
+    else:
+        sample_budgets = {finish_key: RENDER_SAMPLES for finish_key in finish_keys}
+
+    if pilot_only:
+        pool.clear()
+        print(f"✅ Sample budgets: {sample_budgets}")
+        return
+
+    if turntable_angles:
+        setup_turntable_mode(turntable_angles)
+        turntable = {"angles": turntable_angles, "size": TURNTABLE_SIZE, "center": TURNTABLE_CENTER}
+
+    render_seconds = 0.0
+    fixed_budget_seconds = 0.0  # Estimated time at RENDER_SAMPLES for the same renders
     current = 0
 
-    for finish_key, finish_data in FINISH_PRESETS.items():
-        print(f"\n{'='*70}")
-        print(f"Rendering {finish_data['name']}...")
-        print(f"{'='*70}")
+    for tier in tiers:
+        if tier:
+            set_tier_resolution(tier)
+            print(f"\n{'#'*70}")
+            print(f"Tier: {tier['tier']} ({tier['size']}px)")
+            print(f"{'#'*70}")
 
-        for color_hex, color_name, color_label in PREVIEW_COLORS:
+        current_finish = None
+        tier_rendered = 0
+        for finish_key, finish_data, color_hex, color_name, color_label in jobs:
             current += 1
-            print(f"\n[{current}/{total_renders}] {finish_data['name']} - {color_label}")
-
-            mat_name = f"Preview_{finish_key}_{color_name}"
-            material = create_premium_material(mat_name, color_hex, finish_data)
-            apply_material_to_objects(helmet_objects, material)
+            if finish_key != current_finish:
+                current_finish = finish_key
+                print(f"\n{'='*70}")
+                print(f"Rendering {finish_data['name']}...")
+                print(f"{'='*70}")
+
+            samples = sample_budgets[finish_key]
+            if turntable_angles:
+                output_file, frame_dir = turntable_paths(finish_key, color_name)
+                digest = stable_hash(base_digest, finish_key, finish_data, color_hex, samples, turntable)
+            else:
+                samples = tier_samples(tier, samples)
+                output_file = OUTPUT_DIR / tier_file_name(finish_key, color_name, tier)
+                digest = stable_hash(base_digest, finish_key, finish_data, color_hex, samples)
+                if tier["tier"] != "final":
+                    digest = stable_hash(digest, tier)
+
+            if cache.is_fresh(output_file, digest):
+                print(f"[{current}/{total_renders}] ⏭️ {output_file.name} unchanged")
+                continue
 
-            output_file = OUTPUT_DIR / f"{finish_key}_{color_name}.png"
-            render_preview(output_file)
+            print(f"\n[{current}/{total_renders}] {finish_data['name']} - {color_label}")
 
-            bpy.data.materials.remove(material)
+            material = pool.get(finish_key, finish_data, color_hex)
+            if material is not applied_material:
+                apply_material_to_objects(helmet_objects, material)
+                applied_material = material
+
+            bpy.context.scene.cycles.samples = samples
+
+            render_started = time.perf_counter()
+            if turntable_angles:
+                render_turntable_preview(output_file, frame_dir)
+            else:
+                render_preview(output_file)
+            seconds = time.perf_counter() - render_started
+            render_seconds += seconds
+            # Lower tiers are extra work with no fixed-sample equivalent
+            if tier is None or tier["tier"] == "final":
+                fixed_budget_seconds += seconds * RENDER_SAMPLES / samples
+            else:
+                fixed_budget_seconds += seconds
+            cache.record(output_file, digest)
+            tier_rendered += 1
+
+        # Publish each tier as soon as it is complete (the driver merges shard manifests as they change);
+        # unchanged manifests are not rewritten
+        if work_dir:
+            generate_manifest(jobs, work_dir / f"manifest.{shard_index}.json", sample_budgets, turntable_angles)
+        else:
+            changed = generate_manifest(sample_budgets=sample_budgets, turntable_angles=turntable_angles)
+            # Atlases only depend on the thumbnails and the colors listed per finish
+            if tier and tier["tier"] == ATLAS_TIER and (tier_rendered or changed):
+                pack_preview_atlases()
+
+    pool.clear()
 
     print("\n" + "=" * 70)
     print("✅ ALL PREMIUM PREVIEWS RENDERED!")
     print(f"📁 {OUTPUT_DIR}")
+    print(f"♻️ Material pool: {pool.stats()}")
+    print(f"⏭️ Render cache: {cache.stats()}")
+    if render_seconds:
+        difference = fixed_budget_seconds - render_seconds
+        print(
+            f"⏱️ Sample budgets: {render_seconds:.1f}s rendering vs ~{fixed_budget_seconds:.1f}s "
+            f"at a fixed {RENDER_SAMPLES} samples ({'saved' if difference >= 0 else 'spent'} ~{abs(difference):.1f}s)"
+        )
     print("=" * 70)
 
-    generate_manifest()
+    result = {
+        "shard": shard_index,
+        "shardCount": shard_count,
+        "jobs": total_renders,
+        **cache.stats(),
+        "pool": pool.stats(),
+        "renderSeconds": round(render_seconds, 3),
+        "fixedBudgetSeconds": round(fixed_budget_seconds, 3),
+        "elapsedSeconds": round(time.perf_counter() - started, 3),
+    }
+    if work_dir:
+        with open(work_dir / f"result.{shard_index}.json", 'w') as f:
+            json.dump(result, f, indent=2)
+    return result
+
+
+def generate_manifest(jobs=None, manifest_path=None, sample_budgets=None, turntable_angles=0):
+    """
+    Generate JSON manifest (limited to `jobs` when rendering a shard)
+    Turntables listed in the existing manifest are kept, so still and turntable
+    runs can alternate without dropping each other's entries. Encoded variants
+    (encode_previews.py) are kept while they were made from the current preview URL,
+    and atlases until pack_preview_atlases repacks them.
+    Returns True when the manifest changed (an identical one is not rewritten).
+    """
+    import json
 
+    if jobs is None:
+        jobs = preview_jobs()
+    sample_budgets = sample_budgets or {}
 
-def generate_manifest():
-    """Generate JSON manifest"""
-    import json
+    existing_path = OUTPUT_DIR / "manifest.json"
+    existing = {}
+    if existing_path.exists():
+        try:
+            with open(existing_path) as f:
+                existing = json.load(f)
+        except ValueError:
+            print(f"⚠️ Ignoring unreadable manifest: {existing_path}")
+    existing_finishes = existing.get("finishes", {})
 
     manifest = {
         "finishes": {},
@@ -503,25 +716,165 @@ def generate_manifest():
             "width": RENDER_WIDTH,
             "height": RENDER_HEIGHT,
             "samples": RENDER_SAMPLES,
+            "tiers": [
+                {"tier": tier["tier"], "width": tier["size"], "samples": tier["samples"]}
+                for tier in PREVIEW_TIERS
+            ],
         }
     }
 
+    # Every finish is listed (in preset order) even if a shard has none of its previews
     for finish_key, finish_data in FINISH_PRESETS.items():
         manifest["finishes"][finish_key] = {
             "name": finish_data["name"],
             "description": finish_data["description"],
-            "previews": {
-                color_name: f"/material-previews/{finish_key}_{color_name}.png"
-                for _, color_name, _ in PREVIEW_COLORS
-            }
+            "samples": sample_budgets.get(finish_key, RENDER_SAMPLES),
+            "previews": {},
+            "tiers": {},
+            "turntables": dict(existing_finishes.get(finish_key, {}).get("turntables", {})),
         }
 
-    manifest_path = OUTPUT_DIR / "manifest.json"
-    with open(manifest_path, 'w') as f:
+    for finish_key, _, _, color_name, _ in jobs:
+        finish = manifest["finishes"][finish_key]
+        finish["previews"][color_name] = f"/material-previews/{finish_key}_{color_name}.png"
+
+        # Tiers rendered so far, lowest first; the preview URL is upgraded in place to the best one
+        tiers = []
+        for tier in PREVIEW_TIERS:
+            file_name = tier_file_name(finish_key, color_name, tier)
+            if (OUTPUT_DIR / file_name).exists():
+                tiers.append({
+                    "tier": tier["tier"],
+                    "url": f"/material-previews/{file_name}",
+                    "width": tier["size"],
+                    "samples": tier_samples(tier, finish["samples"]),
+                })
+        if tiers:
+            finish["tiers"][color_name] = tiers
+            finish["previews"][color_name] = tiers[-1]["url"]
+        if turntable_angles:
+            manifest["finishes"][finish_key]["turntables"][color_name] = turntable_manifest_entry(
+                finish_key, color_name, turntable_angles,
+            )
+
+    for finish_key, finish in manifest["finishes"].items():
+        encoded = existing_finishes.get(finish_key, {}).get("encoded", {})
+        finish["encoded"] = {
+            color_name: entry for color_name, entry in encoded.items()
+            if finish["previews"].get(color_name) == entry.get("source")
+        }
+        if "atlas" in existing_finishes.get(finish_key, {}):
+            finish["atlas"] = existing_finishes[finish_key]["atlas"]
+    if "encoding" in existing:
+        manifest["encoding"] = existing["encoding"]
+
+    manifest_path = Path(manifest_path or existing_path)
+    if manifest_path == existing_path:
+        previous = existing
+    else:
+        try:
+            previous = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+        except ValueError:
+            previous = {}
+    if manifest == previous:
+        print(f"⏭️ Manifest unchanged: {manifest_path}")
+        return False
+
+    # Written atomically: the parallel driver reads shard manifests while workers run
+    tmp_path = manifest_path.with_suffix(".tmp")
+    with open(tmp_path, 'w') as f:
         json.dump(manifest, f, indent=2)
+    tmp_path.replace(manifest_path)
 
     print(f"✅ Manifest: {manifest_path}")
+    return True
+
+
+def pack_preview_atlases(manifest_path=None):
+    """
+    Pack each finish's thumbnails into atlases and record them in the manifest as
+    finishes.<finish>.atlas: {"pages": [{url, width, height}], "rects": {color: rect}}
+    Colors without a thumbnail yet are left out; see render_utils.pack_atlas for rects.
+    """
+    import json
+    import time
+
+    started = time.perf_counter()
+    manifest_path = manifest_path or OUTPUT_DIR / "manifest.json"
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    tier = next(tier for tier in PREVIEW_TIERS if tier["tier"] == ATLAS_TIER)
+    packed = 0
+
+    for finish_key, finish in manifest["finishes"].items():
+        thumbnails = {
+            color_name: OUTPUT_DIR / tier_file_name(finish_key, color_name, tier)
+            for color_name in finish["previews"]
+        }
+        thumbnails = {color_name: path for color_name, path in thumbnails.items() if path.exists()}
+        if not thumbnails:
+            finish.pop("atlas", None)
+            continue
+
+        atlas = pack_atlas(list(thumbnails.values()), ATLAS_DIR, finish_key, ATLAS_MAX_SIZE, ATLAS_PADDING)
+        finish["atlas"] = {
+            "pages": [
+                {"url": f"/material-previews/atlases/{page['file']}", "width": page["width"], "height": page["height"]}
+                for page in atlas["pages"]
+            ],
+            "rects": dict(zip(thumbnails, atlas["rects"])),
+        }
+        packed += len(thumbnails)
+
+    tmp_path = manifest_path.with_suffix(".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    tmp_path.replace(manifest_path)
+
+    print(f"✅ Atlases: {packed} thumbnail(s) packed in {time.perf_counter() - started:.2f}s")
+
+
+def parse_script_args():
+    """Parse arguments passed after `--` on the Blender command line"""
+    import argparse
+
+    argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    parser = argparse.ArgumentParser(prog="render_premium_material_previews.py")
+    parser.add_argument("--shard", default="1/1", help="Worker shard as INDEX/COUNT (1-based), e.g. 2/4")
+    parser.add_argument("--work-dir", help="Shard working directory used by render_previews_parallel.py")
+    parser.add_argument("--device", choices=["auto", "cpu", "gpu"], help="Render device (default: PREVIEW_RENDER_DEVICE or auto)")
+    parser.add_argument("--threads", type=int, help="CPU render threads (default: all cores)")
+    parser.add_argument("--tile-size", type=int, help="CPU tile size (default: single tile for small frames)")
+    parser.add_argument("--calibrate", action="store_true", default=None, help="Pick device settings from a quick test render")
+    parser.add_argument("--pilot-only", action="store_true", help="Only refresh per-finish sample budgets")
+    parser.add_argument(
+        "--turntable", type=int, default=TURNTABLE_ANGLES, metavar="ANGLES",
+        help=f"Render {TURNTABLE_MIN_ANGLES}-{TURNTABLE_MAX_ANGLES} angle turntable sprite sheets instead of stills",
+    )
+    parser.add_argument("--atlas-only", action="store_true", help="Only repack thumbnail atlases from manifest.json")
+    parser.add_argument("--tiers", default=ENABLED_TIERS, help="Comma-separated preview tiers to render (thumbnail,mid,final)")
+    args = parser.parse_args(argv)
+
+    try:
+        args.tiers = select_tiers(args.tiers)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.turntable and not TURNTABLE_MIN_ANGLES <= args.turntable <= TURNTABLE_MAX_ANGLES:
+        parser.error(f"--turntable must be between {TURNTABLE_MIN_ANGLES} and {TURNTABLE_MAX_ANGLES}")
+
+    index, count = (int(part) for part in args.shard.split("/"))
+    args.shard_index, args.shard_count = index - 1, count
+    args.device_options = render_device_options(args.device, args.threads, args.tile_size, args.calibrate)
+    return args
 
 
 if __name__ == "__main__":
-    render_all_premium_previews()
+    args = parse_script_args()
+    if args.atlas_only:
+        pack_preview_atlases()
+    else:
+        render_all_premium_previews(
+            args.shard_index, args.shard_count, args.work_dir, args.device_options, args.pilot_only,
+            args.turntable, args.tiers,
+        )
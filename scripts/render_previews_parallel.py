@@ -0,0 +1,357 @@
+"""
+Parallel Premium Preview Renderer
+Splits the finish × color matrix of render_premium_material_previews.py across
+several headless Blender processes and merges their results into one manifest
+
+Each worker renders every N-th preview with a bounded render thread count. Shard
+render indexes, partial manifests, results and logs go to OUTPUT_DIR/.shards.
+Workers rewrite their manifest after every tier and the driver merges it into the
+published manifest right away, so every shard's thumbnails are live before the
+full-size tier finishes. Atlases are packed once all workers are done. An
+interrupted run resumes where it stopped: leftover shard indexes are merged first,
+so workers skip finished previews.
+
+Usage:
+    python3 scripts/render_previews_parallel.py helmet.blend --workers 4 --threads 4
+
+    # Ignore the render cache and re-render everything
+    python3 scripts/render_previews_parallel.py helmet.blend --workers 4 --force
+
+    # Encode WebP/AVIF responsive variants once the manifest is merged
+    python3 scripts/render_previews_parallel.py helmet.blend --workers 4 --encode
+
+    # 24-angle turntable sprite sheets instead of stills
+    python3 scripts/render_previews_parallel.py helmet.blend --workers 4 --turntable 24
+
+Environment:
+    BLENDER_EXECUTABLE  Blender binary (default: `blender` on PATH)
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+SCRIPT_DIR = Path(__file__).parent
+RENDER_SCRIPT = SCRIPT_DIR / "render_premium_material_previews.py"
+ENCODE_SCRIPT = SCRIPT_DIR / "encode_previews.py"
+OUTPUT_DIR = SCRIPT_DIR.parent / "public" / "material-previews"
+WORK_DIR = OUTPUT_DIR / ".shards"
+
+RENDER_INDEX_FILE = "render-index.json"
+MERGED_ENTRIES = ("previews", "tiers", "turntables", "encoded")  # Per-color manifest entries
+POLL_SECONDS = 2.0  # How often running workers are checked for finished tiers
+BLENDER = os.environ.get("BLENDER_EXECUTABLE", "blender")
+
+# ============================================================
+# MERGING
+# ============================================================
+
+def read_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_json(path, data):
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    tmp_path.replace(path)
+
+
+def merge_shard_indexes():
+    """Fold shard render indexes into the main render index; returns merged entry count"""
+    index_path = OUTPUT_DIR / RENDER_INDEX_FILE
+    entries = read_json(index_path).get("entries", {}) if index_path.exists() else {}
+    merged = 0
+
+    for shard_index_path in sorted(WORK_DIR.glob("render-index.*.json")):
+        try:
+            shard_entries = read_json(shard_index_path).get("entries", {})
+        except ValueError:
+            print(f"⚠️ Skipping unreadable shard index: {shard_index_path.name}")
+            continue
+
+        for name, digest in shard_entries.items():
+            if entries.get(name) != digest:
+                entries[name] = digest
+                merged += 1
+
+    if merged:
+        OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+        write_json(index_path, {"entries": entries})
+    return merged
+
+
+def merge_manifests(shard_count, partial=False):
+    """
+    Combine the shard manifests into OUTPUT_DIR/manifest.json; returns its path
+    With `partial` (workers still running), shards without a manifest yet are skipped
+    and the entries they have not replaced stay as published, so previews never
+    disappear mid-run. Returns None when there is nothing to merge yet.
+    """
+    manifest_path = OUTPUT_DIR / "manifest.json"
+    shard_manifests = [
+        read_json(WORK_DIR / f"manifest.{shard_index}.json")
+        for shard_index in range(shard_count)
+        if not partial or (WORK_DIR / f"manifest.{shard_index}.json").exists()
+    ]
+    if not shard_manifests:
+        return None
+
+    published = {}
+    if partial and manifest_path.exists():
+        try:
+            published = read_json(manifest_path).get("finishes", {})
+        except ValueError:
+            print(f"⚠️ Ignoring unreadable manifest: {manifest_path}")
+
+    manifest = {**shard_manifests[0], "finishes": {}}
+    for finish_key, finish in shard_manifests[0]["finishes"].items():
+        previous = published.get(finish_key, {})
+        manifest["finishes"][finish_key] = {
+            **finish,
+            **{key: dict(previous.get(key, {})) for key in MERGED_ENTRIES},
+        }
+        if "atlas" in previous:
+            manifest["finishes"][finish_key]["atlas"] = previous["atlas"]  # Repacked after the last merge
+
+    for shard_manifest in shard_manifests:
+        for finish_key, finish in shard_manifest["finishes"].items():
+            for key in MERGED_ENTRIES:
+                manifest["finishes"][finish_key][key].update(finish[key])
+
+    # Keep previews in palette order regardless of which shard rendered them
+    color_order = [color["name"] for color in manifest["colors"]]
+    for finish in manifest["finishes"].values():
+        for key in MERGED_ENTRIES:
+            entries = finish[key]
+            finish[key] = {name: entries[name] for name in color_order if name in entries}
+
+    write_json(manifest_path, manifest)
+    return manifest_path
+
+
+def publish_progress(shard_count, seen):
+    """
+    Merge shard indexes and manifests written since the last call (`seen` maps shard
+    manifest paths to their modification times); returns True when it published
+    """
+    changed = False
+    for path in WORK_DIR.glob("manifest.*.json"):
+        modified = path.stat().st_mtime_ns
+        if seen.get(path) != modified:
+            seen[path] = modified
+            changed = True
+
+    if changed:
+        merge_shard_indexes()
+        merge_manifests(shard_count, partial=True)
+    return changed
+
+
+# ============================================================
+# WORKERS
+# ============================================================
+
+def launch_worker(blend_file, shard_index, shard_count, threads, env, turntable_angles=0):
+    """Start one headless Blender rendering a single shard"""
+    log_path = WORK_DIR / f"worker-{shard_index}.log"
+    command = [
+        BLENDER, str(blend_file),
+        "--background",
+        "--threads", str(threads),
+        "--python-exit-code", "1",
+        "--python", str(RENDER_SCRIPT),
+        "--",
+        "--shard", f"{shard_index + 1}/{shard_count}",
+        "--work-dir", str(WORK_DIR),
+        "--threads", str(threads),
+    ]
+    if turntable_angles:
+        command += ["--turntable", str(turntable_angles)]
+
+    log_file = open(log_path, "w")
+    process = subprocess.Popen(command, stdout=log_file, stderr=subprocess.STDOUT, env=env)
+    return process, log_file, log_path
+
+
+def run_pilot(blend_file, threads, env):
+    """Refresh per-finish sample budgets once, before the workers read them"""
+    log_path = WORK_DIR / "pilot.log"
+    command = [
+        BLENDER, str(blend_file),
+        "--background",
+        "--threads", str(threads),
+        "--python-exit-code", "1",
+        "--python", str(RENDER_SCRIPT),
+        "--",
+        "--pilot-only",
+        "--threads", str(threads),
+    ]
+
+    with open(log_path, "w") as log_file:
+        return_code = subprocess.call(command, stdout=log_file, stderr=subprocess.STDOUT, env=env)
+
+    if return_code != 0:
+        print(f"❌ Sample budget pilot failed (exit {return_code}), see {log_path}")
+    return return_code == 0
+
+
+def run_atlas_pass(env):
+    """Pack thumbnail atlases for the merged manifest (shards only see part of each finish)"""
+    log_path = WORK_DIR / "atlas.log"
+    command = [
+        BLENDER,
+        "--background",
+        "--python-exit-code", "1",
+        "--python", str(RENDER_SCRIPT),
+        "--",
+        "--atlas-only",
+    ]
+
+    with open(log_path, "w") as log_file:
+        return_code = subprocess.call(command, stdout=log_file, stderr=subprocess.STDOUT, env=env)
+
+    if return_code != 0:
+        print(f"❌ Atlas packing failed (exit {return_code}), see {log_path}")
+    return return_code == 0
+
+
+def report_workers(shard_count, wall_seconds):
+    """Print per-worker throughput from the shard result files"""
+    total_rendered = 0
+    render_seconds = 0.0
+    fixed_budget_seconds = 0.0
+
+    print(f"\n{'Worker':<8}{'Rendered':>10}{'Skipped':>10}{'Render s':>12}{'Elapsed s':>12}{'Renders/min':>14}")
+    for shard_index in range(shard_count):
+        result_path = WORK_DIR / f"result.{shard_index}.json"
+        if not result_path.exists():
+            print(f"{shard_index + 1:<8}{'(no result)':>10}")
+            continue
+
+        result = read_json(result_path)
+        rendered = result["rendered"]
+        per_minute = rendered / result["renderSeconds"] * 60 if result["renderSeconds"] else 0.0
+        total_rendered += rendered
+        render_seconds += result["renderSeconds"]
+        fixed_budget_seconds += result.get("fixedBudgetSeconds", result["renderSeconds"])
+
+        print(
+            f"{shard_index + 1:<8}{rendered:>10}{result['skipped']:>10}"
+            f"{result['renderSeconds']:>12.1f}{result['elapsedSeconds']:>12.1f}{per_minute:>14.2f}"
+        )
+
+    overall = total_rendered / wall_seconds * 60 if wall_seconds else 0.0
+    print(f"\n⏱️ {total_rendered} render(s) in {wall_seconds:.1f}s wall time ({overall:.2f} renders/min overall)")
+    if fixed_budget_seconds > render_seconds:
+        print(f"⏱️ Sample budgets saved ~{fixed_budget_seconds - render_seconds:.1f}s of render time")
+
+
+# ============================================================
+# MAIN
+# ============================================================
+
+def main():
+    cpu_count = os.cpu_count() or 1
+
+    parser = argparse.ArgumentParser(description="Render premium previews with parallel headless Blender workers")
+    parser.add_argument("blend_file", type=Path, help=".blend file containing the helmet")
+    parser.add_argument("--workers", type=int, default=max(1, cpu_count // 4), help="Number of Blender processes")
+    parser.add_argument("--threads", type=int, default=0, help="Render threads per worker (default: cores / workers)")
+    parser.add_argument("--force", action="store_true", help="Re-render previews even if unchanged")
+    parser.add_argument("--encode", action="store_true", help="Run encode_previews.py on the merged output")
+    parser.add_argument("--turntable", type=int, default=0, metavar="ANGLES", help="Render turntable sprite sheets with this many angles")
+    args = parser.parse_args()
+
+    workers = max(1, args.workers)
+    threads = args.threads or max(1, cpu_count // workers)
+
+    if not args.blend_file.exists():
+        print(f"❌ Blend file not found: {args.blend_file}")
+        return 1
+
+    WORK_DIR.mkdir(parents=True, exist_ok=True)
+
+    # Resume: keep progress recorded by an interrupted run
+    resumed = merge_shard_indexes()
+    if resumed:
+        print(f"♻️ Resuming: merged {resumed} render index entr(ies) from a previous run")
+    for stale in WORK_DIR.glob("*.json"):
+        stale.unlink()
+
+    env = dict(os.environ)
+    if args.force:
+        env["PREVIEW_FORCE_RENDER"] = "1"
+
+    print("=" * 70)
+    print(f"PARALLEL PREVIEW RENDER: {workers} worker(s) × {threads} thread(s)")
+    print("=" * 70)
+
+    started = time.perf_counter()
+
+    if env.get("PREVIEW_ADAPTIVE_SAMPLES", "1") == "1" and not run_pilot(args.blend_file, cpu_count, env):
+        return 1
+
+    running = [
+        (shard_index, *launch_worker(args.blend_file, shard_index, workers, threads, env, args.turntable))
+        for shard_index in range(workers)
+    ]
+
+    failed = []
+    seen = {}
+    while running:
+        time.sleep(POLL_SECONDS)
+        if publish_progress(workers, seen):
+            print(f"📤 Published progress ({time.perf_counter() - started:.0f}s)")
+
+        for worker in list(running):
+            shard_index, process, log_file, log_path = worker
+            return_code = process.poll()
+            if return_code is None:
+                continue
+            running.remove(worker)
+            log_file.close()
+
+            if return_code == 0 and (WORK_DIR / f"result.{shard_index}.json").exists():
+                print(f"✅ Worker {shard_index + 1} finished")
+            else:
+                print(f"❌ Worker {shard_index + 1} failed (exit {return_code}), see {log_path}")
+                failed.append(shard_index)
+
+    wall_seconds = time.perf_counter() - started
+    report_workers(workers, wall_seconds)
+
+    merge_shard_indexes()
+    publish_progress(workers, seen)
+
+    if failed:
+        print(f"\n⚠️ {len(failed)} worker(s) failed; re-run to resume. Logs kept in {WORK_DIR}")
+        return 1
+
+    manifest_path = merge_manifests(workers)
+    if not run_atlas_pass(env):
+        return 1
+    shutil.rmtree(WORK_DIR)
+
+    print(f"✅ Manifest: {manifest_path}")
+
+    if args.encode:
+        encode_command = [sys.executable, str(ENCODE_SCRIPT), str(OUTPUT_DIR)]
+        if subprocess.call(encode_command) != 0:
+            print("❌ Encoding failed")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
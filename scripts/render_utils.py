@@ -0,0 +1,650 @@
+"""
+Shared Helpers for the Material Preview Renderers
+Used by render_material_previews.py and render_premium_material_previews.py
+
+Usage:
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent))
+    from render_utils import MaterialPool, RenderCache, configure_render_device
+"""
+
+import bpy
+import array
+import hashlib
+import json
+import math
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np  # Bundled with Blender
+
+# ============================================================
+# MATERIAL POOL
+# ============================================================
+
+class MaterialPool:
+    """
+    Reuses one node-tree material per finish across preview colors
+    Only the base color is swapped per render; the least recently used
+    finish material is removed once more than `capacity` are resident.
+
+    Args:
+        build: build(finish_key, finish_data) -> bpy.types.Material
+        recolor: recolor(material, color_hex) -> None
+        capacity: Maximum number of finish materials kept alive
+    """
+
+    def __init__(self, build, recolor, capacity=4):
+        self.build = build
+        self.recolor = recolor
+        self.capacity = max(1, capacity)
+        self.materials = OrderedDict()
+        self.colors = {}
+        self.builds = 0
+        self.hits = 0
+
+    def get(self, finish_key, finish_data, color_hex):
+        """Return the finish material set to `color_hex`"""
+        material = self.materials.get(finish_key)
+
+        if material is None:
+            material = self.build(finish_key, finish_data)
+            self.materials[finish_key] = material
+            self.builds += 1
+            self._evict()
+        else:
+            self.materials.move_to_end(finish_key)
+            self.hits += 1
+
+        if self.colors.get(finish_key) != color_hex:
+            self.recolor(material, color_hex)
+            self.colors[finish_key] = color_hex
+
+        return material
+
+    def _evict(self):
+        while len(self.materials) > self.capacity:
+            finish_key, material = self.materials.popitem(last=False)
+            self.colors.pop(finish_key, None)
+            bpy.data.materials.remove(material)
+
+    def clear(self):
+        """Remove every pooled material"""
+        for material in self.materials.values():
+            bpy.data.materials.remove(material)
+        self.materials.clear()
+        self.colors.clear()
+
+    def stats(self):
+        return {"builds": self.builds, "hits": self.hits, "resident": len(self.materials)}
+
+
+# ============================================================
+# RENDER CACHE
+# ============================================================
+
+def stable_hash(*parts):
+    """SHA-256 of JSON-serialisable parts (dict keys sorted, tuples as lists)"""
+    payload = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def hash_mesh_data(objects):
+    """Hash world transforms, vertex positions and topology of the given mesh objects"""
+    digest = hashlib.sha256()
+
+    for obj in sorted(objects, key=lambda o: o.name):
+        mesh = obj.data
+        digest.update(obj.name.encode("utf-8"))
+        digest.update(array.array("f", (v for row in obj.matrix_world for v in row)).tobytes())
+
+        coords = array.array("f", [0.0]) * (len(mesh.vertices) * 3)
+        mesh.vertices.foreach_get("co", coords)
+        digest.update(coords.tobytes())
+
+        loops = array.array("i", [0]) * len(mesh.loops)
+        mesh.loops.foreach_get("vertex_index", loops)
+        digest.update(loops.tobytes())
+
+    return digest.hexdigest()
+
+
+def load_render_index(path):
+    """Read {output filename: input hash} from a render index file (empty if missing)"""
+    path = Path(path)
+    if not path.exists():
+        return {}
+
+    try:
+        return json.loads(path.read_text()).get("entries", {})
+    except (ValueError, OSError):
+        print(f"⚠️ Ignoring unreadable render index: {path}")
+        return {}
+
+
+class RenderCache:
+    """
+    Content-addressed index of rendered previews
+    Stored as a sidecar JSON file ({output filename: input hash}) next to manifest.json;
+    a preview is re-rendered only when its hash changed or the image is missing.
+    """
+
+    def __init__(self, index_path, force=False, seed_paths=()):
+        self.index_path = Path(index_path)
+        self.force = force
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+        # Seed indexes (e.g. the merged index when running as a shard) load first
+        for path in [*seed_paths, self.index_path]:
+            self.entries.update(load_render_index(path))
+
+    def is_fresh(self, output_path, digest):
+        """True when `output_path` exists and was rendered from the same inputs"""
+        output_path = Path(output_path)
+        fresh = (
+            not self.force
+            and self.entries.get(output_path.name) == digest
+            and output_path.exists()
+        )
+        if fresh:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return fresh
+
+    def record(self, output_path, digest):
+        """Store the hash of a finished render and persist the index"""
+        self.entries[Path(output_path).name] = digest
+        self.save()
+
+    def save(self):
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"entries": self.entries}, indent=2, sort_keys=True))
+        tmp_path.replace(self.index_path)
+
+    def stats(self):
+        return {"rendered": self.misses, "skipped": self.hits}
+
+
+# ============================================================
+# RENDER DEVICE
+# ============================================================
+# Picks GPU when Cycles can see one and otherwise configures an explicit CPU
+# path. Options come from arguments or the environment:
+#   PREVIEW_RENDER_DEVICE    auto (default), CPU or GPU
+#   PREVIEW_RENDER_THREADS   CPU render threads (default: all cores)
+#   PREVIEW_TILE_SIZE        Tile size; 0 (default) renders small frames as one tile
+#   PREVIEW_RENDER_CALIBRATE 1 to pick the fastest setup from a quick test render
+
+GPU_BACKENDS = ('OPTIX', 'CUDA', 'HIP', 'METAL', 'ONEAPI')
+
+# Frames up to this many pixels are rendered as a single tile on CPU
+SINGLE_TILE_MAX_PIXELS = 1024 * 1024
+
+CALIBRATION_SCALE = 25  # percent of the final resolution
+CALIBRATION_SAMPLES = 16
+
+
+def render_device_options(device=None, threads=None, tile_size=None, calibrate=None):
+    """Merge explicit options with PREVIEW_RENDER_* environment defaults"""
+    return {
+        "device": (device or os.environ.get("PREVIEW_RENDER_DEVICE", "auto")).upper(),
+        "threads": int(threads if threads is not None else os.environ.get("PREVIEW_RENDER_THREADS", 0)),
+        "tile_size": int(tile_size if tile_size is not None else os.environ.get("PREVIEW_TILE_SIZE", 0)),
+        "calibrate": calibrate if calibrate is not None else os.environ.get("PREVIEW_RENDER_CALIBRATE") == "1",
+    }
+
+
+def detect_gpu_backend():
+    """Enable the first Cycles GPU backend with a usable device; returns its name or None"""
+    try:
+        prefs = bpy.context.preferences.addons['cycles'].preferences
+    except KeyError:
+        return None
+
+    for backend in GPU_BACKENDS:
+        try:
+            prefs.compute_device_type = backend
+        except TypeError:
+            continue  # Backend not compiled into this Blender build
+
+        prefs.refresh_devices()
+        gpus = [device for device in prefs.devices if device.type == backend]
+        if gpus:
+            for device in prefs.devices:
+                device.use = device.type == backend
+            return backend
+
+    prefs.compute_device_type = 'NONE'
+    return None
+
+
+def configure_cpu(scene, threads=0, tile_size=0):
+    """Explicit CPU settings tuned for small, repeated preview renders"""
+    scene.cycles.device = 'CPU'
+
+    scene.render.threads_mode = 'FIXED'
+    scene.render.threads = threads or os.cpu_count() or 1
+
+    pixels = scene.render.resolution_x * scene.render.resolution_y * scene.render.resolution_percentage / 100
+    if tile_size:
+        scene.cycles.use_auto_tile = True
+        scene.cycles.tile_size = tile_size
+    else:
+        # Small frames fit in memory as one tile; tiling only adds overhead
+        scene.cycles.use_auto_tile = pixels > SINGLE_TILE_MAX_PIXELS
+
+    # Geometry never changes between previews: build a high-quality static BVH once
+    if hasattr(scene.cycles, 'debug_bvh_type'):
+        scene.cycles.debug_bvh_type = 'STATIC_BVH'
+    if hasattr(scene.cycles, 'debug_use_spatial_splits'):
+        scene.cycles.debug_use_spatial_splits = True
+
+
+def configure_render_device(scene, device="AUTO", threads=0, tile_size=0, **_):
+    """
+    Configure Cycles for GPU or CPU rendering
+    Returns a short description of the chosen setup
+    """
+    # Keep the BVH and scene data alive between the many renders of one run
+    scene.render.use_persistent_data = True
+
+    backend = detect_gpu_backend() if device in ("AUTO", "GPU") else None
+
+    if backend:
+        scene.cycles.device = 'GPU'
+        description = f"GPU ({backend})"
+    else:
+        if device == "GPU":
+            print("⚠️ No Cycles GPU device found, using CPU")
+        configure_cpu(scene, threads, tile_size)
+        tiles = f"tile {scene.cycles.tile_size}" if scene.cycles.use_auto_tile else "single tile"
+        description = f"CPU ({scene.render.threads} threads, {tiles})"
+
+    print(f"✅ Render device: {description}")
+    return description
+
+
+def calibrate_render_device(scene, threads=0):
+    """
+    Time a reduced-size test render with each candidate setup and keep the fastest
+    Call once the scene (objects, lights, camera, a material) is complete.
+    """
+    render = scene.render
+    saved = (render.resolution_percentage, scene.cycles.samples, render.filepath)
+    cpu_threads = threads or os.cpu_count() or 1
+
+    candidates = [{"device": "CPU", "threads": cpu_threads, "tile_size": 0}]
+    if cpu_threads > 1:
+        candidates.append({"device": "CPU", "threads": max(1, cpu_threads // 2), "tile_size": 0})
+    # No tiled candidate: test frames at CALIBRATION_SCALE are smaller than a tile, so
+    # tiling cannot be measured here (configure_cpu tiles large frames on its own)
+    if detect_gpu_backend():
+        candidates.insert(0, {"device": "GPU", "threads": 0, "tile_size": 0})
+
+    render.resolution_percentage = CALIBRATION_SCALE
+    scene.cycles.samples = CALIBRATION_SAMPLES
+
+    timings = []
+    try:
+        for i, candidate in enumerate(candidates):
+            configure_render_device(scene, **candidate)
+            if i == 0:
+                bpy.ops.render.render()  # Warm-up: kernel load and BVH build
+
+            started = time.perf_counter()
+            bpy.ops.render.render()
+            timings.append((time.perf_counter() - started, candidate))
+            print(f"   ⏱️ {candidate}: {timings[-1][0]:.2f}s")
+    finally:
+        render.resolution_percentage, scene.cycles.samples, render.filepath = saved
+
+    best_seconds, best = min(timings, key=lambda timing: timing[0])
+    print(f"✅ Calibration picked {best} ({best_seconds:.2f}s test render)")
+    return configure_render_device(scene, **best)
+
+
+# ============================================================
+# SAMPLE BUDGETS
+# ============================================================
+
+def _load_pixels(path):
+    """Read an image file into a flat float array of RGBA values"""
+    image = bpy.data.images.load(str(path))
+    try:
+        pixels = array.array("f", [0.0]) * (len(image.pixels))
+        image.pixels.foreach_get(pixels)
+    finally:
+        bpy.data.images.remove(image)
+    return pixels
+
+
+def measure_render_noise(scene, samples=32, scale=25):
+    """
+    Estimate per-pixel Monte Carlo noise of the current scene
+    Renders two reduced-size, undenoised float images with different seeds; the
+    RMS difference of covered pixels divided by sqrt(2) is the noise std dev.
+    """
+    render = scene.render
+    saved = (
+        scene.cycles.samples, scene.cycles.seed, scene.cycles.use_denoising,
+        scene.cycles.use_adaptive_sampling, render.resolution_percentage, render.filepath,
+        render.image_settings.file_format, render.image_settings.color_depth,
+    )
+
+    scene.cycles.samples = samples
+    scene.cycles.use_denoising = False
+    scene.cycles.use_adaptive_sampling = False
+    render.resolution_percentage = scale
+    render.image_settings.file_format = 'OPEN_EXR'
+    render.image_settings.color_depth = '32'
+
+    passes = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for seed in (1, 2):
+                scene.cycles.seed = seed
+                render.filepath = os.path.join(tmp_dir, f"pilot_{seed}.exr")
+                bpy.ops.render.render(write_still=True)
+                passes.append(_load_pixels(render.filepath))
+    finally:
+        (
+            scene.cycles.samples, scene.cycles.seed, scene.cycles.use_denoising,
+            scene.cycles.use_adaptive_sampling, render.resolution_percentage, render.filepath,
+            render.image_settings.file_format, render.image_settings.color_depth,
+        ) = saved
+
+    first, second = (np.frombuffer(pixels, dtype=np.float32).reshape(-1, 4) for pixels in passes)
+    covered = (first[:, 3] > 0.0) | (second[:, 3] > 0.0)  # Only pixels covered by the helmet
+    if not covered.any():
+        return 0.0
+
+    diff = first[covered, :3].astype(np.float64) - second[covered, :3]
+    return float(np.sqrt(np.mean(diff * diff) / 2.0))
+
+
+def calibrate_noise_target(reference_noise, pilot_samples, reference_samples):
+    """Noise a finish with `reference_noise` at `pilot_samples` has at `reference_samples`"""
+    return reference_noise * math.sqrt(pilot_samples / reference_samples)
+
+
+def derive_sample_budget(noise, pilot_samples, target_noise, min_samples, max_samples):
+    """Samples needed to reach `target_noise`, assuming noise falls with 1/sqrt(samples)"""
+    if noise <= 0.0:
+        return min_samples
+    needed = math.ceil(pilot_samples * (noise / target_noise) ** 2)
+    return max(min_samples, min(max_samples, needed))
+
+
+# ============================================================
+# TURNTABLES
+# ============================================================
+# A turntable renders one finish/color from N angles as a single animation:
+# the camera is parented to a pivot whose Z rotation is keyframed linearly, so
+# with persistent data Cycles keeps the scene and BVH resident between frames
+# and only the camera transform changes.
+
+TURNTABLE_PIVOT_NAME = "Turntable_Pivot"
+
+
+def setup_turntable(scene, camera, angles, center=(0.0, 0.0, 0.0)):
+    """Orbit `camera` around `center` in `angles` even steps over frames 1..angles"""
+    from mathutils import Matrix
+
+    pivot = bpy.data.objects.get(TURNTABLE_PIVOT_NAME)
+    if pivot is None:
+        pivot = bpy.data.objects.new(TURNTABLE_PIVOT_NAME, None)
+        scene.collection.objects.link(pivot)
+
+    pivot.animation_data_clear()
+    pivot.location = center
+    pivot.rotation_euler = (0.0, 0.0, 0.0)
+
+    # Keep the camera where it is at frame 1
+    camera.parent = pivot
+    camera.matrix_parent_inverse = Matrix.Translation(center).inverted()
+
+    # Frame angles + 1 would be a full turn, i.e. frame 1 again
+    pivot.keyframe_insert(data_path="rotation_euler", index=2, frame=1)
+    pivot.rotation_euler[2] = 2.0 * math.pi
+    pivot.keyframe_insert(data_path="rotation_euler", index=2, frame=angles + 1)
+    for fcurve in pivot.animation_data.action.fcurves:
+        for keyframe in fcurve.keyframe_points:
+            keyframe.interpolation = 'LINEAR'
+
+    scene.frame_start = 1
+    scene.frame_end = angles
+    scene.frame_set(1)
+    return pivot
+
+
+def render_turntable(scene, frame_dir):
+    """Render the scene frame range into `frame_dir`; returns the frame paths in order"""
+    frame_dir = Path(frame_dir)
+    frame_dir.mkdir(parents=True, exist_ok=True)
+
+    extension = scene.render.file_extension
+    scene.render.filepath = str(frame_dir / "frame_####")
+    bpy.ops.render.render(animation=True)
+
+    return [
+        frame_dir / f"frame_{frame:04d}{extension}"
+        for frame in range(scene.frame_start, scene.frame_end + 1)
+    ]
+
+
+def sprite_sheet_layout(frame_count):
+    """(columns, rows) of the most square grid holding `frame_count` frames"""
+    columns = math.ceil(math.sqrt(frame_count))
+    return columns, math.ceil(frame_count / columns)
+
+
+def build_sprite_sheet(frame_paths, output_path):
+    """
+    Pack equally sized frames into one PNG, row by row from the top left
+    Returns the layout: {"frames", "columns", "rows", "frameWidth", "frameHeight"}
+    """
+    columns, rows = sprite_sheet_layout(len(frame_paths))
+    width = height = 0
+    sheet = None
+
+    for index, frame_path in enumerate(frame_paths):
+        image = bpy.data.images.load(str(frame_path))
+        try:
+            if sheet is None:
+                width, height = image.size
+                sheet = array.array("f", [0.0]) * (width * columns * height * rows * 4)
+            pixels = array.array("f", [0.0]) * len(image.pixels)
+            image.pixels.foreach_get(pixels)
+        finally:
+            bpy.data.images.remove(image)
+
+        # Blender pixel rows start at the bottom, so the first sheet row is the last in memory
+        column, row = index % columns, rows - 1 - index // columns
+        row_length = width * 4
+        for y in range(height):
+            source = y * row_length
+            target = ((row * height + y) * columns + column) * row_length
+            sheet[target:target + row_length] = pixels[source:source + row_length]
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    image = bpy.data.images.new(output_path.stem, width * columns, height * rows, alpha=True)
+    try:
+        image.pixels.foreach_set(sheet)
+        image.filepath_raw = str(output_path)
+        image.file_format = 'PNG'
+        image.save()
+    finally:
+        bpy.data.images.remove(image)
+
+    return {
+        "frames": len(frame_paths),
+        "columns": columns,
+        "rows": rows,
+        "frameWidth": width,
+        "frameHeight": height,
+    }
+
+
+# ============================================================
+# ATLASES
+# ============================================================
+
+def load_rgba(path):
+    """Read an image file into a (height, width, 4) float32 array, top row first"""
+    image = bpy.data.images.load(str(path))
+    try:
+        width, height = image.size
+        pixels = np.empty(width * height * 4, dtype=np.float32)
+        image.pixels.foreach_get(pixels)
+    finally:
+        bpy.data.images.remove(image)
+    return pixels.reshape(height, width, 4)[::-1]
+
+
+def save_rgba(pixels, path):
+    """Write a (height, width, 4) array (top row first) as a PNG"""
+    height, width = pixels.shape[:2]
+    image = bpy.data.images.new(Path(path).stem, width, height, alpha=True)
+    try:
+        image.pixels.foreach_set(np.ascontiguousarray(pixels[::-1], dtype=np.float32).ravel())
+        image.filepath_raw = str(path)
+        image.file_format = 'PNG'
+        image.save()
+    finally:
+        bpy.data.images.remove(image)
+
+
+def shelf_pack(sizes, max_size, padding=0):
+    """
+    Place (width, height) rectangles on shelves, tallest first
+    Shelves are limited to a roughly square width so small sets don't become strips.
+    Returns ([(page, x, y)] in input order, [(page width, page height)]).
+    """
+    area = sum((width + padding) * (height + padding) for width, height in sizes)
+    widest = max(width for width, _ in sizes)
+    if widest > max_size or max(height for _, height in sizes) > max_size:
+        raise ValueError(f"Image larger than the {max_size}px atlas")
+    shelf_width = min(max_size, max(widest, math.ceil(math.sqrt(area))))
+
+    placements = [None] * len(sizes)
+    pages = []
+    x = y = shelf_height = 0
+
+    for index in sorted(range(len(sizes)), key=lambda i: -sizes[i][1]):
+        width, height = sizes[index]
+        if x + width > shelf_width:
+            x, y, shelf_height = 0, y + shelf_height + padding, 0
+        if not pages or y + height > max_size:
+            pages.append([0, 0])
+            x = y = shelf_height = 0
+
+        placements[index] = (len(pages) - 1, x, y)
+        pages[-1][0] = max(pages[-1][0], x + width)
+        pages[-1][1] = max(pages[-1][1], y + height)
+        x += width + padding
+        shelf_height = max(shelf_height, height)
+
+    return placements, [tuple(page) for page in pages]
+
+
+def pack_atlas(image_paths, output_dir, name, max_size=2048, padding=2):
+    """
+    Pack images into `output_dir`/<name>-<page>.png atlases (stale pages are removed)
+    Returns {"pages": [{"file", "width", "height"}], "rects": [...]} with one rect per
+    image in input order: page, pixel x/y/width/height and a [u0, v0, u1, v1] UV box,
+    all measured from the top left of the page.
+    """
+    images = [load_rgba(path) for path in image_paths]
+    sizes = [(image.shape[1], image.shape[0]) for image in images]
+    placements, page_sizes = shelf_pack(sizes, max_size, padding)
+
+    pages = [np.zeros((height, width, 4), dtype=np.float32) for width, height in page_sizes]
+    rects = []
+    for image, (width, height), (page, x, y) in zip(images, sizes, placements):
+        pages[page][y:y + height, x:x + width] = image
+        page_width, page_height = page_sizes[page]
+        rects.append({
+            "page": page,
+            "x": x,
+            "y": y,
+            "width": width,
+            "height": height,
+            "uv": [
+                round(x / page_width, 6),
+                round(y / page_height, 6),
+                round((x + width) / page_width, 6),
+                round((y + height) / page_height, 6),
+            ],
+        })
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for stale in output_dir.glob(f"{name}-*.png"):
+        stale.unlink()
+
+    page_info = []
+    for page, pixels in enumerate(pages):
+        path = output_dir / f"{name}-{page}.png"
+        save_rgba(pixels, path)
+        page_info.append({"file": path.name, "width": pixels.shape[1], "height": pixels.shape[0]})
+
+    return {"pages": page_info, "rects": rects}
+
+
+# ============================================================
+# CAMERA FRAMING
+# ============================================================
+
+def world_bounds(objects):
+    """World-space (min corner, max corner) of the objects' bounding boxes"""
+    from mathutils import Vector
+
+    corners = [obj.matrix_world @ Vector(corner) for obj in objects for corner in obj.bound_box]
+    return (
+        Vector(min(corner[axis] for corner in corners) for axis in range(3)),
+        Vector(max(corner[axis] for corner in corners) for axis in range(3)),
+    )
+
+
+def frame_camera(camera, objects, scene, margin=0.1, elevation=8.0, azimuth=0.0):
+    """
+    Aim `camera` at the objects' bounds and back it off until they fit the frame
+    The camera looks along +Y (from the front) tilted down by `elevation` degrees and
+    turned by `azimuth` degrees about Z; `margin` is extra space as a fraction of size.
+    Returns the bounds center.
+    """
+    from mathutils import Vector
+
+    bounds_min, bounds_max = world_bounds(objects)
+    center = (bounds_min + bounds_max) / 2
+    radius = (bounds_max - bounds_min).length / 2
+
+    # Narrowest field of view decides the distance (sensor width spans the longer side)
+    render = scene.render
+    aspect = (render.resolution_x * render.pixel_aspect_x) / (render.resolution_y * render.pixel_aspect_y)
+    half_fov = math.atan(camera.data.sensor_width / 2 / camera.data.lens)
+    if aspect >= 1:
+        half_fov = min(half_fov, math.atan(math.tan(half_fov) / aspect))
+    else:
+        half_fov = min(half_fov, math.atan(math.tan(half_fov) * aspect))
+    distance = radius * (1 + margin) / math.sin(half_fov)
+
+    pitch, yaw = math.radians(elevation), math.radians(azimuth)
+    direction = Vector((
+        math.sin(yaw) * math.cos(pitch),
+        math.cos(yaw) * math.cos(pitch),
+        -math.sin(pitch),
+    ))
+
+    camera.location = center - direction * distance
+    camera.rotation_euler = direction.to_track_quat('-Z', 'Y').to_euler()
+    camera.data.clip_end = max(camera.data.clip_end, distance + radius * 2)
+    return center
@@ -11,10 +11,14 @@ Run this in Blender:
 
 import bpy
 import os
+import sys
 from pathlib import Path
-from mathutils import Vector
 import math
 
+sys.path.insert(0, str(Path(__file__).parent))
+from render_utils import calibrate_render_device, configure_render_device, frame_camera, render_device_options
+from finish_presets import finish_catalog, hex_to_linear_rgba
+
 # ============================================================
 # PATHS
 # ============================================================
@@ -23,6 +27,15 @@ import math
 OBJ_PATH = Path("/Users/kashyapmaheshwari/projects/helmet-customizer/Final_Helmet.obj")
 OUTPUT_DIR = Path("/Users/kashyapmaheshwari/Blender-Workspace/projects/helmet-customizer/public/material-previews")
 
+# ============================================================
+# CAMERA
+# ============================================================
+
+CAMERA_LENS = 60
+CAMERA_SENSOR_WIDTH = 36
+CAMERA_MARGIN = 0.1      # Extra space around the helmet, as a fraction of its size
+CAMERA_ELEVATION = 8.0   # Degrees the camera looks down at the helmet
+
 # ============================================================
 # STEP 1: CLEAN SCENE AND IMPORT
 # ============================================================
@@ -105,8 +118,8 @@ def setup_lighting():
     print("✅ Lighting setup complete")
 
 
-def setup_camera(target_objects):
-    """Position camera to frame the helmet"""
+def setup_camera(target_objects, margin=CAMERA_MARGIN):
+    """Position camera to frame the helmet (call after setup_render_settings for the aspect ratio)"""
     # Create camera
     bpy.ops.object.camera_add(location=(0, -6, 1.8))
     camera = bpy.context.object
@@ -114,33 +127,34 @@ def setup_camera(target_objects):
     camera.rotation_euler = (math.radians(82), 0, 0)
 
     bpy.context.scene.camera = camera
-    camera.data.lens = 60
-    camera.data.sensor_width = 36
+    camera.data.lens = CAMERA_LENS
+    camera.data.sensor_width = CAMERA_SENSOR_WIDTH
 
-    # Calculate center of all objects for framing
+    # Fit the helmet's bounding boxes (8 corners per object, not every vertex)
     if target_objects:
-        all_verts = []
-        for obj in target_objects:
-            all_verts.extend([obj.matrix_world @ v.co for v in obj.data.vertices])
-
-        if all_verts:
-            center = sum((v for v in all_verts), Vector()) / len(all_verts)
-            print(f"✅ Camera centered on: {center}")
+        center = frame_camera(camera, target_objects, bpy.context.scene, margin, CAMERA_ELEVATION)
+        print(f"✅ Camera centered on: {center}")
 
     print("✅ Camera positioned")
 
 
 def setup_render_settings():
-    """Configure render settings"""
+    """
+    Configure render settings
+    Returns the render device options; calibrate with them once the scene is complete.
+    """
     scene = bpy.context.scene
 
     scene.render.engine = 'CYCLES'
-    scene.cycles.device = 'GPU'
 
     scene.render.resolution_x = 1024
     scene.render.resolution_y = 1024
     scene.cycles.samples = 128  # Adjust for quality vs speed
 
+    # GPU if available, otherwise tuned CPU settings (PREVIEW_RENDER_* env vars)
+    device_options = render_device_options()
+    configure_render_device(scene, **device_options)
+
     scene.cycles.use_denoising = True
     scene.render.use_compositing = True
     scene.render.film_transparent = True
@@ -149,20 +163,15 @@ def setup_render_settings():
     scene.view_settings.look = 'None'
 
     print("✅ Render settings configured")
+    return device_options
 
 
 # ============================================================
 # STEP 3: MATERIALS
 # ============================================================
 
-def hex_to_rgb(hex_color):
-    """Convert hex to RGB"""
-    hex_color = hex_color.lstrip('#')
-    return tuple(int(hex_color[i:i+2], 16) / 255.0 for i in (0, 2, 4))
-
-
 def create_test_material(color_hex="#FFD700", finish="chrome"):
-    """Create a test material"""
+    """Create a test material with a premium finish preset"""
     mat = bpy.data.materials.new(name=f"Test_{finish}")
     mat.use_nodes = True
     nodes = mat.node_tree.nodes
@@ -171,21 +180,10 @@ def create_test_material(color_hex="#FFD700", finish="chrome"):
     bsdf = nodes.new(type='ShaderNodeBsdfPrincipled')
 
     # Set color
-    rgb = hex_to_rgb(color_hex)
-    bsdf.inputs['Base Color'].default_value = (*rgb, 1.0)
-
-    # Set finish (chrome example)
-    if finish == "chrome":
-        bsdf.inputs['Metallic'].default_value = 1.0
-        bsdf.inputs['Roughness'].default_value = 0.02
-        bsdf.inputs['Clearcoat'].default_value = 0.5
-    elif finish == "glossy":
-        bsdf.inputs['Metallic'].default_value = 0.0
-        bsdf.inputs['Roughness'].default_value = 0.15
-        bsdf.inputs['Clearcoat'].default_value = 0.8
-    elif finish == "matte":
-        bsdf.inputs['Metallic'].default_value = 0.0
-        bsdf.inputs['Roughness'].default_value = 0.95
+    bsdf.inputs['Base Color'].default_value = hex_to_linear_rgba(color_hex)
+
+    # Set finish
+    finish_catalog("premium")[finish].plan.apply(bsdf.inputs)
 
     output = nodes.new(type='ShaderNodeOutputMaterial')
     mat.node_tree.links.new(bsdf.outputs['BSDF'], output.inputs['Surface'])
@@ -244,14 +242,18 @@ def main():
     # Step 2: Setup scene
     print("\nSTEP 2: Setting up scene...")
     setup_lighting()
+    device_options = setup_render_settings()
     setup_camera(helmet_objects)
-    setup_render_settings()
 
     # Step 3: Apply test material
     print("\nSTEP 3: Applying test material...")
     test_material = create_test_material(color_hex="#FFD700", finish="chrome")
     apply_material(helmet_objects, test_material)
 
+    # Calibration test-renders the scene, so it needs the camera and a material
+    if device_options["calibrate"]:
+        calibrate_render_device(bpy.context.scene, device_options["threads"])
+
     # Step 4: Render test
     print("\nSTEP 4: Rendering test preview...")
     render_test_preview("test_chrome_gold.png")
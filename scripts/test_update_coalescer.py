@@ -0,0 +1,137 @@
+"""
+UpdateCoalescer equivalence test (offline)
+Replays a mixed, seeded queue of webhook updates through update_helmet_materials.py
+on the fake_bpy stand-in twice, once update by update and once through
+UpdateCoalescer with a flush every few updates, and checks that both leave every
+zone socket with the same value.
+
+Usage:
+    python3 -m pytest scripts/test_update_coalescer.py
+"""
+
+import random
+
+import pytest
+
+from webhook_load import offline_updater
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+SEEDS = (1, 2, 3)
+QUEUE_LENGTH = 400
+FLUSH_EVERY = (1, 3, 7, 25)  # Updates pushed per frame interval
+
+PROPERTIES = (
+    'color', 'finish', 'metallic', 'roughness',
+    'clearcoat', 'clearcoatRoughness', 'emissive', 'emissiveIntensity',
+)
+
+# ============================================================
+# QUEUE
+# ============================================================
+
+def random_value(rng, key, finishes):
+    if key in ('color', 'emissive'):
+        return '#' + ''.join(rng.choice('0123456789ABCDEF') for _ in range(6))
+    if key == 'finish':
+        return rng.choice(finishes + ['unknown_finish'])
+    if key == 'emissiveIntensity':
+        return round(rng.uniform(0.0, 100.0), 2)
+    return round(rng.random(), 3)
+
+
+def mixed_queue(seed, zones, finishes, length=QUEUE_LENGTH):
+    """Single-property updates (as slider drags send them) mixed with multi-property ones"""
+    rng = random.Random(seed)
+    queue = []
+    for _ in range(length):
+        keys = rng.sample(PROPERTIES, rng.choice((1, 1, 1, 2, 3)))
+        queue.append([{
+            'zone': rng.choice(zones),
+            'properties': {key: random_value(rng, key, finishes) for key in keys},
+        }])
+    return queue
+
+
+def zone_socket_values(updater, material):
+    index = updater.get_zone_index(material)
+    return {
+        zone: {name: updater._socket_value(socket) for name, socket in index.get(zone).items()}
+        for zone in updater.ZONES
+    }
+
+
+def assert_same_sockets(serial, coalesced):
+    for zone, sockets in serial.items():
+        for name, value in sockets.items():
+            assert coalesced[zone][name] == pytest.approx(value, abs=1e-6), f"{zone} {name}"
+
+
+# ============================================================
+# TESTS
+# ============================================================
+
+@pytest.mark.parametrize("graph_mode", ("bsdf", "table"))
+@pytest.mark.parametrize("flush_every", FLUSH_EVERY)
+@pytest.mark.parametrize("seed", SEEDS)
+def test_coalesced_matches_serial(seed, flush_every, graph_mode):
+    updater, serial_material = offline_updater(graph_mode)
+    queue = mixed_queue(seed, list(updater.ZONES), list(updater.FINISH_PRESETS))
+    for updates in queue:
+        updater.apply_webhook_updates(updates, serial_material)
+    serial = zone_socket_values(updater, serial_material)
+
+    # The coalesced replay starts from a fresh helmet, not the serial run's result
+    updater, material = offline_updater(graph_mode)
+    assert material is not serial_material
+    coalescer = updater.UpdateCoalescer(apply=lambda batch: updater.apply_webhook_updates(batch, material))
+    for i, updates in enumerate(queue, 1):
+        coalescer.push(updates)
+        if i % flush_every == 0:
+            coalescer.flush()
+    coalescer.flush()
+
+    assert_same_sockets(serial, zone_socket_values(updater, material))
+    if flush_every > 1:
+        assert coalescer.total_dropped > 0
+
+
+@pytest.mark.parametrize("graph_mode", ("bsdf", "table"))
+def test_unknown_finish_keeps_pending_finish(graph_mode):
+    queue = [
+        [{'zone': 'SHELL', 'properties': {'finish': 'chrome'}}],
+        [{'zone': 'SHELL', 'properties': {'finish': 'unknown_finish'}}],
+        [{'zone': 'FACEMASK', 'properties': {'metallic': 0.3}}],
+        [{'zone': 'FACEMASK', 'properties': {'finish': 'unknown_finish', 'roughness': 0.7}}],
+    ]
+
+    updater, serial_material = offline_updater(graph_mode)
+    for updates in queue:
+        updater.apply_webhook_updates(updates, serial_material)
+    serial = zone_socket_values(updater, serial_material)
+
+    updater, material = offline_updater(graph_mode)
+    assert material is not serial_material
+    coalescer = updater.UpdateCoalescer(apply=lambda batch: updater.apply_webhook_updates(batch, material))
+    for updates in queue:
+        coalescer.push(updates)
+    coalescer.flush()
+
+    assert_same_sockets(serial, zone_socket_values(updater, material))
+
+
+def test_partial_updates_only_touch_their_sockets():
+    updater, material = offline_updater()
+    updater.apply_webhook_updates([{'zone': 'SHELL', 'properties': {
+        'clearcoat': 0.8, 'clearcoatRoughness': 0.4, 'emissive': '#FF0000', 'emissiveIntensity': 5.0,
+    }}], material)
+
+    updater.apply_webhook_updates([{'zone': 'SHELL', 'properties': {'clearcoat': 0.2}}], material)
+    updater.apply_webhook_updates([{'zone': 'SHELL', 'properties': {'emissiveIntensity': 2.0}}], material)
+
+    shell = zone_socket_values(updater, material)['SHELL']
+    assert shell['Coat Weight'] == pytest.approx(0.2)
+    assert shell['Coat Roughness'] == pytest.approx(0.4)
+    assert shell['Emission Strength'] == pytest.approx(2.0)
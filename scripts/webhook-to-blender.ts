@@ -25,31 +25,107 @@ interface ZoneUpdate {
   properties: MaterialProperties;
 }
 
+// Resident updater service (see "SERVICE MODE" in update_helmet_materials.py)
+const SERVICE_HOST = process.env.BLENDER_SERVICE_HOST ?? '127.0.0.1';
+const SERVICE_PORT = Number(process.env.BLENDER_SERVICE_PORT ?? 9877);
+const SERVICE_TIMEOUT_MS = 10000;
+
+/**
+ * Send material updates straight to the resident Blender updater service
+ *
+ * Only the JSON `updates` list travels over the socket; the material and
+ * zone shaders are already resolved inside Blender.
+ */
+export async function sendToBlenderService(updates: ZoneUpdate[]): Promise<any> {
+  return sendServicePayload({ updates });
+}
+
+/**
+ * Update many helmets in one service call (e.g. a team roster export)
+ *
+ * Keys are helmet material or object names; Blender resolves them all in one
+ * pass and returns a single summary with per-helmet `results`.
+ */
+export async function sendHelmetBatchToBlenderService(helmets: Record<string, ZoneUpdate[]>): Promise<any> {
+  return sendServicePayload({ helmets });
+}
+
+async function sendServicePayload(payload: object): Promise<any> {
+  const net = await import('net');
+
+  return new Promise((resolve, reject) => {
+    const socket = net.createConnection({ host: SERVICE_HOST, port: SERVICE_PORT });
+    let buffer = '';
+
+    socket.setTimeout(SERVICE_TIMEOUT_MS);
+    socket.on('connect', () => socket.write(JSON.stringify(payload) + '\n'));
+    socket.on('data', (chunk) => {
+      buffer += chunk.toString('utf-8');
+      const newline = buffer.indexOf('\n');
+      if (newline === -1) return;
+
+      try {
+        const response = JSON.parse(buffer.slice(0, newline));
+        socket.end();
+        resolve(response);
+      } catch (err) {
+        socket.destroy();
+        reject(err);
+      }
+    });
+    socket.on('timeout', () => {
+      socket.destroy();
+      reject(new Error('Blender service timed out'));
+    });
+    socket.on('error', reject);
+  });
+}
+
 /**
  * Send material updates to Blender via MCP
  *
- * This function takes webhook payload and executes the Blender Python script
- * using the Blender MCP server
+ * Tries the resident updater service first. If it is not running yet, the
+ * Blender Python script is executed once through the MCP server, which
+ * applies these updates and starts the service for all following calls.
  */
 export async function sendToBlenderMCP(updates: ZoneUpdate[]) {
+  try {
+    const result = await sendToBlenderService(updates);
+    console.log('✅ Blender materials updated (service):', result);
+    return { success: Boolean(result.success), result };
+  } catch (error: any) {
+    if (error?.code !== 'ECONNREFUSED') {
+      console.error('❌ Blender service error:', error);
+      return { success: false, error };
+    }
+  }
+
   // Format updates for Python script
   const pythonUpdates = JSON.stringify(updates, null, 2);
 
   // Read the Blender script
   const fs = await import('fs/promises');
+  const path = await import('path');
   const scriptPath = './scripts/blender/update_helmet_materials.py';
   const blenderScript = await fs.readFile(scriptPath, 'utf-8');
 
-  // Combine script with webhook data
+  // The script imports the shared finish presets from scripts/
+  const scriptsDir = JSON.stringify(path.resolve('./scripts'));
+
+  // Combine script with webhook data and bootstrap the resident service
   const fullScript = `
+import sys
+sys.path.insert(0, ${scriptsDir})
+
 ${blenderScript}
 
 # Apply webhook updates
 webhook_updates = ${pythonUpdates}
-apply_webhook_updates(webhook_updates)
+service = start_service(port=${SERVICE_PORT})
+result = service.apply(webhook_updates)
 `;
 
-  console.log('📤 Sending material updates to Blender MCP...');
+  console.log('📤 Sending material updates to Blender MCP (starting updater service)...');
 
   // Execute via Blender MCP
   // Note: This assumes you have blender-mcp running
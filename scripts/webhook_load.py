@@ -0,0 +1,509 @@
+"""
+Webhook Load Generator
+Synthesizes realistic material update streams, replays them against the Blender
+updater at a target rate and reports latency percentiles and throughput
+
+Streams mimic the customizer UI: slider drags and color-picker drags (bursts of
+small changes at input rate), finish switches and full-helmet batches (all five
+ZONES at once), separated by user think time. Traces are seeded and can be saved
+as JSON lines; replaying a saved trace sends the identical payloads on the same
+schedule, and the report's resultDigest matches between runs of the same trace
+on a fresh updater.
+
+Targets:
+    direct   apply_webhook_updates in this process (offline bpy stand-in, or the
+             open file when run inside Blender)
+    service  the resident updater socket (update_helmet_materials.py -- --service)
+    http     POST {"updates": [...]} to --url; without --url a local stand-in
+             endpoint backed by the offline updater is started
+
+Usage:
+    python3 scripts/webhook_load.py --events 2000 --rate 200
+    python3 scripts/webhook_load.py --events 5000 --save trace.jsonl --generate-only
+    python3 scripts/webhook_load.py --replay trace.jsonl --target http
+    python3 scripts/webhook_load.py --replay trace.jsonl --target http --url http://localhost:3000/api/webhook/material
+    python3 scripts/webhook_load.py --target service --rate 60
+
+Pacing: --rate N sends N payloads/s evenly, --rate 0 as fast as possible, and by
+default the trace's own timing (scaled by --speed) is kept. Each of --concurrency
+senders waits for its response before its next payload; when the target falls
+behind, the lag shows in the end-to-end latency. The resident service applies
+queued updates once per frame interval, so a single sender sees at most ~30/s.
+"""
+
+import argparse
+import ast
+import colorsys
+import hashlib
+import http.client
+import importlib
+import json
+import os
+import random
+import socket
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from finish_presets import finish_catalog
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+SCRIPT_DIR = Path(__file__).parent
+UPDATER_DIR = SCRIPT_DIR / "blender"
+UPDATER_SCRIPT = UPDATER_DIR / "update_helmet_materials.py"
+
+TRACE_VERSION = 1
+DEFAULT_EVENTS = 2000
+DEFAULT_SEED = 0
+
+# Share of each user action in a synthesized stream
+ACTION_MIX = {
+    "slider_drag": 0.5,     # metallic/roughness/clearcoat slider dragged on one zone
+    "color_drag": 0.15,     # color picker dragged on one zone
+    "finish_switch": 0.2,   # finish preset picked for one zone
+    "helmet_batch": 0.15,   # color + finish for all zones (team preset)
+}
+
+INPUT_INTERVAL = 1 / 60      # Seconds between UI input events during a drag
+DRAG_EVENTS = (8, 60)        # Payloads per drag (min, max)
+THINK_TIME = 0.4             # Mean seconds between user actions
+SLIDER_PROPERTIES = ("metallic", "roughness", "clearcoat")
+
+SERVICE_HOST = os.environ.get("HELMET_SERVICE_HOST", "127.0.0.1")
+SERVICE_PORT = int(os.environ.get("HELMET_SERVICE_PORT", "9877"))
+REQUEST_TIMEOUT = 10.0
+
+OFFLINE_EXTRA_MATERIALS = 50  # Other materials in the offline scene, as in a real file
+
+# ============================================================
+# STREAM SYNTHESIS
+# ============================================================
+
+def updater_constants(*names, path=UPDATER_SCRIPT):
+    """Literal module constants (e.g. ZONES) from update_helmet_materials.py without importing bpy"""
+    values = {}
+    for node in ast.parse(Path(path).read_text()).body:
+        if isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name) and target.id in names:
+                    values[target.id] = ast.literal_eval(node.value)
+    missing = set(names) - set(values)
+    if missing:
+        raise ValueError(f"No {', '.join(sorted(missing))} definition in {path}")
+    return [values[name] for name in names]
+
+
+def _hex(rgb):
+    return "#" + "".join(f"{round(channel * 255):02X}" for channel in rgb)
+
+
+def _ease(fraction):
+    """Smoothstep: drags start and end slowly"""
+    return fraction * fraction * (3 - 2 * fraction)
+
+
+def synthesize_trace(event_count=DEFAULT_EVENTS, seed=DEFAULT_SEED, mix=None):
+    """
+    Seeded trace {"version", "seed", "mix", "events": [{"t", "updates"}]}
+    `t` is the send time in seconds from the start of the stream.
+    """
+    zones, finishes = list(updater_constants("ZONES")[0]), list(finish_catalog("webhook"))
+    mix = dict(mix or ACTION_MIX)
+    actions, weights = zip(*mix.items())
+
+    rng = random.Random(seed)
+    sliders = {zone: {"metallic": 0.0, "roughness": 0.5, "clearcoat": 0.0} for zone in zones}
+    hues = {zone: rng.random() for zone in zones}
+    events = []
+    t = 0.0
+
+    def emit(updates):
+        events.append({"t": round(t, 4), "updates": updates})
+
+    while len(events) < event_count:
+        action = rng.choices(actions, weights)[0]
+        zone = rng.choice(zones)
+
+        if action == "slider_drag":
+            name = rng.choice(SLIDER_PROPERTIES)
+            start = sliders[zone][name]
+            end = min(1.0, max(0.0, start + rng.uniform(-0.6, 0.6)))
+            steps = rng.randint(*DRAG_EVENTS)
+            for step in range(1, steps + 1):
+                t += INPUT_INTERVAL
+                emit([{"zone": zone, "properties": {name: round(start + (end - start) * _ease(step / steps), 3)}}])
+            sliders[zone][name] = end
+
+        elif action == "color_drag":
+            start = hues[zone]
+            end = start + rng.uniform(-0.3, 0.3)
+            steps = rng.randint(*DRAG_EVENTS)
+            for step in range(1, steps + 1):
+                t += INPUT_INTERVAL
+                hue = (start + (end - start) * _ease(step / steps)) % 1.0
+                emit([{"zone": zone, "properties": {"color": _hex(colorsys.hsv_to_rgb(hue, 0.8, 0.9))}}])
+            hues[zone] = end % 1.0
+
+        elif action == "finish_switch":
+            emit([{"zone": zone, "properties": {"finish": rng.choice(finishes)}}])
+
+        else:
+            emit([
+                {"zone": batch_zone, "properties": {
+                    "color": _hex(colorsys.hsv_to_rgb(rng.random(), rng.uniform(0.3, 1.0), rng.uniform(0.2, 1.0))),
+                    "finish": rng.choice(finishes),
+                }}
+                for batch_zone in zones
+            ])
+
+        t += rng.expovariate(1 / THINK_TIME)
+
+    return {"version": TRACE_VERSION, "seed": seed, "mix": mix, "events": events[:event_count]}
+
+
+def save_trace(trace, path):
+    """Header line, then one {"t", "updates"} event per line"""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    header = {key: value for key, value in trace.items() if key != "events"}
+    with open(tmp_path, "w") as f:
+        f.write(json.dumps({**header, "eventCount": len(trace["events"])}) + "\n")
+        for event in trace["events"]:
+            f.write(json.dumps(event, separators=(",", ":")) + "\n")
+    tmp_path.replace(path)
+
+
+def load_trace(path):
+    with open(path) as f:
+        header = json.loads(f.readline())
+        if header.get("version") != TRACE_VERSION:
+            raise ValueError(f"{path}: unsupported trace version {header.get('version')}")
+        events = [json.loads(line) for line in f if line.strip()]
+
+    header.pop("eventCount", None)
+    return {**header, "events": events}
+
+
+# ============================================================
+# TARGETS
+# ============================================================
+# A target is a callable taking an `updates` list and returning the result dict.
+
+def offline_updater(graph_mode="bsdf", extra_materials=OFFLINE_EXTRA_MATERIALS):
+    """
+    update_helmet_materials on a fresh offline bpy stand-in with a helmet material
+    among `extra_materials` others; inside Blender, the real module and open file.
+    Returns (module, material).
+    """
+    import fake_bpy
+
+    offline = sys.modules.get("bpy", fake_bpy.bpy) is fake_bpy.bpy
+    if offline:
+        bpy = fake_bpy.install()
+        fake_bpy.reset()
+        for i in range(extra_materials):
+            bpy.data.materials.new(f"Prop_{i:03d}").use_nodes = True
+        bpy.data.materials.new("HelmetMaterial").use_nodes = True
+
+    if str(UPDATER_DIR) not in sys.path:
+        sys.path.insert(0, str(UPDATER_DIR))
+    updater = importlib.import_module("update_helmet_materials")
+    if offline:
+        # The cached helmet belongs to the previous stand-in; resolve the new one
+        updater._HELMET_LOOKUP.update(material=None, source=None)
+    updater.configure_logging("silent", "")
+    updater.GRAPH_MODE = graph_mode
+    updater.invalidate_zone_index()
+    return updater, updater.find_helmet_material()
+
+
+def direct_target(graph_mode="bsdf"):
+    """apply_webhook_updates in this process, looking the material up on every call"""
+    updater, _ = offline_updater(graph_mode)
+    lock = threading.Lock()  # bpy is single-threaded
+
+    def apply(updates):
+        with lock:
+            return updater.apply_webhook_updates(updates)
+    return apply
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, so requests measure the endpoint, not TCP setup
+    disable_nagle_algorithm = True  # Headers and body are separate writes
+
+    def _reply(self, status, body):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self._reply(200, {"success": True, "endpoint": "offline stand-in"})
+
+    def do_POST(self):
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            result = self.server.apply(body.get("updates", []))
+            self._reply(200, result)
+        except (ValueError, AttributeError) as e:
+            self._reply(400, {"success": False, "error": str(e)})
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInEndpoint:
+    """Local HTTP endpoint that applies POSTed {"updates"} with the offline updater"""
+
+    def __init__(self, graph_mode="bsdf", host="127.0.0.1", port=0):
+        self.server = ThreadingHTTPServer((host, port), _StandInHandler)
+        self.server.daemon_threads = True
+        self.server.apply = direct_target(graph_mode)
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/api/webhook/material"
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class HttpTarget:
+    """POSTs {"updates"} over one keep-alive connection"""
+
+    def __init__(self, url, timeout=REQUEST_TIMEOUT):
+        parts = urlsplit(url)
+        connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self.connection = connection_class(parts.hostname, parts.port, timeout=timeout)
+        self.connection.connect()
+        # Headers and body go out as separate writes; don't let Nagle hold the body back
+        self.connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.path = parts.path or "/"
+
+    def __call__(self, updates):
+        body = json.dumps({"updates": updates})
+        self.connection.request("POST", self.path, body, {"Content-Type": "application/json"})
+        response = self.connection.getresponse()
+        result = json.loads(response.read() or b"{}")
+        if response.status >= 400:
+            result.setdefault("success", False)
+        return result
+
+    def close(self):
+        self.connection.close()
+
+
+class ServiceTarget:
+    """Sends newline-delimited JSON to the resident updater service over one connection"""
+
+    def __init__(self, host=SERVICE_HOST, port=SERVICE_PORT, timeout=REQUEST_TIMEOUT):
+        self.socket = socket.create_connection((host, port), timeout=timeout)
+        self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.socket.makefile("rb")
+
+    def __call__(self, updates):
+        self.socket.sendall((json.dumps({"updates": updates}) + "\n").encode("utf-8"))
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("Service closed the connection")
+        return json.loads(line)
+
+    def close(self):
+        self.reader.close()
+        self.socket.close()
+
+
+# ============================================================
+# REPLAY
+# ============================================================
+
+def latency_summary(seconds):
+    """Percentiles in milliseconds of per-call durations"""
+    ms = sorted(value * 1000 for value in seconds)
+    cuts = statistics.quantiles(ms, n=100) if len(ms) > 1 else ms * 99
+    return {
+        "p50": round(cuts[49], 4),
+        "p95": round(cuts[94], 4),
+        "p99": round(cuts[98], 4),
+        "max": round(ms[-1], 4),
+        "mean": round(statistics.fmean(ms), 4),
+    }
+
+
+def schedule(events, rate=None, speed=1.0):
+    """Send offsets in seconds: evenly at `rate` or the trace timing / speed; None when unpaced"""
+    if rate == 0 or (rate is None and speed == 0):
+        return None
+    if rate is not None:
+        return [i / rate for i in range(len(events))]
+    return [event["t"] / speed for event in events]
+
+
+def replay(events, connect, rate=None, speed=1.0, concurrency=1):
+    """
+    Send each event's updates on schedule from `concurrency` senders
+    `connect()` returns a target per sender. Sender k sends events k, k + concurrency, ...
+    and waits for each response. Latency is request → response; end-to-end also includes
+    time spent behind schedule (the same as latency when unpaced).
+    """
+    offsets = schedule(events, rate, speed)
+    results = [None] * len(events)
+    latencies = [0.0] * len(events)
+    end_to_end = [0.0] * len(events)
+    targets = [connect() for _ in range(concurrency)]
+
+    def send(sender):
+        target = targets[sender]
+        for i in range(sender, len(events), concurrency):
+            if offsets:
+                due = started + offsets[i]
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+            sent = time.perf_counter()
+            try:
+                result = target(events[i]["updates"])
+            except (OSError, ValueError) as e:
+                result = {"success": False, "error": str(e)}
+            done = time.perf_counter()
+
+            results[i] = result
+            latencies[i] = done - sent
+            end_to_end[i] = done - (due if offsets else sent)
+
+    started = time.perf_counter()
+    try:
+        senders = [threading.Thread(target=send, args=(sender,)) for sender in range(concurrency)]
+        for sender in senders:
+            sender.start()
+        for sender in senders:
+            sender.join()
+    finally:
+        for target in targets:
+            if hasattr(target, "close"):
+                target.close()
+    elapsed = time.perf_counter() - started
+
+    # Digest in event order, so it only depends on the trace and the target's state
+    digest = hashlib.sha256()
+    for result in results:
+        digest.update(json.dumps(result.get("changes", []), sort_keys=True).encode("utf-8"))
+    errors = [result.get("error", "unknown error") for result in results if not result.get("success", True)]
+    zone_updates = sum(len(event["updates"]) for event in events)
+
+    return {
+        "events": len(events),
+        "concurrency": concurrency,
+        "zoneUpdates": zone_updates,
+        "targetRate": round((len(events) - 1) / offsets[-1], 1) if offsets and offsets[-1] else None,
+        "seconds": round(elapsed, 4),
+        "eventsPerSecond": round(len(events) / elapsed, 1),
+        "zoneUpdatesPerSecond": round(zone_updates / elapsed, 1),
+        "latencyMs": latency_summary(latencies),
+        "endToEndMs": latency_summary(end_to_end),
+        "socketChanges": sum(len(result.get("changes", [])) for result in results),
+        "errors": len(errors),
+        "firstError": errors[0] if errors else None,
+        "resultDigest": digest.hexdigest()[:16],
+    }
+
+
+# ============================================================
+# MAIN
+# ============================================================
+
+def print_report(report):
+    latency, end_to_end = report["latencyMs"], report["endToEndMs"]
+    target_rate = f"{report['targetRate']:,}/s" if report["targetRate"] else "unpaced"
+    print(f"\n📈 {report['target']}: {report['events']:,} payloads ({report['zoneUpdates']:,} zone updates), "
+          f"target {target_rate}, {report['concurrency']} sender(s)")
+    print(f"   Achieved {report['eventsPerSecond']:,} payloads/s, {report['zoneUpdatesPerSecond']:,} zone updates/s "
+          f"over {report['seconds']:.2f}s")
+    print(f"   Latency ms     p50 {latency['p50']}, p95 {latency['p95']}, p99 {latency['p99']}, max {latency['max']}")
+    print(f"   End-to-end ms  p50 {end_to_end['p50']}, p95 {end_to_end['p95']}, p99 {end_to_end['p99']}, "
+          f"max {end_to_end['max']}")
+    print(f"   {report['socketChanges']:,} socket changes, result digest {report['resultDigest']}")
+    if report["errors"]:
+        print(f"❌ {report['errors']} failed payload(s), first: {report['firstError']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay material update streams against the Blender updater")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--events", type=int, default=DEFAULT_EVENTS, help="Payloads to synthesize")
+    source.add_argument("--replay", type=Path, metavar="TRACE", help="Replay a saved trace instead")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Synthesis seed")
+    parser.add_argument("--save", type=Path, metavar="TRACE", help="Save the synthesized trace (JSON lines)")
+    parser.add_argument("--generate-only", action="store_true", help="Only synthesize (and --save) the trace")
+    parser.add_argument("--target", choices=("direct", "service", "http"), default="direct")
+    parser.add_argument("--url", help="Endpoint for --target http (default: local stand-in)")
+    parser.add_argument("--host", default=SERVICE_HOST, help="Service host for --target service")
+    parser.add_argument("--port", type=int, default=SERVICE_PORT, help="Service port for --target service")
+    parser.add_argument("--rate", type=float, help="Payloads per second (0: as fast as possible)")
+    parser.add_argument("--speed", type=float, default=1.0, help="Trace timing multiplier when --rate is not set")
+    parser.add_argument("--concurrency", type=int, default=1, help="Parallel senders (connections)")
+    parser.add_argument("--graph", choices=("bsdf", "table"), default="bsdf", help="Zone graph of offline targets")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    trace = load_trace(args.replay) if args.replay else synthesize_trace(args.events, args.seed)
+    if args.save:
+        save_trace(trace, args.save)
+        print(f"✅ Trace: {args.save} ({len(trace['events']):,} payloads, seed {trace['seed']})")
+    if args.generate_only:
+        return 0
+
+    endpoint = None
+    if args.target == "direct":
+        apply = direct_target(args.graph)
+        connect, name = (lambda: apply), "direct"
+    elif args.target == "service":
+        connect, name = (lambda: ServiceTarget(args.host, args.port)), f"service {args.host}:{args.port}"
+    else:
+        url = args.url
+        if url is None:
+            endpoint = StandInEndpoint(args.graph).__enter__()
+            url = endpoint.url
+        connect, name = (lambda: HttpTarget(url)), f"http {url}"
+
+    try:
+        report = {
+            "target": name,
+            "seed": trace.get("seed"),
+            **replay(trace["events"], connect, args.rate, args.speed, args.concurrency),
+        }
+    except OSError as e:
+        print(f"❌ Cannot connect to {args.target} target: {e}")
+        return 1
+    finally:
+        if endpoint:
+            endpoint.__exit__(None, None, None)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())